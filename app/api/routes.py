@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, status, Depends, Body
+from fastapi import FastAPI, HTTPException, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 from app.schemas.planning_input import PlanRequest
@@ -29,29 +29,38 @@ app.add_middleware(
 # OAuth2/JWT security (placeholder)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
-@app.post("/llm/model", tags=["Planning"], summary="Set LLM model", response_description="Model updated")
-async def set_llm_model(
-    provider: str = Body(..., embed=True, example="ollama"),
-    model: str = Body(..., embed=True, example="llama2")
-):
-    """Set the LLM provider and model (Ollama or Bedrock)."""
-    settings = get_settings()
-    settings.MODEL_PROVIDER = provider
-    if provider == "ollama":
-        settings.OLLAMA_MODEL = model
-    elif provider == "bedrock":
-        settings.BEDROCK_MODEL = model
-    else:
-        raise HTTPException(status_code=400, detail="Unknown provider")
-    return {"provider": provider, "model": model}
-
-from fastapi import FastAPI, HTTPException, status, Depends
+import asyncio
+import hashlib
+import hmac
+from typing import Union
+from fastapi import FastAPI, HTTPException, status, Body, Depends, Request, Response, File, Form, Query, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from app.schemas.planning_input import PlanRequest
-from app.schemas.planning_output import PlanResponse
+from pydantic import ValidationError
+from app.schemas.planning_input import HorizonPlanRequest, PlanRequest
+from app.schemas.planning_output import HorizonPlanResponse, PlanResponse
+from app.schemas.coverage import CoverageRequest, CoverageResponse
+from app.schemas.ingest import PlanUploadMeta, UploadPlanResponse
+from app.schemas.estimation import EstimateHistoryRequest, EstimateModelStats, PreEstimateJob, PreEstimateRequest
+from app.schemas.evaluation import EvaluatePlanRequest, PlanEvaluation
+from app.schemas.plan_jobs import PlanJob
+from app.schemas.plan_analysis import PlanAnalysis
+from app.api.transport import CompressionMiddleware, parse_fields, render
 from app.services.planner import SprintPlanner
+from app.services.horizon import HorizonPlanner
+from app.services.evaluation import PlanEvaluator
+from app.services.coverage import CoverageAnalyzer
+from app.services.ingest import BacklogIngestor, detect_format
+from app.services.estimate_model import estimate_model
+from app.services.job_queue import plan_queue
+from app.services.plan_analysis import plan_analyses
+from app.services.pre_estimation import pre_estimation_jobs
+from app.services.admission import AdmissionRejected, admission_controller
+from app.core import profiling
 from app.core.logging import log_error
+from app.domain.enums import JobStatus, PlanJobKind
+from app.services.validator import PlanValidator
 
 app = FastAPI(
     title="Sprint Planning API",
@@ -59,7 +68,10 @@ app = FastAPI(
     version="1.0.0",
     openapi_tags=[
         {"name": "Planning", "description": "Sprint planning endpoints."},
-        {"name": "Health", "description": "Health check endpoint."}
+        {"name": "Analysis", "description": "Pre-planning analysis endpoints."},
+        {"name": "Estimation", "description": "Backlog pre-estimation endpoints."},
+        {"name": "Health", "description": "Health check endpoint."},
+        {"name": "Profiling", "description": "Per-request profiling artifacts."}
     ]
 )
 
@@ -71,10 +83,103 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
 
 # OAuth2/JWT security (placeholder)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
+def _client_id(http_request: Request) -> str:
+    """
+    Identify the caller for per-client fairness.
+
+    The key comes from the authenticated credential (a hash of the bearer
+    token) when auth is enabled, else from the client address. X-Client-Id
+    is chosen by the caller, so it is only a label and never the key.
+    """
+    if get_settings().AUTH_ENABLED:
+        scheme, _, credential = http_request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and credential:
+            return "token:" + hashlib.sha256(credential.encode()).hexdigest()[:16]
+    return http_request.client.host if http_request.client else "anonymous"
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated top-level fields to return, e.g. `summary,utilization`; others are not serialized"
+)
+
+def _profiling_requested(http_request: Request) -> bool:
+    """Profiling is opt-in: the caller must present the configured profiling token."""
+    token = get_settings().PROFILE_TOKEN
+    supplied = http_request.headers.get("X-Profile-Token")
+    return bool(token) and supplied is not None and hmac.compare_digest(supplied, token)
+
+PlanningRequest = Union[PlanRequest, HorizonPlanRequest]
+
+async def _run_planner(request: PlanningRequest, http_request: Request, http_response: Response):
+    """Run the sprint or horizon planner, under the profiler when the request asks for it."""
+    if isinstance(request, HorizonPlanRequest):
+        plan, label = HorizonPlanner().create_plan, f"horizon {request.sprints[0].sprint.id}"
+    else:
+        plan, label = SprintPlanner().create_plan, f"plan {request.sprint.id}"
+    if not _profiling_requested(http_request):
+        return await plan(request)
+    with profiling.profile_request(label) as session:
+        http_response.headers["X-Profile-Id"] = session.id
+        return await plan(request)
+
+async def _create_plan(request: PlanningRequest, http_request: Request, http_response: Response):
+    """Run the planner behind admission control, mapping rejections to HTTP errors."""
+    if not get_settings().ADMISSION_ENABLED:
+        return await _run_planner(request, http_request, http_response)
+    try:
+        async with admission_controller.admit(
+            request, _client_id(http_request), label=http_request.headers.get("X-Client-Id")
+        ):
+            return await _run_planner(request, http_request, http_response)
+    except AdmissionRejected as ar:
+        raise HTTPException(
+            status_code=ar.status_code,
+            detail=ar.reason,
+            headers={"Retry-After": str(ar.retry_after)}
+        )
+
+def _start_analysis(plan: PlanResponse, request: PlanRequest) -> None:
+    """Attach a background LLM analysis to a finished plan when enabled; never delays the response."""
+    if get_settings().PLAN_ANALYSIS_ENABLED:
+        constraints = request.constraints.model_dump(mode="json") if request.constraints else {}
+        plan.analysis_id = plan_analyses.start(plan, constraints)
+
+@app.post(
+    "/llm/model",
+    tags=["Estimation"],
+    summary="Set LLM model",
+    response_description="Model updated",
+    responses={
+        400: {"description": "Unknown provider."},
+        401: {"description": "Unauthorized."}
+    }
+)
+async def set_llm_model(
+    provider: str = Body(..., embed=True, examples=["ollama"]),
+    model: str = Body(..., embed=True, examples=["llama2"]),
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """
+    Set the LLM provider and model (Ollama or Bedrock).
+
+    Later estimates and plan analyses use the new model; cached estimates
+    are keyed by model, so the old model's answers are not reused.
+    """
+    if provider not in ("ollama", "bedrock"):
+        raise HTTPException(status_code=400, detail="Unknown provider")
+    settings = get_settings()
+    settings.MODEL_PROVIDER = provider
+    if provider == "ollama":
+        settings.OLLAMA_MODEL = model
+    else:
+        settings.BEDROCK_MODEL = model
+    return {"provider": provider, "model": model}
+
 @app.get("/health", tags=["Health"], summary="Health check", response_description="API health status")
 async def health_check():
     """Check API health."""
@@ -116,18 +221,427 @@ async def health_check():
         },
         400: {"description": "Validation error."},
         401: {"description": "Unauthorized."},
-        500: {"description": "Internal server error."}
+        429: {"description": "Too many concurrent plans for this client; see Retry-After."},
+        500: {"description": "Internal server error."},
+        503: {"description": "Planner at capacity; see Retry-After."}
     }
 )
-async def plan_sprint(request: PlanRequest, token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None):
-    """Generate a sprint plan based on input data."""
+async def plan_sprint(
+    request: PlanRequest,
+    http_request: Request,
+    http_response: Response,
+    fields: str = FIELDS_QUERY,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """
+    Generate a sprint plan based on input data.
+
+    Responds with MessagePack for `Accept: application/msgpack`. With
+    PLAN_ANALYSIS_ENABLED, `analysis_id` refers to an LLM analysis of the
+    plan that runs after the response; see `/plan/analysis/{analysis_id}`.
+    """
+    include = parse_fields(fields, PlanResponse)
     try:
-        planner = SprintPlanner()
-        response = await planner.create_plan(request)
-        return response
+        plan = await _create_plan(request, http_request, http_response)
+    except HTTPException:
+        raise
     except ValueError as ve:
         log_error(ve, {"request": request.model_dump()})
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         log_error(e, {"request": request.model_dump()})
         raise HTTPException(status_code=500, detail="Internal error: " + str(e))
+    _start_analysis(plan, request)
+    return render(plan, http_request, include, http_response.headers)
+
+@app.post(
+    "/plan/horizon",
+    response_model=HorizonPlanResponse,
+    tags=["Planning"],
+    summary="Plan several consecutive sprints",
+    response_description="One plan per sprint plus the tasks left after the horizon",
+    responses={
+        400: {"description": "Validation error."},
+        401: {"description": "Unauthorized."},
+        429: {"description": "Too many concurrent plans for this client; see Retry-After."},
+        500: {"description": "Internal server error."},
+        503: {"description": "Planner at capacity; see Retry-After."}
+    }
+)
+async def plan_horizon(
+    request: HorizonPlanRequest,
+    http_request: Request,
+    http_response: Response,
+    fields: str = FIELDS_QUERY,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """
+    Plan consecutive sprints in one call.
+
+    Sprints are planned in order; unassigned tasks and tasks whose
+    dependencies were just planned roll into the next sprint.
+    """
+    include = parse_fields(fields, HorizonPlanResponse)
+    try:
+        plan = await _create_plan(request, http_request, http_response)
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        log_error(ve, {"sprints": [s.sprint.id for s in request.sprints], "tasks": len(request.tasks)})
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        log_error(e, {"sprints": [s.sprint.id for s in request.sprints], "tasks": len(request.tasks)})
+        raise HTTPException(status_code=500, detail="Internal error: " + str(e))
+    return render(plan, http_request, include, http_response.headers)
+
+@app.post(
+    "/plan/evaluate",
+    response_model=PlanEvaluation,
+    tags=["Planning"],
+    summary="Evaluate a proposed plan",
+    response_description="Violations, utilization and objective of the proposal",
+    responses={
+        400: {"description": "Validation error."},
+        401: {"description": "Unauthorized."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def evaluate_plan(
+    request: EvaluatePlanRequest,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """
+    Check a manual or edited plan without solving.
+
+    Reports capacity, skill, max_assignees, parallel-task, dependency and
+    must-have violations, utilization, and the gap to the optimizer's
+    objective when the same input was planned recently.
+    """
+    try:
+        return await PlanEvaluator().evaluate(request)
+    except ValueError as ve:
+        log_error(ve, {"sprint_id": request.sprint.id, "assignments": len(request.assignments)})
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        log_error(e, {"sprint_id": request.sprint.id, "assignments": len(request.assignments)})
+        raise HTTPException(status_code=500, detail="Internal error: " + str(e))
+
+@app.post(
+    "/plan/sprint/upload",
+    response_model=UploadPlanResponse,
+    tags=["Planning"],
+    summary="Plan a sprint from uploaded backlog files",
+    response_description="Sprint plan plus row-level ingestion report",
+    responses={
+        400: {"description": "Invalid sprint metadata or planning input."},
+        401: {"description": "Unauthorized."},
+        429: {"description": "Too many concurrent plans for this client; see Retry-After."},
+        500: {"description": "Internal server error."},
+        503: {"description": "Planner at capacity; see Retry-After."}
+    }
+)
+async def plan_sprint_upload(
+    http_request: Request,
+    http_response: Response,
+    meta: str = Form(..., description="JSON object with sprint, teams and optional constraints"),
+    employees: UploadFile = File(..., description="Employees as NDJSON or CSV"),
+    tasks: UploadFile = File(..., description="Tasks as NDJSON or CSV"),
+    fields: str = FIELDS_QUERY,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """
+    Plan a sprint from large backlog exports.
+
+    Employee and task files are read incrementally, one row at a time, and
+    invalid rows are reported in `ingest.errors` instead of failing the upload.
+    """
+    include = parse_fields(fields, UploadPlanResponse)
+    try:
+        plan_meta = PlanUploadMeta.model_validate_json(meta)
+    except ValidationError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    ingestor = BacklogIngestor(plan_meta.teams, completed_task_ids=plan_meta.completed_task_ids)
+    task_list = []
+    try:
+        employee_list = await asyncio.to_thread(
+            ingestor.read_employees, employees.file, detect_format(employees.filename, employees.content_type)
+        )
+        task_list = await asyncio.to_thread(
+            ingestor.read_tasks, tasks.file, detect_format(tasks.filename, tasks.content_type)
+        )
+        request = PlanRequest(
+            sprint=plan_meta.sprint,
+            teams=plan_meta.teams,
+            employees=employee_list,
+            tasks=task_list,
+            constraints=plan_meta.constraints,
+            completed_task_ids=plan_meta.completed_task_ids
+        )
+        plan = await _create_plan(request, http_request, http_response)
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        log_error(ve, {"sprint_id": plan_meta.sprint.id, "tasks": len(task_list)})
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        log_error(e, {"sprint_id": plan_meta.sprint.id, "tasks": len(task_list)})
+        raise HTTPException(status_code=500, detail="Internal error: " + str(e))
+    _start_analysis(plan, request)
+    response = UploadPlanResponse(
+        **plan.model_dump(),
+        ingest=ingestor.report(task_list, employee_list)
+    )
+    return render(response, http_request, include, http_response.headers)
+
+@app.get(
+    "/plan/analysis/{analysis_id}",
+    response_model=PlanAnalysis,
+    tags=["Planning"],
+    summary="LLM analysis of a plan",
+    response_description="Analysis status, with the insights once completed",
+    responses={404: {"description": "Unknown analysis."}}
+)
+async def plan_analysis(
+    analysis_id: str,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """Report the background analysis of a plan; `analysis` holds the insights once completed."""
+    analysis = plan_analyses.get(analysis_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail=f"Unknown plan analysis: {analysis_id}")
+    return analysis
+
+ANALYSIS_KEEPALIVE_SECONDS = 15.0
+
+@app.get(
+    "/plan/analysis/{analysis_id}/stream",
+    tags=["Planning"],
+    summary="Stream the LLM analysis of a plan",
+    response_description="Server-sent events with the analysis status until it finished",
+    responses={404: {"description": "Unknown analysis."}}
+)
+async def stream_plan_analysis(
+    analysis_id: str,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """
+    Follow a plan analysis as server-sent events.
+
+    Sends the current state, comment keep-alives while the analysis runs and
+    a last event (`completed` or `failed`) with the result, then closes.
+    """
+    if plan_analyses.get(analysis_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown plan analysis: {analysis_id}")
+
+    async def events():
+        sent = None
+        while True:
+            analysis = plan_analyses.get(analysis_id)
+            if analysis is None:
+                return
+            if analysis.status != sent:
+                yield f"event: {analysis.status.value}\ndata: {analysis.model_dump_json()}\n\n"
+                sent = analysis.status
+            if analysis.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                return
+            analysis = await plan_analyses.wait(analysis_id, ANALYSIS_KEEPALIVE_SECONDS)
+            if analysis is not None and analysis.status == sent:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post(
+    "/analysis/coverage",
+    response_model=CoverageResponse,
+    tags=["Analysis"],
+    summary="Team skill coverage",
+    response_description="Team x task coverage matrix",
+    responses={
+        400: {"description": "Validation error."},
+        401: {"description": "Unauthorized."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def analyze_coverage(
+    request: CoverageRequest,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """Compute which teams cover which tasks' required skills, for a heat map."""
+    try:
+        return CoverageAnalyzer().analyze(request)
+    except ValueError as ve:
+        log_error(ve, {"teams": len(request.teams), "tasks": len(request.tasks)})
+        raise HTTPException(status_code=400, detail=str(ve))
+
+def _enqueue_plan(request: PlanningRequest) -> PlanJob:
+    """Validate a planning request and queue it for the solver workers."""
+    if plan_queue is None:
+        raise HTTPException(status_code=503, detail="Planning job queue is not configured (PLAN_QUEUE_PATH)")
+    try:
+        if isinstance(request, HorizonPlanRequest):
+            PlanValidator().validate_horizon(request)
+            return plan_queue.enqueue(PlanJobKind.HORIZON, request.model_dump_json())
+        PlanValidator().validate_request(request)
+        return plan_queue.enqueue(PlanJobKind.SPRINT, request.model_dump_json())
+    except ValueError as ve:
+        log_error(ve, {"tasks": len(request.tasks)})
+        raise HTTPException(status_code=400, detail=str(ve))
+
+@app.post(
+    "/plan/jobs",
+    response_model=PlanJob,
+    tags=["Planning"],
+    summary="Queue a sprint plan for the solver workers",
+    response_description="The queued job",
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        400: {"description": "Validation error."},
+        401: {"description": "Unauthorized."},
+        503: {"description": "Job queue not configured."}
+    }
+)
+async def enqueue_sprint_plan(
+    request: PlanRequest,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """
+    Queue a sprint plan; a solver worker (`python -m scripts.plan_worker`) solves it.
+
+    Poll GET `/plan/jobs/{job_id}` for the result.
+    """
+    return _enqueue_plan(request)
+
+@app.post(
+    "/plan/jobs/horizon",
+    response_model=PlanJob,
+    tags=["Planning"],
+    summary="Queue a multi-sprint plan for the solver workers",
+    response_description="The queued job",
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        400: {"description": "Validation error."},
+        401: {"description": "Unauthorized."},
+        503: {"description": "Job queue not configured."}
+    }
+)
+async def enqueue_horizon_plan(
+    request: HorizonPlanRequest,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """Queue a horizon plan; poll GET `/plan/jobs/{job_id}` for the result."""
+    return _enqueue_plan(request)
+
+@app.get(
+    "/plan/jobs/{job_id}",
+    response_model=PlanJob,
+    tags=["Planning"],
+    summary="Queued plan status and result",
+    response_description="Job status, with the plan once completed",
+    responses={
+        404: {"description": "Unknown job."},
+        503: {"description": "Job queue not configured."}
+    }
+)
+async def plan_job_status(
+    job_id: str,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """Report a queued plan's status; `result` holds the plan once the job completed."""
+    if plan_queue is None:
+        raise HTTPException(status_code=503, detail="Planning job queue is not configured (PLAN_QUEUE_PATH)")
+    job = plan_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown plan job: {job_id}")
+    return job
+
+@app.post(
+    "/estimates/prewarm",
+    response_model=PreEstimateJob,
+    tags=["Estimation"],
+    summary="Pre-estimate a backlog",
+    response_description="Background job status",
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={401: {"description": "Unauthorized."}}
+)
+async def prewarm_estimates(
+    request: PreEstimateRequest,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """Estimate a backlog in the background so planning later hits the estimate cache."""
+    return pre_estimation_jobs.start(request.tasks)
+
+@app.get(
+    "/estimates/prewarm/{job_id}",
+    response_model=PreEstimateJob,
+    tags=["Estimation"],
+    summary="Pre-estimation progress",
+    response_description="Background job status",
+    responses={
+        401: {"description": "Unauthorized."},
+        404: {"description": "Unknown job."}
+    }
+)
+async def prewarm_status(
+    job_id: str,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """Report the progress of a pre-estimation job."""
+    job = pre_estimation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown pre-estimation job: {job_id}")
+    return job
+
+@app.post(
+    "/estimates/history",
+    response_model=EstimateModelStats,
+    tags=["Estimation"],
+    summary="Fit the local estimate model",
+    response_description="Fit statistics",
+    responses={
+        400: {"description": "Not enough history."},
+        401: {"description": "Unauthorized."}
+    }
+)
+async def fit_estimate_model(
+    request: EstimateHistoryRequest,
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """
+    Fit the local estimate model and the LLM calibration on completed tasks.
+
+    Afterwards routine tasks are estimated locally; the LLM is only asked when
+    the model's prediction is uncertain.
+    """
+    try:
+        return estimate_model.fit(request.items)
+    except ValueError as ve:
+        log_error(ve, {"items": len(request.items)})
+        raise HTTPException(status_code=400, detail=str(ve))
+
+@app.get(
+    "/estimates/history",
+    response_model=EstimateModelStats,
+    tags=["Estimation"],
+    summary="Local estimate model statistics",
+    responses={401: {"description": "Unauthorized."}}
+)
+async def estimate_model_stats(
+    token: str = Depends(oauth2_scheme) if get_settings().AUTH_ENABLED else None
+):
+    """Report what the local estimate model was fitted on."""
+    return estimate_model.stats()
+
+@app.get(
+    "/profiles/{profile_id}",
+    tags=["Profiling"],
+    summary="Download a request profile",
+    response_description="Zip with profile.pstats, profile.txt, solver logs and summary.json",
+    responses={404: {"description": "Unknown profile or missing profiling token."}}
+)
+async def download_profile(profile_id: str, http_request: Request):
+    """Download the profiling artifact of a request made with X-Profile-Token."""
+    path = profiling.artifact_path(profile_id) if _profiling_requested(http_request) else None
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+    return FileResponse(path, media_type="application/zip", filename=f"profile_{profile_id}.zip")
@@ -0,0 +1,263 @@
+"""Content negotiation for large responses: MessagePack, compression and field projection."""
+import gzip
+import io
+import json
+import zlib
+from typing import Iterable, Mapping, Optional, Set, Type
+import msgpack
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import get_settings
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+settings = get_settings()
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+# Already compressed payloads are passed through as they are
+_INCOMPRESSIBLE_TYPES = ("application/zip", "application/gzip", "image/")
+
+
+def supported_encodings() -> Iterable[str]:
+    """Content codings in order of preference."""
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the preferred supported coding the client accepts (q > 0)."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    for coding in supported_encodings():
+        if coding in accepted or "*" in accepted:
+            return coding
+    return None
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Set[str]]:
+    """
+    Parse a ``fields=`` projection against a response model.
+
+    Args:
+        fields: Comma-separated top-level field names, or None for all fields
+        model: The response model the names must belong to
+
+    Returns:
+        The set of requested fields, or None when no projection was asked for
+
+    Raises:
+        HTTPException: 400 for unknown field names
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
+
+def render(
+    model: BaseModel,
+    http_request: Request,
+    include: Optional[Set[str]] = None,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Serialize a response model as JSON or MessagePack, following the Accept header.
+
+    Fields outside ``include`` are never serialized. Compression is left to
+    CompressionMiddleware.
+
+    Args:
+        model: The response model
+        http_request: The request, for its Accept header
+        include: Top-level fields to serialize, or None for all
+        headers: Extra response headers, e.g. those set on an injected Response
+    """
+    extra = {k: v for k, v in (headers or {}).items() if k.lower() != "content-length"}
+    accept = http_request.headers.get("accept", "")
+    if any(media_type in accept for media_type in MSGPACK_TYPES):
+        return Response(
+            msgpack.packb(model.model_dump(mode="json", include=include)),
+            media_type="application/msgpack",
+            headers=extra
+        )
+    return Response(model.model_dump_json(include=include), media_type="application/json", headers=extra)
+
+
+class _BodyTooLarge(ValueError):
+    pass
+
+
+def _decompress(body: bytes, encoding: str) -> bytes:
+    """Decompress a request body, refusing more than TRANSPORT_MAX_BODY_BYTES of output."""
+    if encoding == "gzip":
+        reader = gzip.GzipFile(fileobj=io.BytesIO(body))
+    else:
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body))
+    data = reader.read(settings.TRANSPORT_MAX_BODY_BYTES + 1)
+    if len(data) > settings.TRANSPORT_MAX_BODY_BYTES:
+        raise _BodyTooLarge(f"Decompressed body exceeds {settings.TRANSPORT_MAX_BODY_BYTES} bytes")
+    return data
+
+
+class _Compressor:
+    """Streaming gzip or zstd compressor for response bodies."""
+
+    def __init__(self, encoding: str):
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(6, zlib.DEFLATED, 31)
+            self._partial = lambda: self._obj.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            self._obj = zstandard.ZstdCompressor().compressobj()
+            self._partial = lambda: self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        # Streamed chunks are flushed so clients can decode them as they arrive
+        return self._obj.compress(chunk) + (self._obj.flush() if final else self._partial())
+
+
+class CompressionMiddleware:
+    """Compressed and MessagePack request bodies, compressed responses.
+
+    Requests with ``Content-Encoding: gzip`` or ``zstd`` are decompressed and
+    ``application/msgpack`` bodies are converted to JSON before routing, so
+    endpoints keep their pydantic request models. Responses are compressed
+    with the best coding in ``Accept-Encoding`` when they are at least
+    TRANSPORT_COMPRESS_MIN_BYTES, chunk by chunk for streamed responses.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        content_encoding = headers.get("content-encoding", "").strip().lower()
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_encoding not in ("", "identity") or content_type in MSGPACK_TYPES:
+            receive = await self._decode_request(scope, receive, send, content_encoding, content_type)
+            if receive is None:
+                return
+
+        encoding = negotiate_encoding(headers.get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, self._compressing_send(send, encoding))
+
+    async def _decode_request(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        content_encoding: str,
+        content_type: str
+    ) -> Optional[Receive]:
+        """Read, decode and replay the request body; None when an error response was sent."""
+        if content_encoding not in ("", "identity") and content_encoding not in supported_encodings():
+            await self._error(send, 415, f"Unsupported Content-Encoding: {content_encoding}")
+            return None
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+        try:
+            if content_encoding not in ("", "identity"):
+                body = _decompress(body, content_encoding)
+            if content_type in MSGPACK_TYPES:
+                body = json.dumps(msgpack.unpackb(body), default=str).encode()
+        except _BodyTooLarge as e:
+            await self._error(send, 413, str(e))
+            return None
+        except Exception as e:
+            await self._error(send, 400, f"Undecodable request body: {e}")
+            return None
+
+        raw = MutableHeaders(scope=scope)
+        if "content-encoding" in raw:
+            del raw["content-encoding"]
+        if content_type in MSGPACK_TYPES:
+            raw["content-type"] = "application/json"
+        raw["content-length"] = str(len(body))
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    def _compressing_send(self, send: Send, encoding: str) -> Send:
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+
+        async def wrapped(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                media_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or media_type.startswith(_INCOMPRESSIBLE_TYPES)
+                    or (not more_body and len(body) < settings.TRANSPORT_COMPRESS_MIN_BYTES)
+                ):
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding)
+                body = compressor.compress(body, final=not more_body)
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    headers["content-length"] = str(len(body))
+                await send(start)
+                start = None
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+            if compressor is not None:
+                body = compressor.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        return wrapped
+
+    @staticmethod
+    async def _error(send: Send, status: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
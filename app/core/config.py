@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -22,6 +23,95 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = ""
     BEDROCK_MODEL: str = "anthropic.claude-v2"
 
+    # Provider Routing
+    LLM_FALLBACK_PROVIDER: str = ""  # ollama or bedrock; enables hedging and failover when set
+    LLM_HEDGE_DEFAULT_SECONDS: float = 10.0  # hedge delay until a provider has enough latency samples
+    LLM_BREAKER_FAILURES: int = 5  # consecutive failures that open a provider's circuit
+    LLM_BREAKER_RESET_SECONDS: float = 30.0  # open time before a probe call is let through
+    LLM_ROUTER_WINDOW: int = 200  # latency/outcome samples kept per provider
+
+    # Estimation Prompts
+    LLM_STREAM: bool = True  # stream generations and stop once the JSON answer is complete
+    LLM_ESTIMATE_MAX_TOKENS: int = 48  # output cap of a single estimate (~30 tokens of JSON)
+    LLM_DESCRIPTION_TOKEN_BUDGET: int = 400  # longer task descriptions are compacted
+    LLM_ANALYSIS_MAX_TOKENS: int = 600  # output cap of a plan analysis
+
+    # Batched Estimation
+    LLM_BATCH_ENABLED: bool = True  # estimate several tasks per prompt
+    LLM_BATCH_TOKEN_BUDGET: int = 3000  # prompt + expected answer tokens per batch
+    LLM_BATCH_MAX_TASKS: int = 25
+    LLM_CACHE_PATH: Optional[str] = None  # SQLite file persisting estimates; in-memory only when unset
+
+    # Local Estimate Model
+    ESTIMATE_HISTORY_PATH: Optional[str] = None  # completed tasks (JSON array or NDJSON) fitted at startup
+    ESTIMATE_MODEL_FEATURES: int = 512  # hash buckets for description words and bigrams
+    ESTIMATE_MODEL_RIDGE: float = 0.1
+    ESTIMATE_MODEL_MIN_SAMPLES: int = 20  # history needed to fit the model or the LLM calibration
+    ESTIMATE_MODEL_MAX_LOG_STD: float = 0.35  # prediction error (log1p hours) above which the LLM is asked
+    ESTIMATE_MODEL_MIN_OVERLAP: float = 0.6  # share of description words/bigrams that must occur in the history
+
+    # Backlog Pre-estimation
+    PREESTIMATE_CONCURRENCY: int = 2  # estimation batches in flight per job
+    PREESTIMATE_MAX_JOBS: int = 100  # finished jobs kept for status queries
+
+    # Plan Analysis
+    PLAN_ANALYSIS_ENABLED: bool = False  # analyze every /plan/sprint result with the LLM in the background
+    PLAN_ANALYSIS_CONCURRENCY: int = 2  # analyses in flight; further ones wait
+    PLAN_ANALYSIS_MAX_ENTRIES: int = 256  # finished analyses kept for /plan/analysis
+
+    # Planning Job Queue
+    PLAN_QUEUE_PATH: Optional[str] = None  # local SQLite file shared by the API and solver workers on one host; /plan/jobs disabled when unset
+    PLAN_QUEUE_VISIBILITY_SECONDS: float = 300.0  # lease length; renewed while a worker is solving
+    PLAN_QUEUE_MAX_ATTEMPTS: int = 3  # leases per job before it fails (crashed workers, transient errors)
+    PLAN_QUEUE_POLL_SECONDS: float = 1.0  # idle workers' polling interval
+
+    # Solver Settings
+    SOLVER_BACKEND: str = "auto"  # auto, cbc, highs, scipy or lagrangian
+    SOLVER_THREADS: int = 0  # 0 = chosen per model size
+    SOLVER_OPTIONS: str = ""  # extra solver options, space separated
+    SOLVER_TIME_LIMIT: Optional[float] = None  # default seconds per solve
+    BALANCE_STAGE_TIME_RATIO: float = 0.5  # balancing stage budget, relative to the priority stage
+    BALANCE_STAGE_MIN_SECONDS: float = 1.0
+    SOLVER_AGGREGATE_EMPLOYEES: bool = True  # solve interchangeable employees as classes
+    SOLVER_LAGRANGIAN_MIN_VARIABLES: int = 0  # auto backend: models this large use the Lagrangian decomposition; 0 = never
+    SOLVER_LAGRANGIAN_TIME_LIMIT: float = 30.0  # seconds per decomposition run without a request deadline
+    SOLVER_LAGRANGIAN_GAP: float = 0.01  # stop once the plan is proven within this relative gap
+    SOLVER_LAGRANGIAN_MAX_ITERATIONS: int = 300  # subgradient iterations
+    SOLVER_LAGRANGIAN_PATIENCE: int = 10  # iterations without a better bound before the step is halved
+    SOLVER_LAGRANGIAN_REPAIR_EVERY: int = 5  # iterations between repair heuristics
+    SOLVER_LAGRANGIAN_DP_BINS: int = 128  # capacity resolution of the per-employee knapsacks
+    PLAN_OBJECTIVE_CACHE_SIZE: int = 256  # optimizer objectives kept for /plan/evaluate gaps
+
+    # Horizon Planning
+    HORIZON_LOOKAHEAD_SPRINTS: int = 1  # sprints ahead whose unblocked work weighs on the current sprint
+    HORIZON_LOOKAHEAD_DISCOUNT: float = 0.5  # weight of unblocked work per sprint of delay
+
+    # Admission Control
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_CHEAP_COST_SECONDS: float = 1.0  # predicted cost below this uses the cheap lane
+    ADMISSION_CHEAP_CONCURRENCY: int = 4
+    ADMISSION_EXPENSIVE_CONCURRENCY: int = 1
+    ADMISSION_CHEAP_MAX_WAIT: float = 2.0  # seconds of predicted queueing before shedding
+    ADMISSION_EXPENSIVE_MAX_WAIT: float = 120.0
+    ADMISSION_MAX_PER_CLIENT: int = 4  # queued + running plans per client and lane
+    ADMISSION_BASE_SECONDS: float = 0.05
+    ADMISSION_SECONDS_PER_PAIR: float = 1e-4
+    ADMISSION_SECONDS_PER_ESTIMATE: float = 2.0
+    ADMISSION_SECONDS_PER_DEPENDENCY: float = 1e-3
+
+    # Transport
+    TRANSPORT_COMPRESS_MIN_BYTES: int = 1024  # smaller responses are sent uncompressed
+    TRANSPORT_MAX_BODY_BYTES: int = 256 * 1024 * 1024  # decompressed request body limit
+
+    # Request Profiling
+    PROFILE_TOKEN: str = ""  # X-Profile-Token value enabling profiling; disabled when empty
+    PROFILE_DIR: str = "profiles"  # where profile artifacts are stored
+    PROFILE_MAX_ARTIFACTS: int = 20
+    PROFILE_TOP_FUNCTIONS: int = 60  # functions listed in profile.txt
+
+    # Backlog Uploads
+    INGEST_MAX_ROW_ERRORS: int = 1000  # row errors returned per upload; the rest are only counted
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,199 @@
+"""Opt-in per-request profiling.
+
+A ProfileSession is bound to the current context only for requests that ask
+for it. Code elsewhere reports into the session through the module functions
+below, which are a single ContextVar lookup when no session is active, so
+unprofiled requests pay nothing measurable.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_session: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+# cProfile allows one active profiler per thread; concurrent profiled
+# requests on the event loop thread fall back to phase timings only
+_loop_profiler_lock = threading.Lock()
+
+
+class ProfileSession:
+    """Profiler output, phase timings, solver logs and model statistics of one request."""
+
+    def __init__(self, label: str):
+        self.id = uuid.uuid4().hex
+        self.label = label
+        self.profilers: List[cProfile.Profile] = []
+        self.phases: List[Dict[str, Any]] = []
+        self.solver_runs: List[Dict[str, Any]] = []
+        self.stats: Dict[str, Any] = {}
+        self.notes: List[str] = []
+        self._lock = threading.Lock()
+
+    def add_profiler(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            self.profilers.append(profiler)
+
+    def write_artifact(self, directory: str) -> str:
+        """Write the session as a zip archive and return its path.
+
+        The archive holds ``profile.pstats`` (for pstats/snakeviz),
+        ``profile.txt`` (top functions by cumulative time), one log file per
+        solver run and ``summary.json`` with phases, model stats and runs.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.id}.zip")
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            if self.profilers:
+                stats = pstats.Stats(self.profilers[0])
+                for profiler in self.profilers[1:]:
+                    stats.add(profiler)
+                fd, dump_path = tempfile.mkstemp(suffix=".pstats")
+                os.close(fd)
+                try:
+                    stats.dump_stats(dump_path)
+                    archive.write(dump_path, "profile.pstats")
+                finally:
+                    os.remove(dump_path)
+                stats.stream = io.StringIO()
+                stats.sort_stats("cumulative").print_stats(settings.PROFILE_TOP_FUNCTIONS)
+                archive.writestr("profile.txt", stats.stream.getvalue())
+            runs = []
+            for k, run in enumerate(self.solver_runs):
+                log = run.pop("log", "")
+                if log:
+                    run["log_file"] = f"solver_{k}_{run['backend']}.log"
+                    archive.writestr(run["log_file"], log)
+                runs.append(run)
+            archive.writestr("summary.json", json.dumps({
+                "id": self.id,
+                "label": self.label,
+                "phases": self.phases,
+                "model": self.stats,
+                "solver_runs": runs,
+                "notes": self.notes
+            }, indent=2, default=str))
+        _prune(directory)
+        return path
+
+
+def _prune(directory: str) -> None:
+    artifacts = sorted(
+        (os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".zip")),
+        key=os.path.getmtime
+    )
+    for path in artifacts[:-settings.PROFILE_MAX_ARTIFACTS]:
+        os.remove(path)
+
+
+def current() -> Optional[ProfileSession]:
+    return _session.get()
+
+
+def artifact_path(profile_id: str) -> Optional[str]:
+    """Path of a stored artifact, or None if unknown."""
+    if not profile_id.isalnum():
+        return None
+    path = os.path.join(settings.PROFILE_DIR, f"{profile_id}.zip")
+    return path if os.path.exists(path) else None
+
+
+@contextmanager
+def profile_request(label: str) -> Iterator[ProfileSession]:
+    """
+    Profile everything run in this context until the block exits.
+
+    The event loop thread is profiled deterministically with cProfile (which
+    also sees other coroutines interleaved on the loop); work sent to threads
+    through run_in_thread is profiled in its own thread and merged. The
+    artifact is written when the block exits, also on errors.
+
+    Yields:
+        The session; its ``id`` names the downloadable artifact
+    """
+    session = ProfileSession(label)
+    token = _session.set(session)
+    profiler = None
+    if _loop_profiler_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            _loop_profiler_lock.release()
+            profiler = None
+    if profiler is None:
+        session.notes.append("Another profiler was active; event loop not profiled")
+    try:
+        yield session
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _loop_profiler_lock.release()
+            session.add_profiler(profiler)
+        _session.reset(token)
+        session.write_artifact(settings.PROFILE_DIR)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a named phase of the current request, if it is being profiled."""
+    session = _session.get()
+    if session is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        session.phases.append({"phase": name, "seconds": round(time.perf_counter() - start, 6)})
+
+
+def record_stats(**stats: Any) -> None:
+    """Attach model statistics to the current profile."""
+    session = _session.get()
+    if session is not None:
+        session.stats.update(stats)
+
+
+def record_solver_run(**run: Any) -> None:
+    """Attach a solver run, including its full log, to the current profile."""
+    session = _session.get()
+    if session is not None:
+        with session._lock:
+            session.solver_runs.append(run)
+
+
+def run_in_thread(fn: Callable, *args: Any) -> Any:
+    """
+    Call fn(*args), profiling it when the current request is profiled.
+
+    Meant as the target of asyncio.to_thread, which copies the context (and
+    so the session) into the worker thread.
+    """
+    session = _session.get()
+    if session is None:
+        return fn(*args)
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows one profiler per interpreter; the loop profiler covers this thread
+        return fn(*args)
+    try:
+        return fn(*args)
+    finally:
+        profiler.disable()
+        session.add_profiler(profiler)
@@ -26,3 +26,36 @@ class Objective(str, Enum):
 class MatchPolicy(str, Enum):
     THRESHOLD = "threshold"
     WEIGHTED = "weighted"
+
+class UnassignedReason(str, Enum):
+    NO_SKILL_HOLDER = "no_eligible_skill_holder"
+    TOO_LARGE = "too_large_for_eligible_people"
+    SATURATED = "eligible_people_saturated"
+    BLOCKED_DEPENDENCY = "blocked_dependency"
+    MUST_HAVE_CONFLICT = "must_have_conflict"
+
+class CoverageStatus(str, Enum):
+    COVERED = "covered"
+    PARTIAL = "partial"
+    UNCOVERED = "uncovered"
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class PlanJobKind(str, Enum):
+    SPRINT = "sprint"
+    HORIZON = "horizon"
+
+class ViolationKind(str, Enum):
+    UNKNOWN_TASK = "unknown_task"
+    UNKNOWN_EMPLOYEE = "unknown_employee"
+    CAPACITY = "capacity_exceeded"
+    PARALLEL_LIMIT = "parallel_limit_exceeded"
+    MAX_ASSIGNEES = "max_assignees_exceeded"
+    SKILL_NOT_COVERED = "skill_not_covered"
+    INELIGIBLE_ASSIGNEE = "ineligible_assignee"
+    DEPENDENCY = "dependency_not_planned"
+    MUST_HAVE = "must_have_not_planned"
@@ -13,14 +13,19 @@ class SkillRequirement(BaseModel):
 
 class Capacity(BaseModel):
     unit: Unit
-    available: float = Field(gt=0)
+    available: Optional[float] = Field(default=None, ge=0)  # derived from the sprint calendar when omitted
     notes: Optional[str] = None
 
+class DateRange(BaseModel):
+    start: date
+    end: date
+
 class Estimate(BaseModel):
     unit: Unit  # "hours" or "points"
     value: float = Field(gt=0)
     confidence: Optional[str] = None  # "high", "medium", "low"
     reasoning: Optional[str] = None
+    provider: Optional[str] = None  # LLM provider that produced the estimate
 
 class Team(BaseModel):
     id: str
@@ -34,6 +39,8 @@ class Employee(BaseModel):
     team_id: str
     skills: List[Skill]
     capacity: Capacity
+    pto: List[DateRange] = Field(default_factory=list)
+    allocation_pct: float = Field(default=100.0, gt=0, le=100)
 
 class Task(BaseModel):
     id: str
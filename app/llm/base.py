@@ -1,5 +1,8 @@
 from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
+from app.llm.estimation import (
+    GenerationRequest, analysis_request, batch_request, estimation_request, parse_batch_estimates, parse_estimate
+)
 
 class LLMClient(ABC):
     """Base class for LLM providers."""
@@ -23,6 +26,18 @@ class LLMClient(ABC):
         pass
 
     @abstractmethod
+    async def generate(self, request: GenerationRequest) -> str:
+        """
+        Complete a single prompt within its output limits.
+
+        Args:
+            request: Prompt, maximum output tokens and stop sequences
+
+        Returns:
+            The generated text, without the matched stop sequence
+        """
+        pass
+
     async def estimate_task(self, task_description: str, required_skills: list[str]) -> Dict[str, Any]:
         """
         Estimate effort for a task based on description and required skills.
@@ -33,10 +48,26 @@ class LLMClient(ABC):
             
         Returns:
             Dictionary with estimation details
+
+        Raises:
+            ValueError: If the answer holds no usable estimate
         """
-        pass
+        return parse_estimate(await self.generate(estimation_request(task_description, required_skills)))
+
+    async def estimate_tasks_batch(self, tasks: list[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Estimate several tasks with a single generation.
+
+        Args:
+            tasks: Tasks as {"id", "description", "skills"} dicts
+
+        Returns:
+            Estimates keyed by task id; tasks missing from the result were not
+            answered usably and should be estimated individually
+        """
+        response = await self.generate(batch_request(tasks))
+        return parse_batch_estimates(response, [t["id"] for t in tasks])
 
-    @abstractmethod
     async def analyze_plan(self, 
                          plan_summary: Dict[str, Any],
                          constraints: Dict[str, Any]) -> str:
@@ -50,4 +81,4 @@ class LLMClient(ABC):
         Returns:
             Analysis and recommendations as a string
         """
-        pass
+        return (await self.generate(analysis_request(plan_summary, constraints))).strip()
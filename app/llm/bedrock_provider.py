@@ -1,7 +1,11 @@
+import asyncio
 import boto3
 import json
+import threading
 from typing import Dict, Any, Optional, List
 from app.llm.base import LLMClient
+from app.llm.estimation import GenerationRequest
+from app.llm.streaming import JsonStreamDetector
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -24,26 +28,25 @@ class BedrockProvider(LLMClient):
         response = await self._invoke_model(formatted_messages)
         return self._parse_response(response)
 
-    async def estimate_task(self, task_description: str, required_skills: List[str]) -> Dict[str, Any]:
-        """Estimate effort for a task."""
-        
-        messages = [
-            {"role": "system", "content": "You are an expert project estimator. Analyze the task and required skills to provide an effort estimate in hours."},
-            {"role": "user", "content": f"Task: {task_description}\nRequired skills: {', '.join(required_skills)}"}
-        ]
-        
-        response = await self.chat(messages, json_mode=True)
-        return json.loads(response)
-
-    async def analyze_plan(self, plan_summary: Dict[str, Any], constraints: Dict[str, Any]) -> str:
-        """Analyze a sprint plan."""
-        
-        messages = [
-            {"role": "system", "content": "You are a sprint planning expert. Analyze the plan and provide insights."},
-            {"role": "user", "content": f"Plan summary: {json.dumps(plan_summary)}\nConstraints: {json.dumps(constraints)}"}
-        ]
-        
-        return await self.chat(messages)
+    async def generate(self, request: GenerationRequest) -> str:
+        """Complete a single prompt with tight output limits."""
+        body = self._format_messages([{"role": "user", "content": request.prompt}], json_mode=False)
+        body.update({
+            "max_tokens_to_sample": request.max_tokens,
+            "temperature": 0,
+            "stop_sequences": body["stop_sequences"] + request.stop
+        })
+        if settings.LLM_STREAM and request.expect is not None:
+            # Cancelling the awaiting task does not stop the thread; the flag makes it close the stream
+            cancelled = threading.Event()
+            try:
+                return await asyncio.to_thread(
+                    self._invoke_streaming, body, JsonStreamDetector(request.expect), cancelled
+                )
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return self._parse_response(await self._invoke_model(body))
 
     def _format_messages(self, messages: List[Dict[str, str]], json_mode: bool) -> Dict[str, Any]:
         """Format messages for Bedrock models."""
@@ -63,15 +66,18 @@ class BedrockProvider(LLMClient):
         ])
 
         return {
-            "prompt": prompt + "\n\nAssistant:",
-            "max_tokens": 2048,
+            "prompt": "\n\n" + prompt + "\n\nAssistant:",
+            "max_tokens_to_sample": 2048,
             "temperature": 0.1 if json_mode else 0.7,
             "top_p": 1,
             "stop_sequences": ["\n\nHuman:"]
         }
 
     async def _invoke_model(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
-        """Invoke the Bedrock model."""
+        """Invoke the Bedrock model in a worker thread; boto3 blocks until the whole answer arrived."""
+        return await asyncio.to_thread(self._invoke_blocking, request_body)
+
+    def _invoke_blocking(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
         response = self.client.invoke_model(
             body=json.dumps(request_body),
             modelId=self.model,
@@ -80,6 +86,33 @@ class BedrockProvider(LLMClient):
         )
         return json.loads(response['body'].read())
 
+    def _invoke_streaming(
+        self,
+        request_body: Dict[str, Any],
+        detector: JsonStreamDetector,
+        cancelled: Optional[threading.Event] = None
+    ) -> str:
+        """Stream a completion, closing the stream once the JSON answer is complete or the call was cancelled."""
+        response = self.client.invoke_model_with_response_stream(
+            body=json.dumps(request_body),
+            modelId=self.model,
+            contentType='application/json',
+            accept='application/json'
+        )
+        stream = response['body']
+        try:
+            for event in stream:
+                if cancelled is not None and cancelled.is_set():
+                    break
+                if 'chunk' not in event:
+                    continue
+                chunk = json.loads(event['chunk']['bytes'])
+                if detector.feed(self._parse_response(chunk)) or chunk.get('stop_reason'):
+                    break
+        finally:
+            stream.close()
+        return detector.answer
+
     def _parse_response(self, response: Dict[str, Any]) -> str:
         """Parse the response from Bedrock."""
         if self.model.startswith('anthropic.claude'):
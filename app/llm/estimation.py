@@ -0,0 +1,216 @@
+"""The estimation prompt pipeline shared by all providers.
+
+Builds single and batched estimation prompts with compacted descriptions,
+tight output limits and stop sequences, and parses the answers robustly.
+The plan analysis request is built here as well, as it goes through the same
+GenerationRequest path.
+"""
+import json
+from typing import Any, Dict, Iterable, List, Optional
+from app.core.config import get_settings
+from app.llm.prompts import (
+    BATCH_ESTIMATION_PROMPT, BATCH_TASK_LINE, PLAN_ANALYSIS_PROMPT, TASK_ESTIMATION_PROMPT
+)
+from app.llm.tokens import compact_text, count_tokens
+
+settings = get_settings()
+
+# Expected answer size per task, e.g. {"id": "T-101", "unit": "hours", "value": 12, "confidence": "medium"}
+ANSWER_TOKENS_PER_TASK = 30
+# Room for an opening fence or bracket around a batch answer
+ANSWER_SLACK_TOKENS = 16
+ESTIMATE_FIELDS = ("unit", "value", "confidence", "reasoning")
+
+
+class GenerationRequest:
+    """A prompt with its output limits, as sent to LLMClient.generate.
+
+    ``expect`` is the opening character of the JSON answer ("{" or "["); when
+    set, streaming providers stop reading as soon as that value is complete.
+    """
+
+    def __init__(
+        self,
+        prompt: str,
+        max_tokens: int,
+        stop: Optional[List[str]] = None,
+        expect: Optional[str] = None
+    ):
+        self.prompt = prompt
+        self.max_tokens = max_tokens
+        self.stop = stop or []
+        self.expect = expect
+
+
+def _skills(skills: List[str]) -> str:
+    return ", ".join(skills) or "none"
+
+
+def estimation_request(task_description: str, required_skills: List[str]) -> GenerationRequest:
+    """
+    Build the single-task estimation request.
+
+    The answer is one flat JSON object, so generation stops at its closing
+    brace (which the stop sequence swallows; parse_estimate restores it).
+    """
+    prompt = (
+        TASK_ESTIMATION_PROMPT
+        .replace("{task_description}", compact_text(task_description, settings.LLM_DESCRIPTION_TOKEN_BUDGET))
+        .replace("{skills}", _skills(required_skills))
+    )
+    return GenerationRequest(prompt, settings.LLM_ESTIMATE_MAX_TOKENS, stop=["}"], expect="{")
+
+
+def task_line(item: Dict[str, Any]) -> str:
+    """Render one task of a batch prompt."""
+    return (
+        BATCH_TASK_LINE
+        .replace("{id}", str(item["id"]))
+        .replace("{skills}", _skills(item["skills"]))
+        .replace("{task_description}", compact_text(item["description"], settings.LLM_DESCRIPTION_TOKEN_BUDGET))
+    )
+
+
+def batch_request(items: List[Dict[str, Any]]) -> GenerationRequest:
+    """Build the request estimating every item ({"id", "description", "skills"}) at once."""
+    prompt = BATCH_ESTIMATION_PROMPT.replace("{tasks}", "\n".join(task_line(item) for item in items))
+    max_tokens = ANSWER_TOKENS_PER_TASK * len(items) + ANSWER_SLACK_TOKENS
+    return GenerationRequest(prompt, max_tokens, stop=["]"], expect="[")
+
+
+def analysis_request(plan_summary: Dict[str, Any], constraints: Dict[str, Any]) -> GenerationRequest:
+    """Build the free-text plan analysis request; the plan is sent as compact JSON."""
+    prompt = (
+        PLAN_ANALYSIS_PROMPT
+        .replace("{plan_summary}", json.dumps(plan_summary, separators=(",", ":")))
+        .replace("{constraints}", json.dumps(constraints, separators=(",", ":")))
+    )
+    return GenerationRequest(prompt, settings.LLM_ANALYSIS_MAX_TOKENS)
+
+
+def chunk_by_budget(
+    items: List[Dict[str, Any]],
+    token_budget: int,
+    max_items: int
+) -> List[List[Dict[str, Any]]]:
+    """
+    Split items into batches whose prompt and expected answer fit a token budget.
+
+    Args:
+        items: Tasks as {"id", "description", "skills"} dicts
+        token_budget: Maximum prompt + answer tokens per batch
+        max_items: Maximum tasks per batch
+
+    Returns:
+        Batches in input order; an item larger than the budget gets its own batch
+    """
+    base = count_tokens(BATCH_ESTIMATION_PROMPT) + ANSWER_SLACK_TOKENS
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    used = base
+    for item in items:
+        cost = count_tokens(task_line(item)) + ANSWER_TOKENS_PER_TASK
+        if current and (used + cost > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], base
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _iter_json_values(text: str) -> Iterable[Any]:
+    """Yield every top-level JSON value that can be decoded from a text.
+
+    Tolerates leading prose, markdown fences and a truncated tail: decoding
+    resumes at the next "{" or "[" after anything that does not parse.
+    """
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        starts = [p for p in (text.find("{", pos), text.find("[", pos)) if p != -1]
+        if not starts:
+            return
+        start = min(starts)
+        try:
+            value, pos = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            pos = start + 1
+            continue
+        yield value
+
+
+def _clean_estimate(entry: Any) -> Dict[str, Any]:
+    if not isinstance(entry, dict):
+        return {}
+    value = entry.get("value")
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        return {}
+    if entry.get("unit", "hours") not in ("hours", "points"):
+        return {}
+    estimate = {k: entry[k] for k in ESTIMATE_FIELDS if entry.get(k) is not None}
+    estimate.setdefault("unit", "hours")
+    return estimate
+
+
+def parse_batch_estimates(text: str, ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract the valid per-task estimates from a batch answer.
+
+    Accepts a JSON array of {"id", "unit", "value", ...} objects or an object
+    keyed by task id. Objects of a truncated or otherwise broken array are
+    still picked up one by one. Entries with unknown ids or without a positive
+    numeric value are dropped, so their tasks can be re-asked.
+
+    Args:
+        text: Raw model output
+        ids: Task ids the batch asked for
+
+    Returns:
+        Mapping of task id to estimate dict for every task answered correctly
+    """
+    wanted = set(ids)
+    found: Dict[str, Dict[str, Any]] = {}
+
+    def collect(value: Any) -> None:
+        if isinstance(value, list):
+            for entry in value:
+                collect(entry)
+        elif isinstance(value, dict):
+            if "id" in value:
+                task_id = str(value["id"])
+                estimate = _clean_estimate(value)
+                if task_id in wanted and estimate:
+                    found.setdefault(task_id, estimate)
+            else:
+                for key, entry in value.items():
+                    if key in wanted and isinstance(entry, dict):
+                        collect({**entry, "id": key})
+                    elif isinstance(entry, (list, dict)):
+                        collect(entry)
+
+    for value in _iter_json_values(text):
+        collect(value)
+    return found
+
+
+def parse_estimate(text: str) -> Dict[str, Any]:
+    """
+    Extract the estimate from a single-task answer.
+
+    Args:
+        text: Raw model output, possibly cut at the closing brace by the stop sequence
+
+    Returns:
+        The estimate dict
+
+    Raises:
+        ValueError: If the answer holds no usable estimate
+    """
+    for candidate in (text, text + "}"):
+        for value in _iter_json_values(candidate):
+            estimate = _clean_estimate(value)
+            if estimate:
+                return estimate
+    raise ValueError(f"LLM response holds no valid estimate: {text!r}")
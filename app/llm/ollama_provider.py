@@ -1,13 +1,11 @@
+import asyncio
 import httpx
 import json
-import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, List, Optional
 from app.llm.base import LLMClient
+from app.llm.estimation import GenerationRequest
+from app.llm.streaming import JsonStreamDetector
 from app.core.config import get_settings
-try:
-    from app.core.logging import logger as custom_logger
-except ImportError:
-    custom_logger = None
 
 settings = get_settings()
 
@@ -15,85 +13,68 @@ class OllamaProvider(LLMClient):
     def __init__(self):
         self.base_url = settings.OLLAMA_BASE_URL
         self.model = settings.OLLAMA_MODEL
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
-    async def chat(self, messages: list, json_mode: bool = False, tools: list = None) -> str:
-        # Stub implementation for compatibility
-        return "Ollama chat not implemented."
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client of the running event loop.
+
+        An AsyncClient's connections belong to the loop that opened them, so a
+        provider shared across asyncio.run calls (the process-wide router,
+        worker processes planning one job after another) gets a new client
+        for each loop. A client set from outside is adopted by the first loop
+        that uses it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or (self._loop is not None and self._loop is not loop):
+            self._client = httpx.AsyncClient(timeout=60.0)
+        self._loop = loop
+        return self._client
 
-    async def estimate_task(self, task_description: str, required_skills: list = None) -> dict:
-        # Use the existing sync estimate_task logic for now
-        return self._estimate_task_sync(task_description)
+    @client.setter
+    def client(self, client: httpx.AsyncClient) -> None:
+        self._client, self._loop = client, None
 
-    def _estimate_task_sync(self, task_description: str) -> dict:
-        prompt = (
-            """
-            You are an expert software project estimator. Given a task description, estimate the effort required to complete the task. 
-            Respond ONLY with a valid JSON object in the following format (no explanation, no markdown):
-            {"unit": "hours", "value": <float>}
-            Task: {task_description}
-            """
-        )
-        prompt = prompt.replace("{task_description}", task_description)
+    async def chat(self, messages: list, json_mode: bool = False, tools: list = None) -> str:
         payload = {
             "model": self.model,
-            "prompt": prompt,
+            "prompt": self._format_messages(messages, json_mode),
             "stream": False
         }
-        try:
-            response = httpx.post(f"{self.base_url}/api/generate", json=payload, timeout=30)
+        response = await self.client.post(f"{self.base_url}/api/generate", json=payload)
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    async def generate(self, request: GenerationRequest) -> str:
+        stream = settings.LLM_STREAM and request.expect is not None
+        payload = {
+            "model": self.model,
+            "prompt": request.prompt,
+            "stream": stream,
+            "options": {
+                "num_predict": request.max_tokens,
+                "stop": request.stop,
+                "temperature": 0
+            }
+        }
+        if not stream:
+            response = await self.client.post(f"{self.base_url}/api/generate", json=payload)
             response.raise_for_status()
-            raw_output = response.json().get("response", "")
-            # Try to extract JSON from the output
-            json_start = raw_output.find('{')
-            json_end = raw_output.rfind('}')
-            if json_start != -1:
-                # If closing brace is missing, fix it
-                if json_end == -1:
-                    json_str = raw_output[json_start:] + '}'
-                else:
-                    json_str = raw_output[json_start:json_end+1]
-            else:
-                json_str = raw_output.strip()
-            try:
-                return json.loads(json_str)
-            except Exception as e:
-                if custom_logger:
-                    try:
-                        custom_logger.error(f"LLM response not valid JSON: {raw_output}")
-                    except Exception:
-                        logging.error(f"LLM response not valid JSON: {raw_output}")
-                else:
-                    logging.error(f"LLM response not valid JSON: {raw_output}")
-                # Fallback: try to fix missing closing brace
-                if json_str and not json_str.strip().endswith('}'): 
-                    json_str_fixed = json_str.strip() + '}'
-                    try:
-                        return json.loads(json_str_fixed)
-                    except Exception:
-                        pass
-                # Log the error with standard logging if custom logger fails
-                if custom_logger:
-                    try:
-                        custom_logger.error(f"LLM JSON parse error: {e}")
-                    except Exception:
-                        logging.error(f"LLM JSON parse error: {e}")
-                else:
-                    logging.error(f"LLM JSON parse error: {e}")
-                return {"unit": "hours", "value": 8.0, "error": "llm_parse_failed"}
-        except Exception as e:
-            if custom_logger:
-                try:
-                    custom_logger.error(f"OllamaProvider error: {e}")
-                except Exception:
-                    logging.error(f"OllamaProvider error: {e}")
-            else:
-                logging.error(f"OllamaProvider error: {e}")
-            return {"unit": "hours", "value": 8.0, "error": "llm_request_failed"}
+            return response.json().get("response", "")
 
-    async def analyze_plan(self, plan_summary: dict, constraints: dict) -> str:
-        # Stub implementation for compatibility
-        return "Ollama analyze_plan not implemented."
+        # Leaving the stream context closes the connection, which makes
+        # Ollama abort the generation and free the model
+        detector = JsonStreamDetector(request.expect)
+        async with self.client.stream("POST", f"{self.base_url}/api/generate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if detector.feed(chunk.get("response", "")) or chunk.get("done"):
+                    break
+        return detector.answer
 
     def _format_messages(self, messages: List[Dict[str, str]], json_mode: bool) -> str:
         """Format messages for Ollama."""
@@ -6,20 +6,28 @@ Analyze the task description and required skills to provide an effort estimate i
 Task: {task_description}
 Required skills: {skills}
 
-Respond with a JSON object in this format:
-{
-    "unit": "hours",
-    "value": <number>,
-    "confidence": "high|medium|low",
-    "reasoning": "<brief explanation>"
-}
-
 Base your estimate on:
 1. Task complexity and scope
 2. Required skills and their interdependencies
 3. Similar tasks in typical development environments
 
-Provide realistic estimates suitable for sprint planning."""
+Provide realistic estimates suitable for sprint planning.
+Respond ONLY with one line of JSON in this format (no explanation, no markdown):
+{"unit": "hours", "value": <number>, "confidence": "high|medium|low"}"""
+
+BATCH_ESTIMATION_PROMPT = """You are an expert project estimator.
+Estimate the effort in hours for each task below from its description and required skills.
+
+Tasks:
+{tasks}
+
+Respond ONLY with a JSON array holding one object per task, in this format (no explanation, no markdown):
+[
+    {"id": "<task id>", "unit": "hours", "value": <number>, "confidence": "high|medium|low"}
+]"""
+
+# One line of the {tasks} block of BATCH_ESTIMATION_PROMPT
+BATCH_TASK_LINE = "- id: {id} | skills: {skills} | {task_description}"
 
 PLAN_ANALYSIS_PROMPT = """You are a sprint planning expert.
 Review the sprint plan details and provide insights on its feasibility and risks.
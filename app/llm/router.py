@@ -0,0 +1,219 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.config import get_settings
+from app.core.logging import log_event
+from app.llm.base import LLMClient
+from app.llm.estimation import GenerationRequest
+
+settings = get_settings()
+
+# Below this many latency samples the p95 is not trusted and the default hedge delay applies
+MIN_LATENCY_SAMPLES = 20
+
+
+class NoProviderAvailable(RuntimeError):
+    """Raised when every provider's circuit breaker is open."""
+
+
+class ProviderState:
+    """Rolling latency/error statistics and circuit breaker of one provider.
+
+    The breaker opens after ``failure_threshold`` consecutive failures and
+    rejects calls for ``reset_seconds``. Then one probe call is let through
+    (half-open): success closes the breaker, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client: LLMClient,
+        window: int,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float]
+    ):
+        self.name = name
+        self.client = client
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    def available(self) -> bool:
+        """Whether a call may be sent now; claims the probe slot when half-open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return float(np.percentile(self.latencies, 95))
+
+    def error_rate(self) -> float:
+        return 1.0 - sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def record(self, ok: bool, seconds: float) -> None:
+        self.outcomes.append(ok)
+        self.probing = False
+        if ok:
+            # Only answers count towards the p95; fast failures would pull it down
+            self.latencies.append(seconds)
+            self.consecutive_failures = 0
+            self.opened_at = None
+            return
+        self.consecutive_failures += 1
+        if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+            if self.opened_at is None:
+                log_event("llm_circuit_open", {"provider": self.name, "failures": self.consecutive_failures})
+            self.opened_at = self.clock()
+
+    def record_cancelled(self) -> None:
+        # A hedged loser's latency is unknown (only a lower bound), so it is
+        # left out of the window rather than biasing the p95
+        self.probing = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "state": self.state,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+            "samples": len(self.latencies)
+        }
+
+
+class ProviderRouter(LLMClient):
+    """Routes LLM calls over several providers for tail-latency control.
+
+    Calls go to the first provider whose circuit is not open. When it has not
+    answered within its own recent p95 latency, the same call is hedged to the
+    next available provider and the first good answer wins; the other call is
+    cancelled. That stops the generation of streaming providers: Ollama
+    closes the connection, Bedrock closes its stream at the next event. A
+    failed call falls through to the next provider. Estimates are tagged with
+    the provider that answered.
+    """
+
+    def __init__(
+        self,
+        providers: List[Tuple[str, LLMClient]],
+        hedge_default_seconds: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        reset_seconds: Optional[float] = None,
+        window: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if not providers:
+            raise ValueError("ProviderRouter needs at least one provider")
+        self.providers = [
+            ProviderState(
+                name,
+                client,
+                window or settings.LLM_ROUTER_WINDOW,
+                failure_threshold or settings.LLM_BREAKER_FAILURES,
+                reset_seconds if reset_seconds is not None else settings.LLM_BREAKER_RESET_SECONDS,
+                clock
+            )
+            for name, client in providers
+        ]
+        self.hedge_default_seconds = (
+            hedge_default_seconds if hedge_default_seconds is not None else settings.LLM_HEDGE_DEFAULT_SECONDS
+        )
+        self.clock = clock
+
+    async def chat(self, messages, json_mode: bool = False, tools=None) -> str:
+        result, _ = await self._route(lambda client: client.chat(list(messages), json_mode, tools))
+        return result
+
+    async def generate(self, request: GenerationRequest) -> str:
+        result, _ = await self._route(lambda client: client.generate(request))
+        return result
+
+    async def estimate_task(self, task_description: str, required_skills: list) -> Dict[str, Any]:
+        estimate, provider = await self._route(
+            lambda client: client.estimate_task(task_description, required_skills)
+        )
+        return {**estimate, "provider": provider}
+
+    async def estimate_tasks_batch(self, tasks: list) -> Dict[str, Dict[str, Any]]:
+        estimates, provider = await self._route(lambda client: client.estimate_tasks_batch(tasks))
+        return {task_id: {**estimate, "provider": provider} for task_id, estimate in estimates.items()}
+
+    async def analyze_plan(self, plan_summary: Dict[str, Any], constraints: Dict[str, Any]) -> str:
+        result, _ = await self._route(lambda client: client.analyze_plan(plan_summary, constraints))
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider breaker state, p95 latency and error rate."""
+        return {p.name: p.snapshot() for p in self.providers}
+
+    async def _route(self, call: Callable[[LLMClient], Awaitable[Any]]) -> Tuple[Any, str]:
+        """
+        Run a call on the best available provider, hedging and failing over.
+
+        Returns:
+            The first successful result and the name of the provider that produced it
+
+        Raises:
+            NoProviderAvailable: If every circuit is open
+            Exception: The last provider error when every attempted provider failed
+        """
+        candidates = iter(self.providers)
+        running: Dict[asyncio.Task, Tuple[ProviderState, float]] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            for provider in candidates:
+                if provider.available():
+                    running[asyncio.ensure_future(call(provider.client))] = (provider, self.clock())
+                    return True
+            return False
+
+        if not launch():
+            raise NoProviderAvailable("All LLM providers have an open circuit breaker")
+        try:
+            while running:
+                # Hedge after the newest call's p95 when there is a provider left to hedge to
+                newest = list(running.values())[-1][0]
+                timeout = newest.p95() or self.hedge_default_seconds
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if launch():
+                        log_event("llm_hedge", {"after_seconds": round(timeout, 3), "slow": newest.name})
+                        continue
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider, started = running.pop(task)
+                    seconds = self.clock() - started
+                    if task.exception() is None:
+                        provider.record(True, seconds)
+                        return task.result(), provider.name
+                    provider.record(False, seconds)
+                    last_error = task.exception()
+                if not running:
+                    launch()
+            raise last_error
+        finally:
+            for task, (provider, _) in running.items():
+                task.cancel()
+                provider.record_cancelled()
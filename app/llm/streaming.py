@@ -0,0 +1,69 @@
+"""Incremental detection of a complete JSON answer in a token stream."""
+from typing import Optional
+
+
+class JsonStreamDetector:
+    """Tracks streamed text and reports when the expected JSON value is complete.
+
+    Scans each chunk once, following string literals, escapes and nesting
+    depth, so completion is detected in O(streamed characters) without
+    re-parsing. Only a top-level value opened by the expected character
+    ("{" for a single estimate, "[" for a batch) completes the answer; prose
+    and other values around it are ignored.
+    """
+
+    _CLOSERS = {"{": "}", "[": "]"}
+
+    def __init__(self, expect: str = "{"):
+        if expect not in self._CLOSERS:
+            raise ValueError(f"Unsupported JSON opener: {expect}")
+        self.expect = expect
+        self.text = ""
+        self.complete = False
+        self.end: Optional[int] = None  # index just past the completed value
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._tracking = False
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Add streamed text.
+
+        Args:
+            chunk: The next piece of generated text
+
+        Returns:
+            True once the expected value is complete; later chunks are ignored
+        """
+        if self.complete:
+            return True
+        offset = len(self.text)
+        self.text += chunk
+        for pos, char in enumerate(chunk, start=offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Quotes only open strings inside a JSON value, not in surrounding prose
+                self._in_string = self._depth > 0
+            elif char in "{[":
+                if self._depth == 0:
+                    self._tracking = char == self.expect
+                self._depth += 1
+            elif char in "}]" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0 and self._tracking:
+                    self.complete = True
+                    self.end = pos + 1
+                    return True
+        return False
+
+    @property
+    def answer(self) -> str:
+        """Text up to the end of the completed value, or everything streamed so far."""
+        return self.text[:self.end] if self.complete else self.text
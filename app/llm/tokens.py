@@ -0,0 +1,73 @@
+"""Cheap local token counting and text compaction for prompt budgeting."""
+import re
+
+# Words, numbers and single punctuation marks; each is about one BPE token
+_PIECES = re.compile(r"\w+|[^\w\s]")
+# BPE vocabularies split long words into pieces of roughly this many characters
+CHARS_PER_WORD_TOKEN = 4
+_FENCED_CODE = re.compile(r"```.*?```", re.DOTALL)
+_URL = re.compile(r"https?://\S+")
+ELLIPSIS = " [...] "
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text without a tokenizer.
+
+    Counts punctuation marks as one token and words as one token per
+    CHARS_PER_WORD_TOKEN characters. Within ~15% of BPE tokenizers on
+    English prose and code, which is enough for budgeting.
+    """
+    return sum(
+        -(-len(piece) // CHARS_PER_WORD_TOKEN) if piece[0].isalnum() or piece[0] == "_" else 1
+        for piece in _PIECES.findall(text)
+    )
+
+
+def compact_text(text: str, token_budget: int) -> str:
+    """
+    Shrink a task description to a token budget.
+
+    Fenced code blocks and URLs are dropped, whitespace is collapsed and
+    repeated lines are removed. If the text is still over budget, its head and
+    tail are kept (two thirds / one third), since descriptions usually state
+    the goal first and acceptance criteria last.
+
+    Args:
+        text: The description
+        token_budget: Maximum tokens of the result
+
+    Returns:
+        The compacted text
+    """
+    if count_tokens(text) <= token_budget:
+        return " ".join(text.split())
+
+    text = _URL.sub("<url>", _FENCED_CODE.sub("<code>", text))
+    seen = set()
+    lines = []
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if line and line.lower() not in seen:
+            seen.add(line.lower())
+            lines.append(line)
+    text = " ".join(lines)
+    if count_tokens(text) <= token_budget:
+        return text
+
+    words = text.split(" ")
+    head_budget = (token_budget - count_tokens(ELLIPSIS)) * 2 // 3
+    tail_budget = token_budget - count_tokens(ELLIPSIS) - head_budget
+    head, used = [], 0
+    for word in words:
+        used += count_tokens(word)
+        if used > head_budget:
+            break
+        head.append(word)
+    tail, used = [], 0
+    for word in reversed(words[len(head):]):
+        used += count_tokens(word)
+        if used > tail_budget:
+            break
+        tail.append(word)
+    return " ".join(head) + ELLIPSIS + " ".join(reversed(tail))
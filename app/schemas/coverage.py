@@ -0,0 +1,24 @@
+from typing import List
+from pydantic import BaseModel, Field
+from app.domain.models import Team, Employee, Task
+from app.domain.enums import CoverageStatus
+
+class CoverageRequest(BaseModel):
+    teams: List[Team]
+    employees: List[Employee]
+    tasks: List[Task]
+    min_skill_level_match: int = Field(default=0, ge=0, le=2)
+
+class TeamCoverageSummary(BaseModel):
+    team_id: str
+    covered: int = Field(ge=0)
+    partial: int = Field(ge=0)
+    uncovered: int = Field(ge=0)
+
+class CoverageResponse(BaseModel):
+    team_ids: List[str]
+    task_ids: List[str]
+    coverage_ratio: List[List[float]]  # teams x tasks, share of required skills met
+    status: List[List[CoverageStatus]]  # teams x tasks
+    teams: List[TeamCoverageSummary]
+    uncovered_task_ids: List[str] = Field(default_factory=list)  # no team fully covers them
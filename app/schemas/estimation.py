@@ -0,0 +1,40 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field, computed_field
+from app.domain.models import Task
+from app.domain.enums import JobStatus
+
+class PreEstimateRequest(BaseModel):
+    tasks: List[Task]
+
+class PreEstimateJob(BaseModel):
+    job_id: str
+    status: JobStatus
+    total: int = Field(ge=0)
+    skipped: int = Field(default=0, ge=0)  # already carry an estimate or the local model answers them
+    cached: int = Field(default=0, ge=0)  # cache hits, nothing to do
+    estimated: int = Field(default=0, ge=0)
+    failed: int = Field(default=0, ge=0)  # fell back to the default estimate, not cached
+    error: Optional[str] = None
+
+    @computed_field
+    @property
+    def done(self) -> int:
+        return self.skipped + self.cached + self.estimated + self.failed
+
+class EstimateHistoryItem(BaseModel):
+    """A completed task: what it was, what was estimated and what it took."""
+    description: str
+    skills: List[str] = Field(default_factory=list)
+    estimate: Optional[float] = Field(default=None, gt=0)  # hours estimated at the time, e.g. by the LLM
+    actual_hours: float = Field(gt=0)
+
+class EstimateHistoryRequest(BaseModel):
+    items: List[EstimateHistoryItem] = Field(min_length=1)
+
+class EstimateModelStats(BaseModel):
+    samples: int = Field(ge=0)
+    features: int = Field(ge=0)
+    residual_log_std: Optional[float] = None  # residual spread in log1p(hours)
+    calibrated: bool  # LLM estimates are corrected against actuals
+    calibration_intercept: Optional[float] = None
+    calibration_slope: Optional[float] = None
@@ -0,0 +1,27 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from app.domain.enums import ViolationKind
+from app.schemas.planning_input import PlanRequest
+from app.schemas.planning_output import PlanSummary, Utilization
+
+class ProposedAssignment(BaseModel):
+    task_id: str
+    employee_ids: List[str] = Field(default_factory=list)
+
+class EvaluatePlanRequest(PlanRequest):
+    assignments: List[ProposedAssignment]
+
+class PlanViolation(BaseModel):
+    kind: ViolationKind
+    message: str
+    task_id: Optional[str] = None
+    employee_id: Optional[str] = None
+
+class PlanEvaluation(BaseModel):
+    feasible: bool
+    violations: List[PlanViolation] = Field(default_factory=list)
+    utilization: List[Utilization]
+    summary: PlanSummary
+    objective: float
+    optimal_objective: Optional[float] = None  # known when the same input was planned recently
+    objective_gap: Optional[float] = None  # share of the optimal objective the proposal gives up
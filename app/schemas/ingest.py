@@ -0,0 +1,26 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from app.domain.models import Sprint, Team
+from app.schemas.planning_input import Constraints
+from app.schemas.planning_output import PlanResponse
+
+class PlanUploadMeta(BaseModel):
+    sprint: Sprint
+    teams: List[Team]
+    constraints: Optional[Constraints] = None
+    completed_task_ids: List[str] = Field(default_factory=list)
+
+class RowError(BaseModel):
+    source: str  # "tasks" or "employees"
+    line: int = Field(ge=1)
+    error: str
+
+class IngestReport(BaseModel):
+    rows_read: int = Field(ge=0)
+    tasks_accepted: int = Field(ge=0)
+    employees_accepted: int = Field(ge=0)
+    errors: List[RowError] = Field(default_factory=list)  # capped at INGEST_MAX_ROW_ERRORS
+    errors_total: int = Field(default=0, ge=0)
+
+class UploadPlanResponse(PlanResponse):
+    ingest: IngestReport
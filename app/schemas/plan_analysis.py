@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+from app.domain.enums import JobStatus
+
+class PlanAnalysis(BaseModel):
+    analysis_id: str  # hash of the analyzed plan and constraints; identical plans share an analysis
+    status: JobStatus
+    analysis: Optional[str] = None  # the LLM's insights once completed
+    error: Optional[str] = None
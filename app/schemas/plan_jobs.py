@@ -0,0 +1,13 @@
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+from app.domain.enums import JobStatus, PlanJobKind
+
+class PlanJob(BaseModel):
+    job_id: str
+    kind: PlanJobKind
+    status: JobStatus
+    attempts: int = Field(ge=0)  # leases taken so far, including ones lost to crashed workers
+    result: Optional[Dict[str, Any]] = None  # PlanResponse or HorizonPlanResponse once completed
+    error: Optional[str] = None
+    created_at: float  # Unix time
+    updated_at: float
@@ -14,7 +14,9 @@ class Constraints(BaseModel):
     match_policy: MatchPolicy = MatchPolicy.THRESHOLD
     min_skill_level_match: int = Field(default=0, ge=0, le=2)
     objective: Objective = Objective.MAXIMIZE_PRIORITY
+    balance_tolerance: float = Field(default=0.0, ge=0, le=1)  # priority share BALANCE_UTILIZATION may give up
     fallback_estimation: Optional[FallbackEstimation] = None
+    time_limit_seconds: Optional[float] = Field(default=None, gt=0)
 
 class PlanRequest(BaseModel):
     sprint: Sprint
@@ -22,3 +24,17 @@ class PlanRequest(BaseModel):
     employees: List[Employee]
     tasks: List[Task]
     constraints: Optional[Constraints] = None
+    completed_task_ids: List[str] = Field(default_factory=list)  # done before; satisfy dependencies
+
+class HorizonSprint(BaseModel):
+    sprint: Sprint
+    capacities: Dict[str, float] = Field(default_factory=dict)  # employee id -> available this sprint
+
+class HorizonPlanRequest(BaseModel):
+    sprints: List[HorizonSprint] = Field(min_length=1)  # consecutive sprints, in order
+    teams: List[Team]
+    employees: List[Employee]
+    tasks: List[Task]
+    constraints: Optional[Constraints] = None
+    completed_task_ids: List[str] = Field(default_factory=list)  # done before; satisfy dependencies
+    lookahead_sprints: Optional[int] = Field(default=None, ge=0)  # defaults to HORIZON_LOOKAHEAD_SPRINTS
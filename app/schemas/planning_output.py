@@ -1,6 +1,6 @@
 from typing import List, Optional
 from pydantic import BaseModel, Field
-from app.domain.enums import Unit
+from app.domain.enums import Unit, UnassignedReason
 
 class EmployeeAssignment(BaseModel):
     employee_id: str
@@ -16,13 +16,14 @@ class TaskAssignment(BaseModel):
 class UnassignedTask(BaseModel):
     task_id: str
     reasons: List[str]
+    category: Optional[UnassignedReason] = None
     blocking_dependencies: List[str] = Field(default_factory=list)
 
 class Utilization(BaseModel):
     employee_id: str
     unit: Unit
     planned: float = Field(ge=0)
-    capacity: float = Field(gt=0)
+    capacity: float = Field(ge=0)
     utilization_pct: float = Field(ge=0, le=100)
 
 class PlanSummary(BaseModel):
@@ -37,4 +38,14 @@ class PlanResponse(BaseModel):
     unassigned: List[UnassignedTask]
     utilization: List[Utilization]
     summary: PlanSummary
+    conflicts: List[str] = Field(default_factory=list)  # minimal set of conflicting must-have constraints
+    objective: Optional[float] = None  # optimizer objective: priority per assignee, scaled by skill fit under WEIGHTED
+    optimality_gap: Optional[float] = None  # proven relative gap to the optimum; set by the Lagrangian solver backend
+    analysis_id: Optional[str] = None  # background LLM analysis of this plan, see /plan/analysis/{analysis_id}
+    notes: Optional[str] = None
+
+class HorizonPlanResponse(BaseModel):
+    sprints: List[PlanResponse]  # one plan per sprint; their unassigned tasks are carried forward
+    unassigned: List[UnassignedTask]  # tasks left unplanned after the last sprint
+    summary: PlanSummary
     notes: Optional[str] = None
@@ -0,0 +1,201 @@
+import asyncio
+import math
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple, Union
+from app.core.config import get_settings
+from app.core.logging import log_event
+from app.schemas.planning_input import HorizonPlanRequest, PlanRequest
+
+settings = get_settings()
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed before it starts."""
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class _Lane:
+    """A bounded-concurrency queue that serves clients round-robin."""
+
+    def __init__(self, name: str, concurrency: int, max_wait: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_wait = max_wait
+        self.running = 0
+        self.running_cost = 0.0
+        self.queued_cost = 0.0
+        self.waiting: "OrderedDict[str, Deque[Tuple[asyncio.Future, float]]]" = OrderedDict()
+        self.per_client: Dict[str, int] = {}
+
+    def predicted_wait(self) -> float:
+        """Seconds a new request would wait, from the predicted cost ahead of it."""
+        if self.running < self.concurrency and not self.waiting:
+            return 0.0
+        return (self.running_cost + self.queued_cost) / self.concurrency
+
+    async def acquire(self, client_id: str, cost: float) -> None:
+        self.per_client[client_id] = self.per_client.get(client_id, 0) + 1
+        if self.running < self.concurrency and not self.waiting:
+            self._start(cost)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.waiting.setdefault(client_id, deque()).append((future, cost))
+        self.queued_cost += cost
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.done() or future.cancelled():
+                self._forget(client_id, future, cost)
+            else:
+                # Slot was handed over just as the caller went away
+                self.release(client_id, cost)
+            raise
+
+    def release(self, client_id: str, cost: float) -> None:
+        self.running -= 1
+        self.running_cost -= cost
+        self._leave(client_id)
+        self._dispatch()
+
+    def _start(self, cost: float) -> None:
+        self.running += 1
+        self.running_cost += cost
+
+    def _dispatch(self) -> None:
+        # Next client in turn gets the slot, then goes to the back of the line
+        while self.running < self.concurrency and self.waiting:
+            client_id, queue = next(iter(self.waiting.items()))
+            future, cost = queue.popleft()
+            if queue:
+                self.waiting.move_to_end(client_id)
+            else:
+                del self.waiting[client_id]
+            self.queued_cost -= cost
+            self._start(cost)
+            future.set_result(None)
+
+    def _forget(self, client_id: str, future: asyncio.Future, cost: float) -> None:
+        queue = self.waiting.get(client_id)
+        if queue is not None:
+            self.waiting[client_id] = deque(item for item in queue if item[0] is not future)
+            if not self.waiting[client_id]:
+                del self.waiting[client_id]
+            self.queued_cost -= cost
+        self._leave(client_id)
+
+    def _leave(self, client_id: str) -> None:
+        self.per_client[client_id] -= 1
+        if not self.per_client[client_id]:
+            del self.per_client[client_id]
+
+
+class AdmissionController:
+    """Cost-aware admission control in front of SprintPlanner.create_plan.
+
+    Each request's cost is predicted from its size. Cheap and expensive
+    requests wait in separate lanes with their own concurrency, so small
+    interactive plans never queue behind a large one. A request is rejected
+    up front when its lane's predicted wait exceeds the lane deadline (503)
+    or its client already holds its share of the lane (429).
+    """
+
+    def __init__(
+        self,
+        cheap_concurrency: Optional[int] = None,
+        expensive_concurrency: Optional[int] = None,
+        cheap_max_wait: Optional[float] = None,
+        expensive_max_wait: Optional[float] = None,
+        max_per_client: Optional[int] = None
+    ):
+        self.cheap = _Lane(
+            "cheap",
+            cheap_concurrency or settings.ADMISSION_CHEAP_CONCURRENCY,
+            cheap_max_wait if cheap_max_wait is not None else settings.ADMISSION_CHEAP_MAX_WAIT
+        )
+        self.expensive = _Lane(
+            "expensive",
+            expensive_concurrency or settings.ADMISSION_EXPENSIVE_CONCURRENCY,
+            expensive_max_wait if expensive_max_wait is not None else settings.ADMISSION_EXPENSIVE_MAX_WAIT
+        )
+        self.max_per_client = max_per_client or settings.ADMISSION_MAX_PER_CLIENT
+
+    def predict_cost(self, request: Union[PlanRequest, HorizonPlanRequest]) -> float:
+        """Predicted seconds to plan the request, from its size."""
+        # A horizon plan solves one model per sprint
+        sprints = len(request.sprints) if isinstance(request, HorizonPlanRequest) else 1
+        pairs = len(request.employees) * len(request.tasks) * sprints
+        unestimated = sum(1 for t in request.tasks if t.estimate is None)
+        dependencies = sum(len(t.dependencies) for t in request.tasks)
+        return (
+            settings.ADMISSION_BASE_SECONDS
+            + pairs * settings.ADMISSION_SECONDS_PER_PAIR
+            + unestimated * settings.ADMISSION_SECONDS_PER_ESTIMATE
+            + dependencies * settings.ADMISSION_SECONDS_PER_DEPENDENCY
+        )
+
+    def lane_for(self, cost: float) -> _Lane:
+        return self.cheap if cost < settings.ADMISSION_CHEAP_COST_SECONDS else self.expensive
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        request: Union[PlanRequest, HorizonPlanRequest],
+        client_id: str,
+        label: Optional[str] = None
+    ) -> AsyncIterator[float]:
+        """
+        Hold a lane slot for the duration of the block.
+
+        Args:
+            request: The plan request, used to predict its cost
+            client_id: Authenticated caller identity used for per-client fairness
+            label: Caller-supplied name, only logged
+
+        Yields:
+            The predicted cost in seconds
+
+        Raises:
+            AdmissionRejected: If the request is shed instead of queued
+        """
+        cost = self.predict_cost(request)
+        lane = self.lane_for(cost)
+        if lane.per_client.get(client_id, 0) >= self.max_per_client:
+            self._reject(lane, client_id, label, cost, 429, "Too many concurrent plans for this client")
+        wait = lane.predicted_wait()
+        if wait > lane.max_wait:
+            self._reject(lane, client_id, label, cost, 503, "Planner is at capacity")
+
+        await lane.acquire(client_id, cost)
+        try:
+            yield cost
+        finally:
+            lane.release(client_id, cost)
+
+    def _reject(
+        self,
+        lane: _Lane,
+        client_id: str,
+        label: Optional[str],
+        cost: float,
+        status_code: int,
+        reason: str
+    ) -> None:
+        retry_after = max(1, math.ceil(lane.predicted_wait() + cost))
+        log_event("admission_rejected", {
+            "lane": lane.name,
+            "client_id": client_id,
+            "client_label": label,
+            "predicted_cost": round(cost, 3),
+            "status_code": status_code,
+            "retry_after": retry_after
+        })
+        raise AdmissionRejected(status_code, retry_after, reason)
+
+
+admission_controller = AdmissionController()
@@ -0,0 +1,77 @@
+from typing import List
+import numpy as np
+from app.domain.models import Capacity, Employee, Sprint
+from app.core.logging import log_event
+from app.utils.time_utils import business_calendar, count_business_days
+
+
+class CapacityCalendar:
+    """Derive employee capacity in hours from the sprint calendar.
+
+    Available hours are business days in the sprint (Mon-Fri minus holidays),
+    minus PTO business days, times work_hours_per_day and the employee's
+    allocation. The business-day calendar is cached per
+    (sprint dates, timezone, holiday set).
+    """
+
+    def fill_capacities(self, sprint: Sprint, employees: List[Employee]) -> List[Employee]:
+        """Return employees with every missing capacity.available computed."""
+        missing = [i for i, e in enumerate(employees) if e.capacity.available is None]
+        if not missing:
+            return employees
+        hours = self.available_hours(sprint, [employees[i] for i in missing])
+        filled = list(employees)
+        for i, value in zip(missing, hours.tolist()):
+            e = employees[i]
+            filled[i] = e.model_copy(update={
+                "capacity": Capacity(unit=e.capacity.unit, available=value, notes=e.capacity.notes)
+            })
+        log_event("capacity_calendar", {"sprint_id": sprint.id, "employees_filled": len(missing)})
+        return filled
+
+    def available_hours(self, sprint: Sprint, employees: List[Employee]) -> np.ndarray:
+        """
+        Compute available hours for many employees in one vectorized pass.
+
+        Args:
+            sprint: Sprint with dates, holidays and work hours per day
+            employees: Employees whose PTO and allocation are applied
+
+        Returns:
+            Array of available hours, in employee order
+        """
+        calendar, sprint_days = business_calendar(
+            sprint.start_date,
+            sprint.end_date,
+            sprint.timezone,
+            tuple(sorted(set(sprint.holidays)))
+        )
+
+        # Clip PTO to the sprint and merge overlapping ranges per employee,
+        # so every PTO day is counted once
+        owners, starts, ends = [], [], []
+        for i, e in enumerate(employees):
+            ranges = sorted(
+                (max(r.start, sprint.start_date), min(r.end, sprint.end_date))
+                for r in e.pto
+                if r.end >= sprint.start_date and r.start <= sprint.end_date
+            )
+            merged = []
+            for start, end in ranges:
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            for start, end in merged:
+                owners.append(i)
+                starts.append(start)
+                ends.append(end)
+
+        pto_days = np.zeros(len(employees))
+        if owners:
+            counts = count_business_days(starts, ends, calendar)
+            pto_days = np.bincount(owners, weights=counts, minlength=len(employees))
+
+        allocation = np.array([e.allocation_pct for e in employees], dtype=float) / 100
+        days = np.maximum(sprint_days - pto_days, 0)
+        return days * sprint.work_hours_per_day * allocation
@@ -0,0 +1,87 @@
+from typing import List
+import numpy as np
+from app.domain.enums import CoverageStatus
+from app.domain.models import Employee, Team
+from app.schemas.coverage import CoverageRequest, CoverageResponse, TeamCoverageSummary
+from app.utils.skills import SkillIndex
+
+STATUS_BY_CODE = [CoverageStatus.UNCOVERED, CoverageStatus.PARTIAL, CoverageStatus.COVERED]
+
+
+class CoverageAnalyzer:
+    """Team x task skill coverage for a whole organisation in one pass.
+
+    Team skill levels are the per-skill maximum over members. A requirement is
+    met when the team's level reaches min_level - min_skill_level_match.
+    """
+
+    def analyze(self, request: CoverageRequest) -> CoverageResponse:
+        """Compute coverage ratio and status for every team and task."""
+        teams, tasks = request.teams, request.tasks
+        skills = SkillIndex()
+        team_levels = self._team_levels(teams, request.employees, skills)
+
+        req_task, req_skill, req_level = [], [], []
+        for j, t in enumerate(tasks):
+            for r in t.required_skills:
+                req_task.append(j)
+                req_skill.append(skills.id(r.name))
+                req_level.append(r.min_level)
+        req_task = np.array(req_task, dtype=int)
+        req_skill = np.array(req_skill, dtype=int)
+        threshold = np.array(req_level, dtype=int) - request.min_skill_level_match
+
+        # Skills only tasks mention have level 0 for every team
+        if team_levels.shape[1] < len(skills):
+            team_levels = np.pad(team_levels, ((0, 0), (0, len(skills) - team_levels.shape[1])))
+
+        # met[k, r] = team k meets requirement r
+        held = team_levels[:, req_skill]
+        met = (held > 0) & (held >= threshold)
+
+        # Per-task share of requirements met; requirement rows are contiguous per task
+        counts = np.bincount(req_task, minlength=len(tasks))
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        has_reqs = np.flatnonzero(counts > 0)
+        met_counts = np.zeros((len(teams), len(tasks)))
+        if len(has_reqs) and len(teams):
+            met_counts[:, has_reqs] = np.add.reduceat(met.astype(float), starts[has_reqs], axis=1)
+        ratio = np.divide(met_counts, counts, out=np.zeros_like(met_counts), where=counts > 0)
+
+        codes = np.where(ratio >= 1, 2, np.where(ratio > 0, 1, 0))
+        codes[:, counts == 0] = 2
+        per_team = np.stack([(codes == c).sum(axis=1) for c in range(3)], axis=1)
+        fully_covered = (codes == 2).any(axis=0) if len(teams) else np.zeros(len(tasks), dtype=bool)
+
+        return CoverageResponse(
+            team_ids=[t.id for t in teams],
+            task_ids=[t.id for t in tasks],
+            coverage_ratio=np.round(ratio, 4).tolist(),
+            status=[[STATUS_BY_CODE[c] for c in row] for row in codes.tolist()],
+            teams=[
+                TeamCoverageSummary(
+                    team_id=team.id,
+                    covered=int(per_team[k, 2]),
+                    partial=int(per_team[k, 1]),
+                    uncovered=int(per_team[k, 0])
+                )
+                for k, team in enumerate(teams)
+            ],
+            uncovered_task_ids=[t.id for j, t in enumerate(tasks) if not fully_covered[j]]
+        )
+
+    def _team_levels(self, teams: List[Team], employees: List[Employee], skills: SkillIndex) -> np.ndarray:
+        """Max skill level per (team, skill), from the members' skills."""
+        team_index = {t.id: k for k, t in enumerate(teams)}
+        rows, cols, levels = [], [], []
+        for e in employees:
+            k = team_index.get(e.team_id)
+            if k is None:
+                continue
+            for s in e.skills:
+                rows.append(k)
+                cols.append(skills.id(s.name))
+                levels.append(s.level)
+        team_levels = np.zeros((len(teams), len(skills)), dtype=int)
+        np.maximum.at(team_levels, (np.array(rows, dtype=int), np.array(cols, dtype=int)), np.array(levels, dtype=int))
+        return team_levels
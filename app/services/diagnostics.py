@@ -0,0 +1,133 @@
+from typing import Callable, Iterable, List, Set
+import numpy as np
+from app.domain.enums import UnassignedReason
+from app.schemas.planning_output import UnassignedTask
+from app.services.planning_data import PlanningData
+
+
+class PlanDiagnostics:
+    """Explain why tasks were left unassigned and which constraints conflict.
+
+    Classification works purely on the precomputed masks of ``PlanningData``
+    and the slack left by the solution, so it never triggers extra solves.
+    """
+
+    def classify_unassigned(
+        self,
+        data: PlanningData,
+        assigned: np.ndarray,
+        conflicts: Iterable[int] = ()
+    ) -> List[UnassignedTask]:
+        """Classify every unassigned task.
+
+        Args:
+            data: Precomputed planning arrays
+            assigned: Boolean matrix (employees x tasks) of the chosen assignments
+            conflicts: Task indices whose must-have constraint was part of a conflict
+
+        Returns:
+            One UnassignedTask per task without assignees, in input order
+        """
+        conflicts = set(conflicts)
+        task_assigned = assigned.any(axis=0)
+        if task_assigned.all():
+            return []
+
+        # Remaining capacity and parallel slots per employee after the solution
+        used_hours = assigned.astype(float) @ data.estimates
+        slack = data.capacities - used_hours
+        open_slots = assigned.sum(axis=1) < data.constraints.max_parallel_tasks_per_person
+
+        # Per requirement row: does anyone hold it / fit it / have room for it?
+        req_estimates = data.estimates[data.req_task]
+        fits = data.qualified & (data.capacities[:, None] >= req_estimates[None, :])
+        free = fits & (slack[:, None] >= req_estimates[None, :]) & open_slots[:, None]
+        has_holder = data.qualified.any(axis=0)
+        has_fit = fits.any(axis=0)
+        has_free = free.any(axis=0)
+
+        skill_names = {v: k for k, v in data.skill_ids.items()}
+        unassigned = []
+        for j in np.flatnonzero(~task_assigned):
+            t = data.tasks[j]
+            rows = data.requirements_of(j)
+            blocked = [
+                d for d in t.dependencies
+                if d in data.task_index and not task_assigned[data.task_index[d]]
+            ]
+
+            if not has_holder[rows].all():
+                category = UnassignedReason.NO_SKILL_HOLDER
+                reasons = [
+                    f"No employee has {skill_names[data.req_skill[r]]} at level "
+                    f"{max(data.req_level[r] - data.constraints.min_skill_level_match, 1)} or above"
+                    for r in rows if not has_holder[r]
+                ]
+            elif not has_fit[rows].all():
+                category = UnassignedReason.TOO_LARGE
+                reasons = [
+                    f"Estimate of {data.estimates[j]:g} exceeds the capacity of every employee "
+                    f"with {skill_names[data.req_skill[r]]}"
+                    for r in rows if not has_fit[r]
+                ]
+            elif j in conflicts:
+                category = UnassignedReason.MUST_HAVE_CONFLICT
+                reasons = ["Must-have task conflicts with other must-have tasks; see plan conflicts"]
+            elif blocked:
+                category = UnassignedReason.BLOCKED_DEPENDENCY
+                reasons = [f"Blocked by unassigned dependencies: {', '.join(blocked)}"]
+            elif data.pruned[j]:
+                category = UnassignedReason.TOO_LARGE
+                reasons = ["Together with its prerequisites it needs more capacity than the team has"]
+            else:
+                category = UnassignedReason.SATURATED
+                saturated = [r for r in rows if not has_free[r]]
+                reasons = [
+                    f"Employees with {skill_names[data.req_skill[r]]} are saturated by higher-priority work"
+                    for r in saturated
+                ] or ["Remaining eligible capacity is allocated to higher-priority tasks"]
+
+            unassigned.append(UnassignedTask(
+                task_id=t.id,
+                reasons=reasons,
+                category=category,
+                blocking_dependencies=blocked if blocked else t.dependencies
+            ))
+        return unassigned
+
+    def trivially_infeasible(self, data: PlanningData, candidates: Iterable[int]) -> List[int]:
+        """Must-have tasks that cannot be placed even on an empty plan."""
+        return [j for j in candidates if data.pruned[j]]
+
+    def find_minimal_conflict(
+        self,
+        data: PlanningData,
+        candidates: Iterable[int],
+        is_feasible: Callable[[Set[int]], bool]
+    ) -> List[int]:
+        """Find a minimal set of must-have tasks that cannot all be satisfied.
+
+        Uses a deletion filter: each candidate is tentatively dropped and stays
+        dropped if the remaining set is still infeasible. Tasks that are
+        infeasible on their own are detected from the masks without solving.
+
+        Args:
+            data: Precomputed planning arrays
+            candidates: Task indices whose must-have constraint is enforced
+            is_feasible: Callback solving a feasibility model for a subset
+
+        Returns:
+            Task indices forming an irreducible conflicting subset
+        """
+        candidates = list(candidates)
+        single = self.trivially_infeasible(data, candidates)
+        if single:
+            return single[:1]
+
+        # Try to drop low-priority tasks first; what remains tends to be the core conflict
+        conflict = sorted(candidates, key=lambda j: (data.priorities[j], j))
+        for j in list(conflict):
+            trial = set(conflict) - {j}
+            if not is_feasible(trial):
+                conflict.remove(j)
+        return sorted(conflict)
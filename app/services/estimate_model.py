@@ -0,0 +1,210 @@
+import json
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set
+import numpy as np
+from app.core.config import get_settings
+from app.core.logging import log_event
+from app.domain.models import Task
+from app.schemas.estimation import EstimateHistoryItem, EstimateModelStats
+from app.utils.time_utils import normalize_skill_name
+
+settings = get_settings()
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _grams(description: str) -> List[int]:
+    """Stable hashes of the lower-cased words and word bigrams of a description."""
+    tokens = _TOKEN.findall(description.lower())
+    return [zlib.crc32(gram.encode()) for gram in tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]]
+
+
+@dataclass
+class _Fit:
+    """Coefficients of one fit; replaced as a whole so readers never see a partial fit."""
+    skills: Dict[str, int]
+    vocabulary: Set[int]  # hashes of the words and bigrams seen in the history
+    weights: np.ndarray
+    inverse_gram: np.ndarray  # (X'X + ridge*I)^-1, for the leverage of a prediction
+    residual_std: float  # in log1p(hours)
+    samples: int
+    calibration: Optional[np.ndarray]  # (intercept, slope) in log1p(hours), or None
+
+
+class EstimateModel:
+    """Local regression of actual hours on task text and skills, fitted on completed tasks.
+
+    Features are hashed unigrams and bigrams of the description (signed
+    hashing into ESTIMATE_MODEL_FEATURES buckets), one-hots of the normalized
+    required skills and the log description length. A ridge regression of
+    log1p(actual hours) is solved with NumPy least squares, so fitting and
+    predicting need no network and take milliseconds.
+
+    Every prediction carries a standard error from the residual spread and
+    its leverage. Only predictions with a small error for descriptions whose
+    words and bigrams mostly occur in the history are used; unfamiliar tasks
+    are left to the LLM. History items that also record the estimate made at
+    the time calibrate LLM estimates with a linear fit of log actuals on log
+    estimates.
+    """
+
+    def __init__(self):
+        self._fit: Optional[_Fit] = None
+        self._lock = threading.Lock()
+
+    def fit(self, history: Sequence[EstimateHistoryItem]) -> EstimateModelStats:
+        """
+        Fit the model and the LLM calibration on completed tasks.
+
+        Args:
+            history: Completed tasks with their actual hours
+
+        Returns:
+            Fit statistics
+
+        Raises:
+            ValueError: With fewer than ESTIMATE_MODEL_MIN_SAMPLES items
+        """
+        if len(history) < settings.ESTIMATE_MODEL_MIN_SAMPLES:
+            raise ValueError(
+                f"At least {settings.ESTIMATE_MODEL_MIN_SAMPLES} completed tasks are needed, got {len(history)}"
+            )
+        skills: Dict[str, int] = {}
+        for item in history:
+            for name in item.skills:
+                skills.setdefault(normalize_skill_name(name), len(skills))
+        X = self._features([(item.description, item.skills) for item in history], skills)
+        y = np.log1p([item.actual_hours for item in history])
+
+        ridge = np.sqrt(settings.ESTIMATE_MODEL_RIDGE) * np.eye(X.shape[1])
+        weights = np.linalg.lstsq(np.vstack([X, ridge]), np.concatenate([y, np.zeros(X.shape[1])]), rcond=None)[0]
+        inverse_gram = np.linalg.pinv(X.T @ X + settings.ESTIMATE_MODEL_RIDGE * np.eye(X.shape[1]))
+        # Effective degrees of freedom of a ridge fit: trace of the hat matrix
+        dof = float(np.einsum("ij,jk,ik->", X, inverse_gram, X))
+        residuals = y - X @ weights
+        residual_std = float(np.sqrt(residuals @ residuals / max(len(y) - dof, 1.0)))
+
+        fit = _Fit(
+            skills=skills,
+            vocabulary={h for item in history for h in _grams(item.description)},
+            weights=weights,
+            inverse_gram=inverse_gram,
+            residual_std=residual_std,
+            samples=len(history),
+            calibration=self._fit_calibration(history)
+        )
+        with self._lock:
+            self._fit = fit
+        stats = self.stats()
+        log_event("estimate_model_fitted", stats.model_dump())
+        return stats
+
+    def stats(self) -> EstimateModelStats:
+        fit = self._fit
+        if fit is None:
+            return EstimateModelStats(samples=0, features=0, residual_log_std=None, calibrated=False)
+        return EstimateModelStats(
+            samples=fit.samples,
+            features=len(fit.weights),
+            residual_log_std=round(fit.residual_std, 4),
+            calibrated=fit.calibration is not None,
+            calibration_intercept=None if fit.calibration is None else round(float(fit.calibration[0]), 4),
+            calibration_slope=None if fit.calibration is None else round(float(fit.calibration[1]), 4)
+        )
+
+    def predict(self, tasks: Sequence[Task]) -> Dict[str, Dict]:
+        """
+        Estimates of the tasks the model is confident about.
+
+        Args:
+            tasks: Tasks to estimate
+
+        Returns:
+            Estimates keyed by task id, only for predictions whose standard
+            error (in log1p hours) is at most ESTIMATE_MODEL_MAX_LOG_STD and
+            whose description shares at least ESTIMATE_MODEL_MIN_OVERLAP of
+            its words and bigrams with the history
+        """
+        fit = self._fit
+        if fit is None or not tasks:
+            return {}
+        X = self._features([(t.description, [s.name for s in t.required_skills]) for t in tasks], fit.skills)
+        mean = X @ fit.weights
+        leverage = np.einsum("ij,jk,ik->i", X, fit.inverse_gram, X)
+        std = fit.residual_std * np.sqrt(1.0 + leverage)
+        limit = settings.ESTIMATE_MODEL_MAX_LOG_STD
+        overlap = np.array([
+            sum(h in fit.vocabulary for h in grams) / len(grams) if grams else 0.0
+            for grams in (_grams(t.description) for t in tasks)
+        ])
+        return {
+            t.id: {
+                "unit": "hours",
+                "value": round(max(float(np.expm1(mean[k])), 0.5), 1),
+                "confidence": "high" if std[k] <= limit / 2 else "medium",
+                "provider": "local"
+            }
+            for k, t in enumerate(tasks)
+            if std[k] <= limit and overlap[k] >= settings.ESTIMATE_MODEL_MIN_OVERLAP
+        }
+
+    def calibrate(self, estimate: Dict) -> Dict:
+        """An LLM estimate in hours corrected by the calibration fit; other estimates unchanged."""
+        fit = self._fit
+        if fit is None or fit.calibration is None or estimate.get("unit") != "hours":
+            return estimate
+        intercept, slope = fit.calibration
+        value = float(np.expm1(intercept + slope * np.log1p(float(estimate["value"]))))
+        return {**estimate, "value": round(max(value, 0.5), 1)}
+
+    @staticmethod
+    def _fit_calibration(history: Sequence[EstimateHistoryItem]) -> Optional[np.ndarray]:
+        """Least-squares line of log1p(actual) on log1p(estimate), if the history supports one."""
+        pairs = np.array([(item.estimate, item.actual_hours) for item in history if item.estimate], dtype=float)
+        if len(pairs) < settings.ESTIMATE_MODEL_MIN_SAMPLES:
+            return None
+        x, y = np.log1p(pairs[:, 0]), np.log1p(pairs[:, 1])
+        if np.ptp(x) == 0:
+            return None
+        coefficients = np.linalg.lstsq(np.column_stack([np.ones_like(x), x]), y, rcond=None)[0]
+        # A non-positive slope would invert the LLM's ranking; keep its estimates as they are
+        return coefficients if coefficients[1] > 0 else None
+
+    @staticmethod
+    def _features(items: Sequence[tuple], skills: Dict[str, int]) -> np.ndarray:
+        """Rows of [hashed text | skill one-hots | log length | bias]; unknown skills are dropped."""
+        buckets = settings.ESTIMATE_MODEL_FEATURES
+        X = np.zeros((len(items), buckets + len(skills) + 2))
+        for row, (description, skill_names) in enumerate(items):
+            grams = _grams(description)
+            for h in grams:
+                X[row, h % buckets] += 1.0 if h & 0x80000000 else -1.0
+            norm = np.linalg.norm(X[row, :buckets])
+            if norm > 0:
+                X[row, :buckets] /= norm
+            for name in skill_names:
+                column = skills.get(normalize_skill_name(name))
+                if column is not None:
+                    X[row, buckets + column] = 1.0
+            X[row, -2] = np.log1p(len(grams))
+            X[row, -1] = 1.0
+        return X
+
+
+def load_history(path: str) -> List[EstimateHistoryItem]:
+    """Read completed tasks from a JSON array or NDJSON file."""
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        records = json.loads(text)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [EstimateHistoryItem.model_validate(record) for record in records]
+
+
+estimate_model = EstimateModel()
+if settings.ESTIMATE_HISTORY_PATH:
+    estimate_model.fit(load_history(settings.ESTIMATE_HISTORY_PATH))
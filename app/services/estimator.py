@@ -1,33 +1,88 @@
 
-from typing import List
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List
 from app.domain.models import Task
 from app.llm.base import LLMClient
+from app.llm.estimation import chunk_by_budget
 from app.llm.ollama_provider import OllamaProvider
 from app.llm.bedrock_provider import BedrockProvider
+from app.llm.router import ProviderRouter
 from app.core.config import get_settings
+from app.core.logging import log_event
+from app.services.estimate_model import estimate_model
 from app.utils.llm_cache import llm_cache
 
 settings = get_settings()
 
+def make_provider(name: str) -> LLMClient:
+    """Create an LLM provider by name."""
+    if name == "ollama":
+        return OllamaProvider()
+    elif name == "bedrock":
+        return BedrockProvider()
+    else:
+        raise ValueError(f"Unsupported model provider: {name}")
+
+@lru_cache()
+def get_provider(name: str, model: str) -> LLMClient:
+    """
+    Process-wide provider per name and model.
+
+    Sharing it means one HTTP client per event loop, instead of a new,
+    never closed client for every estimator.
+    """
+    return make_provider(name)
+
+def model_name(provider: str) -> str:
+    """The configured model of a provider."""
+    return settings.OLLAMA_MODEL if provider == "ollama" else settings.BEDROCK_MODEL
+
+@lru_cache()
+def get_provider_router(primary: str, primary_model: str, fallback: str, fallback_model: str) -> ProviderRouter:
+    """
+    Process-wide router, so latency statistics and breakers outlive single requests.
+
+    Keyed on providers and models: after POST /llm/model the next estimator
+    gets a router whose providers run the new model.
+    """
+    return ProviderRouter([
+        (primary, get_provider(primary, primary_model)),
+        (fallback, get_provider(fallback, fallback_model))
+    ])
+
 class TaskEstimator:
     def __init__(self):
         self.llm_client = self._get_llm_client()
 
     def _get_llm_client(self) -> LLMClient:
-        """Get the configured LLM client."""
-        if settings.MODEL_PROVIDER == "ollama":
-            return OllamaProvider()
-        elif settings.MODEL_PROVIDER == "bedrock":
-            return BedrockProvider()
-        else:
-            raise ValueError(f"Unsupported model provider: {settings.MODEL_PROVIDER}")
+        """Get the configured LLM client, routed over a fallback provider if one is set."""
+        if settings.LLM_FALLBACK_PROVIDER:
+            return get_provider_router(
+                settings.MODEL_PROVIDER, model_name(settings.MODEL_PROVIDER),
+                settings.LLM_FALLBACK_PROVIDER, model_name(settings.LLM_FALLBACK_PROVIDER)
+            )
+        return get_provider(settings.MODEL_PROVIDER, model_name(settings.MODEL_PROVIDER))
 
     async def estimate_tasks(self, tasks: List[Task]) -> List[Task]:
-        """Estimate effort for tasks without estimates, with caching."""
+        """
+        Estimate effort for tasks without estimates.
+
+        The local model answers the tasks it is confident about; only the
+        rest go to the (cached) LLM, whose estimates are calibrated against
+        historical actuals.
+        """
+        pending = [t for t in tasks if t.estimate is None]
+        estimates = estimate_model.predict(pending)
+        if estimates:
+            log_event("local_estimation", {"tasks": len(pending), "local": len(estimates)})
+            pending = [t for t in pending if t.id not in estimates]
+        if settings.LLM_BATCH_ENABLED and len(pending) > 1:
+            estimates.update(await self._estimate_batched(pending))
         updated_tasks = []
         for task in tasks:
             if task.estimate is None:
-                estimate = await self._estimate_single_task(task)
+                estimate = estimates.get(task.id) or await self._estimate_single_task(task)
                 updated_tasks.append(Task(
                     **{**task.model_dump(), "estimate": estimate}
                 ))
@@ -35,25 +90,98 @@ class TaskEstimator:
                 updated_tasks.append(task)
         return updated_tasks
 
-    async def _estimate_single_task(self, task: Task) -> dict:
-        """Get estimate for a single task using LLM, with cache and fallback."""
-        skill_names = [s.name for s in task.required_skills]
-        cache_key_params = {
+    def known_estimates(self, tasks: List[Task]) -> List[Task]:
+        """
+        Fill in the estimates available without calling the LLM.
+
+        Tasks the local model is confident about or whose estimate is cached
+        get one; the others keep ``estimate=None``.
+        """
+        pending = [t for t in tasks if t.estimate is None]
+        estimates = estimate_model.predict(pending)
+        for task in pending:
+            cached = task.id not in estimates and llm_cache.get("estimate_task", self.cache_key_params(task))
+            if cached:
+                estimates[task.id] = estimate_model.calibrate(cached)
+        return [
+            Task(**{**task.model_dump(), "estimate": estimates[task.id]}) if task.id in estimates else task
+            for task in tasks
+        ]
+
+    async def _estimate_batched(self, tasks: List[Task]) -> Dict[str, Dict[str, Any]]:
+        """
+        Estimate uncached tasks several per prompt.
+
+        Tasks with identical cache keys are asked once. Every answered task is
+        cached under its own key, exactly as a single estimate would be; tasks
+        missing from the result are left for _estimate_single_task.
+
+        Returns:
+            Estimates keyed by task id
+        """
+        estimates: Dict[str, Dict[str, Any]] = {}
+        by_key: Dict[str, List[Task]] = {}
+        params: Dict[str, Dict[str, Any]] = {}
+        for task in tasks:
+            cache_key_params = self.cache_key_params(task)
+            cached = llm_cache.get("estimate_task", cache_key_params)
+            if cached:
+                estimates[task.id] = estimate_model.calibrate(cached)
+                continue
+            key = llm_cache.key_of("estimate_task", cache_key_params)
+            by_key.setdefault(key, []).append(task)
+            params[key] = cache_key_params
+
+        items = [
+            {"id": group[0].id, "description": group[0].description, "skills": params[key]["skills"]}
+            for key, group in by_key.items()
+        ]
+        batches = chunk_by_budget(items, settings.LLM_BATCH_TOKEN_BUDGET, settings.LLM_BATCH_MAX_TASKS)
+        answered = {}
+        for batch in batches:
+            try:
+                answered.update(await self.llm_client.estimate_tasks_batch(batch))
+            except Exception as e:
+                logging.getLogger("estimator").error(f"Batch estimation of {len(batch)} tasks failed: {e}")
+
+        missing = 0
+        for key, group in by_key.items():
+            estimate = answered.get(group[0].id)
+            if not estimate:
+                missing += 1
+                continue
+            llm_cache.set("estimate_task", params[key], estimate)
+            for task in group:
+                estimates[task.id] = estimate_model.calibrate(estimate)
+        log_event("batch_estimation", {
+            "tasks": len(items),
+            "batches": len(batches),
+            "reasked": missing
+        })
+        return estimates
+
+    def cache_key_params(self, task: Task) -> Dict[str, Any]:
+        """Cache parameters of a task's estimate; any change means a new estimate."""
+        return {
             "description": task.description,
-            "skills": skill_names,
+            "skills": [s.name for s in task.required_skills],
             "provider": settings.MODEL_PROVIDER,
-            "model": settings.OLLAMA_MODEL if settings.MODEL_PROVIDER == "ollama" else settings.BEDROCK_MODEL
+            "model": model_name(settings.MODEL_PROVIDER)
         }
+
+    async def _estimate_single_task(self, task: Task) -> dict:
+        """Get estimate for a single task using LLM, with cache and fallback."""
+        skill_names = [s.name for s in task.required_skills]
+        cache_key_params = self.cache_key_params(task)
         cached = llm_cache.get("estimate_task", cache_key_params)
         if cached:
-            return cached
+            return estimate_model.calibrate(cached)
         try:
             response = await self.llm_client.estimate_task(
                 task_description=task.description,
                 required_skills=skill_names
             )
             # Log the raw LLM response for debugging
-            import logging
             logging.getLogger("estimator").info(f"Raw LLM response: {response}")
             if not isinstance(response, dict) or "unit" not in response or "value" not in response:
                 logging.getLogger("estimator").warning(f"LLM response missing required fields, using fallback. Response: {response}")
@@ -68,7 +196,7 @@ class TaskEstimator:
                         "value": 8
                     }
             llm_cache.set("estimate_task", cache_key_params, response)
-            return response
+            return estimate_model.calibrate(response)
         except Exception as e:
             logging.getLogger("estimator").error(f"LLM estimation failed, using fallback. Error: {e}")
             if hasattr(settings, "DEFAULT_TASK_ESTIMATE"):
@@ -0,0 +1,190 @@
+from typing import List
+import numpy as np
+from app.domain.enums import ViolationKind
+from app.schemas.evaluation import EvaluatePlanRequest, PlanEvaluation, PlanViolation
+from app.schemas.planning_input import Constraints
+from app.schemas.planning_output import PlanSummary, Utilization
+from app.services.capacity_calendar import CapacityCalendar
+from app.services.estimator import TaskEstimator
+from app.services.planning_data import PlanningData
+from app.services.validator import PlanValidator
+from app.utils.plan_cache import plan_objectives
+
+
+class PlanEvaluator:
+    """Score a proposed (e.g. hand-edited) plan against the planning model without solving.
+
+    The proposal becomes a boolean employees x tasks matrix over the same
+    PlanningData the optimizer uses, and every model constraint is checked
+    with whole-array operations, so evaluation takes milliseconds even for
+    large backlogs.
+    """
+
+    def __init__(self):
+        self.validator = PlanValidator()
+        self.estimator = TaskEstimator()
+        self.calendar = CapacityCalendar()
+
+    async def evaluate(self, request: EvaluatePlanRequest) -> PlanEvaluation:
+        """
+        Check a proposed plan and score it.
+
+        Args:
+            request: The planning input plus the proposed assignments
+
+        Returns:
+            Violations, utilization, summary and objective, with the gap to the
+            optimizer's objective when the same input was planned recently
+
+        Raises:
+            ValueError: If a task has no estimate in the request, the estimate
+                cache or the local estimate model; evaluation never calls the LLM
+        """
+        self.validator.validate_request(request)
+        # Estimates normally come from the cache filled when the plan was made
+        tasks = self.estimator.known_estimates(request.tasks)
+        missing = [t.id for t in tasks if t.estimate is None]
+        if missing:
+            raise ValueError(
+                f"No estimate for tasks {', '.join(missing)}; include estimates or plan the input first"
+            )
+        employees = self.calendar.fill_capacities(request.sprint, request.employees)
+        data = PlanningData(tasks, employees, request.constraints or Constraints())
+
+        violations: List[PlanViolation] = []
+        assigned = np.zeros((data.num_employees, data.num_tasks), dtype=bool)
+        for proposal in request.assignments:
+            j = data.task_index.get(proposal.task_id)
+            if j is None:
+                violations.append(PlanViolation(
+                    kind=ViolationKind.UNKNOWN_TASK,
+                    task_id=proposal.task_id,
+                    message=f"Unknown task {proposal.task_id}"
+                ))
+                continue
+            for employee_id in proposal.employee_ids:
+                i = data.employee_index.get(employee_id)
+                if i is None:
+                    violations.append(PlanViolation(
+                        kind=ViolationKind.UNKNOWN_EMPLOYEE,
+                        task_id=proposal.task_id,
+                        employee_id=employee_id,
+                        message=f"Unknown employee {employee_id}"
+                    ))
+                else:
+                    assigned[i, j] = True
+
+        violations.extend(self.check(data, assigned))
+        planned = assigned.any(axis=0)
+        objective = data.objective_value(assigned)
+        optimal = plan_objectives.get(request)
+        gap = None
+        if optimal is not None:
+            gap = round((optimal - objective) / optimal, 4) if optimal > 0 else 0.0
+        return PlanEvaluation(
+            feasible=not violations,
+            violations=violations,
+            utilization=self._utilization(data, assigned),
+            summary=PlanSummary(
+                total_tasks=data.num_tasks,
+                assigned_tasks=int(planned.sum()),
+                unassigned_tasks=int((~planned).sum()),
+                total_priority_completed=float(sum(t.priority for t, p in zip(tasks, planned) if p))
+            ),
+            objective=objective,
+            optimal_objective=optimal,
+            objective_gap=gap
+        )
+
+    def check(self, data: PlanningData, assigned: np.ndarray) -> List[PlanViolation]:
+        """All constraint violations of a boolean assignment matrix."""
+        violations: List[PlanViolation] = []
+        planned = assigned.any(axis=0)
+        tasks, employees = data.tasks, data.employees
+
+        # Every assignee is charged the full estimate, as in the model
+        load = assigned.astype(float) @ data.estimates
+        for i in np.flatnonzero(load > data.capacities + 1e-9):
+            violations.append(PlanViolation(
+                kind=ViolationKind.CAPACITY,
+                employee_id=employees[i].id,
+                message=f"Planned {load[i]:g} exceeds capacity {data.capacities[i]:g}"
+            ))
+
+        limit = data.constraints.max_parallel_tasks_per_person
+        task_counts = assigned.sum(axis=1)
+        for i in np.flatnonzero(task_counts > limit):
+            violations.append(PlanViolation(
+                kind=ViolationKind.PARALLEL_LIMIT,
+                employee_id=employees[i].id,
+                message=f"{task_counts[i]} tasks exceed the parallel limit of {limit}"
+            ))
+
+        assignee_counts = assigned.sum(axis=0)
+        for j in np.flatnonzero(assignee_counts > data.max_assignees):
+            violations.append(PlanViolation(
+                kind=ViolationKind.MAX_ASSIGNEES,
+                task_id=tasks[j].id,
+                message=f"{assignee_counts[j]} assignees exceed max_assignees {data.max_assignees[j]}"
+            ))
+
+        # Assignees must meet at least one requirement, and together all of them
+        holds_any = np.zeros_like(assigned)
+        has_reqs = np.flatnonzero(np.diff(data.req_ptr) > 0)
+        if len(has_reqs):
+            holds_any[:, has_reqs] = np.logical_or.reduceat(data.qualified, data.req_ptr[has_reqs], axis=1)
+        for i, j in zip(*np.nonzero(assigned & ~holds_any)):
+            violations.append(PlanViolation(
+                kind=ViolationKind.INELIGIBLE_ASSIGNEE,
+                task_id=tasks[j].id,
+                employee_id=employees[i].id,
+                message=f"{employees[i].id} meets none of the skill requirements of {tasks[j].id}"
+            ))
+        covered = (assigned[:, data.req_task] & data.qualified).any(axis=0)
+        skill_names = {v: k for k, v in data.skill_ids.items()}
+        for r in np.flatnonzero(planned[data.req_task] & ~covered):
+            j = data.req_task[r]
+            violations.append(PlanViolation(
+                kind=ViolationKind.SKILL_NOT_COVERED,
+                task_id=tasks[j].id,
+                message=(
+                    f"No assignee has {skill_names[data.req_skill[r]]} at level "
+                    f"{max(data.req_level[r] - data.constraints.min_skill_level_match, 1)} or above"
+                )
+            ))
+
+        for j, t in enumerate(tasks):
+            if not planned[j]:
+                if data.must_have[j]:
+                    violations.append(PlanViolation(
+                        kind=ViolationKind.MUST_HAVE,
+                        task_id=t.id,
+                        message=f"Must-have task {t.id} is not planned"
+                    ))
+                continue
+            missing = [d for d in t.dependencies if d in data.task_index and not planned[data.task_index[d]]]
+            if missing:
+                violations.append(PlanViolation(
+                    kind=ViolationKind.DEPENDENCY,
+                    task_id=t.id,
+                    message=f"Planned before its dependencies: {', '.join(missing)}"
+                ))
+        return violations
+
+    @staticmethod
+    def _utilization(data: PlanningData, assigned: np.ndarray) -> List[Utilization]:
+        """Utilization as plans report it: each assignee carries an equal share of the estimate."""
+        shares = data.estimates / np.maximum(assigned.sum(axis=0), 1)
+        planned = assigned.astype(float) @ shares
+        capacities = data.capacities
+        pct = np.where(capacities > 0, np.round(planned / data.safe_capacities * 100, 1), 0.0)
+        return [
+            Utilization(
+                employee_id=e.id,
+                unit=e.capacity.unit,
+                planned=float(planned[i]),
+                capacity=float(capacities[i]),
+                utilization_pct=float(min(pct[i], 100.0))
+            )
+            for i, e in enumerate(data.employees)
+        ]
@@ -0,0 +1,150 @@
+from collections import deque
+from typing import Dict, List, Optional, Set
+import numpy as np
+from app.core import profiling
+from app.core.config import get_settings
+from app.core.logging import log_event
+from app.domain.enums import UnassignedReason
+from app.domain.models import Capacity, Employee, Task
+from app.schemas.planning_input import Constraints, HorizonPlanRequest, HorizonSprint
+from app.schemas.planning_output import HorizonPlanResponse, PlanResponse, PlanSummary, UnassignedTask
+from app.services.planner import SprintPlanner
+
+settings = get_settings()
+
+
+class HorizonPlanner:
+    """Plan several consecutive sprints with a rolling horizon.
+
+    Instead of one model over the whole horizon, every sprint is solved on its
+    own with the single-sprint model, in order. A task enters a sprint once all
+    its dependencies were planned in earlier sprints; tasks left unassigned are
+    carried to the next sprint. Each model only holds the ready tasks, so the
+    runtime grows about linearly with the number of sprints.
+
+    To avoid myopic choices, a ready task is weighted by its own priority plus
+    the discounted priorities of the tasks it unblocks within the look-ahead
+    window, so enablers of valuable follow-up work are scheduled early.
+    """
+
+    def __init__(self, planner: Optional[SprintPlanner] = None):
+        self.planner = planner or SprintPlanner()
+
+    async def create_plan(self, request: HorizonPlanRequest) -> HorizonPlanResponse:
+        """Create one plan per sprint of the request."""
+        with profiling.phase("validate"):
+            self.planner.validator.validate_horizon(request)
+        with profiling.phase("estimate"):
+            tasks = await self.planner.estimator.estimate_tasks(request.tasks)
+
+        constraints = request.constraints or Constraints()
+        lookahead = (
+            request.lookahead_sprints if request.lookahead_sprints is not None
+            else settings.HORIZON_LOOKAHEAD_SPRINTS
+        )
+        dependents: Dict[str, List[str]] = {}
+        for t in tasks:
+            for dep_id in t.dependencies:
+                dependents.setdefault(dep_id, []).append(t.id)
+        priority = {t.id: t.priority for t in tasks}
+
+        done: Set[str] = set(request.completed_task_ids)
+        remaining = list(tasks)
+        last_reason: Dict[str, UnassignedTask] = {}
+        plans: List[PlanResponse] = []
+        for k, horizon_sprint in enumerate(request.sprints):
+            ready = [t for t in remaining if all(d in done for d in t.dependencies)]
+            window = min(lookahead, len(request.sprints) - k - 1)
+            weights = np.array([
+                t.priority + self._lookahead_value(t.id, dependents, priority, window)
+                for t in ready
+            ], dtype=float)
+            plan = await self.planner.plan_tasks(
+                sprint=horizon_sprint.sprint,
+                employees=self._sprint_employees(horizon_sprint, request.employees),
+                tasks=ready,
+                constraints=constraints,
+                priorities=weights
+            )
+            planned = {a.task_id for a in plan.assignments}
+            done |= planned
+            remaining = [t for t in remaining if t.id not in planned]
+            last_reason.update((u.task_id, u) for u in plan.unassigned)
+            if plan.unassigned and k + 1 < len(request.sprints):
+                plan.notes = f"{len(plan.unassigned)} unassigned task(s) carried to the next sprint"
+            plans.append(plan)
+            log_event("horizon_sprint_planned", {
+                "sprint_id": horizon_sprint.sprint.id,
+                "ready_tasks": len(ready),
+                "assigned_tasks": len(planned),
+                "carried_tasks": len(remaining)
+            })
+
+        unassigned = [
+            last_reason.get(t.id) or self._never_ready(t, done)
+            for t in remaining
+        ]
+        return HorizonPlanResponse(
+            sprints=plans,
+            unassigned=unassigned,
+            summary=PlanSummary(
+                total_tasks=len(tasks),
+                assigned_tasks=len(tasks) - len(remaining),
+                unassigned_tasks=len(unassigned),
+                total_priority_completed=sum(t.priority for t in tasks if t.id in done)
+            )
+        )
+
+    @staticmethod
+    def _lookahead_value(
+        task_id: str,
+        dependents: Dict[str, List[str]],
+        priority: Dict[str, int],
+        window: int
+    ) -> float:
+        """
+        Discounted priority of the tasks a task unblocks within the window.
+
+        A dependent d levels down the graph can start d sprints later at the
+        earliest, so only dependents up to ``window`` levels deep count, each
+        weighted by HORIZON_LOOKAHEAD_DISCOUNT ** d.
+        """
+        if window <= 0:
+            return 0.0
+        value = 0.0
+        seen = {task_id}
+        frontier = deque([(task_id, 0)])
+        while frontier:
+            current, depth = frontier.popleft()
+            if depth == window:
+                continue
+            for dependent in dependents.get(current, ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    value += priority[dependent] * settings.HORIZON_LOOKAHEAD_DISCOUNT ** (depth + 1)
+                    frontier.append((dependent, depth + 1))
+        return value
+
+    @staticmethod
+    def _sprint_employees(horizon_sprint: HorizonSprint, employees: List[Employee]) -> List[Employee]:
+        """Employees with this sprint's capacity overrides applied."""
+        if not horizon_sprint.capacities:
+            return employees
+        return [
+            e.model_copy(update={"capacity": Capacity(
+                unit=e.capacity.unit,
+                available=horizon_sprint.capacities[e.id],
+                notes=e.capacity.notes
+            )}) if e.id in horizon_sprint.capacities else e
+            for e in employees
+        ]
+
+    @staticmethod
+    def _never_ready(task: Task, done: Set[str]) -> UnassignedTask:
+        blocked = [d for d in task.dependencies if d not in done]
+        return UnassignedTask(
+            task_id=task.id,
+            reasons=[f"Dependencies not planned within the horizon: {', '.join(blocked)}"],
+            category=UnassignedReason.BLOCKED_DEPENDENCY,
+            blocking_dependencies=blocked
+        )
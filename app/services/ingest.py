@@ -0,0 +1,294 @@
+import csv
+import json
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from pydantic import ValidationError
+from app.core.config import get_settings
+from app.domain.models import Employee, Task, Team
+from app.schemas.ingest import IngestReport, RowError
+from app.utils.time_utils import normalize_skill_name
+
+settings = get_settings()
+
+# Read uploads in chunks of this many bytes; only one chunk of raw text is held at a time
+CHUNK_SIZE = 64 * 1024
+# Separators of the flat CSV columns: "python:4;sql:3", "T-1;T-2", "2025-09-15..2025-09-17"
+LIST_SEPARATOR = ";"
+PAIR_SEPARATOR = ":"
+RANGE_SEPARATOR = ".."
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """Return "csv" or "ndjson" from an upload's file name and content type."""
+    if (content_type or "").split(";")[0].strip() in ("text/csv", "application/csv"):
+        return "csv"
+    if (filename or "").lower().endswith(".csv"):
+        return "csv"
+    return "ndjson"
+
+
+def iter_lines(stream: BinaryIO, errors: Optional[Dict[int, Exception]] = None) -> Iterator[str]:
+    """
+    Decode a binary stream incrementally and yield its lines, newline included.
+
+    Lines are split on bytes and decoded one at a time, so one bad line does
+    not end the stream. A line that is not UTF-8 or contains a NUL byte is
+    yielded as an empty line, and its error is stored in ``errors`` under
+    its line number (or raised when no dict is given).
+    """
+    pending = b""
+    line_num = 0
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        lines = (pending + chunk).splitlines(keepends=True)
+        # Keep an unterminated last line, or a "\r" whose "\n" may start the next chunk
+        pending = lines.pop() if chunk and lines and not lines[-1].endswith(b"\n") else b""
+        for raw in lines:
+            line_num += 1
+            try:
+                line = raw.decode("utf-8-sig" if line_num == 1 else "utf-8")
+                if "\x00" in line:
+                    raise ValueError("Line contains a NUL byte")
+            except ValueError as e:  # UnicodeDecodeError is a ValueError
+                if errors is None:
+                    raise
+                errors[line_num] = e
+                line = "\n"
+            yield line
+        if not chunk:
+            break
+
+
+def iter_rows(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (line number, row) pairs from an NDJSON or CSV stream.
+
+    NDJSON rows are the decoded JSON values. CSV rows are dicts keyed by the
+    header row; empty cells are dropped so model defaults apply. A row that
+    cannot be read (malformed JSON, bytes that are not UTF-8, a NUL byte, a
+    CSV syntax error such as an oversized field) is yielded as its exception
+    and reading goes on with the next row.
+    """
+    errors: Dict[int, Exception] = {}
+    if fmt == "csv":
+        # Lines handed to the reader; unlike reader.line_num it also counts a line the reader failed on
+        read = [0]
+
+        def counted() -> Iterator[str]:
+            for line in iter_lines(stream, errors):
+                read[0] += 1
+                yield line
+
+        reader = csv.DictReader(counted())
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                row = e
+            yield from _pop_errors(errors)
+            if isinstance(row, dict):
+                row = {k: v for k, v in row.items() if k and v not in (None, "")}
+            yield read[0], row
+        yield from _pop_errors(errors)
+        return
+
+    for line_num, line in enumerate(iter_lines(stream, errors), start=1):
+        if line_num in errors:
+            yield line_num, errors.pop(line_num)
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_num, e
+
+
+def _pop_errors(errors: Dict[int, Exception]) -> Iterator[Tuple[int, Exception]]:
+    """Yield and forget the recorded line errors in line order."""
+    for line_num in sorted(errors):
+        yield line_num, errors.pop(line_num)
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+
+
+def _skill_pairs(value: str, level_key: str) -> List[dict]:
+    pairs = []
+    for item in _split(value):
+        name, sep, level = item.rpartition(PAIR_SEPARATOR)
+        if not sep:
+            raise ValueError(f"Skill '{item}' must be written as name{PAIR_SEPARATOR}level")
+        pairs.append({"name": name, level_key: level})
+    return pairs
+
+
+def task_from_csv(row: Dict[str, str]) -> dict:
+    """Expand a flat CSV task row into the Task model layout."""
+    task = {k: v for k, v in row.items() if k not in ("estimate_value", "estimate_unit")}
+    if "required_skills" in row:
+        task["required_skills"] = _skill_pairs(row["required_skills"], "min_level")
+    if "dependencies" in row:
+        task["dependencies"] = _split(row["dependencies"])
+    if "estimate_value" in row:
+        task["estimate"] = {"value": row["estimate_value"], "unit": row.get("estimate_unit", "hours")}
+    return task
+
+
+def employee_from_csv(row: Dict[str, str]) -> dict:
+    """Expand a flat CSV employee row into the Employee model layout."""
+    employee = {
+        k: v for k, v in row.items()
+        if k not in ("capacity_unit", "capacity_available")
+    }
+    if "skills" in row:
+        employee["skills"] = _skill_pairs(row["skills"], "level")
+    if "pto" in row:
+        employee["pto"] = []
+        for item in _split(row["pto"]):
+            start, _, end = item.partition(RANGE_SEPARATOR)
+            employee["pto"].append({"start": start, "end": end or start})
+    employee["capacity"] = {"unit": row.get("capacity_unit", "hours")}
+    if "capacity_available" in row:
+        employee["capacity"]["available"] = row["capacity_available"]
+    return employee
+
+
+class BacklogIngestor:
+    """Builds validated employees and tasks from NDJSON or CSV uploads, row by row.
+
+    Each row is parsed, validated and normalized as it is read and the raw text
+    is dropped straight away, so memory grows with the accepted models rather
+    than the uploaded document. Bad rows are recorded as RowErrors and skipped
+    instead of failing the whole upload. Skill names are normalized and
+    interned so every row mentioning a skill shares one string.
+    """
+
+    def __init__(
+        self,
+        teams: List[Team],
+        max_errors: Optional[int] = None,
+        completed_task_ids: Iterable[str] = ()
+    ):
+        self.team_ids: Set[str] = {t.id for t in teams}
+        self.completed_task_ids: Set[str] = set(completed_task_ids)
+        self.max_errors = max_errors if max_errors is not None else settings.INGEST_MAX_ROW_ERRORS
+        self.errors: List[RowError] = []
+        self.errors_total = 0
+        self.rows_read = 0
+        self._skill_names: Dict[str, str] = {}
+
+    def read_employees(self, stream: BinaryIO, fmt: str = "ndjson") -> List[Employee]:
+        """Parse, validate and normalize employee rows from a stream."""
+        employees: List[Employee] = []
+        seen: Set[str] = set()
+        for line, row in self._rows(stream, fmt, "employees", employee_from_csv):
+            try:
+                employee = Employee.model_validate(row)
+                if employee.id in seen:
+                    raise ValueError(f"Duplicate employee ID: {employee.id}")
+                if employee.team_id not in self.team_ids:
+                    raise ValueError(f"Invalid team ID {employee.team_id} for employee {employee.id}")
+                if not employee.skills:
+                    raise ValueError(f"Employee {employee.id} has no skills")
+            except (ValidationError, ValueError) as e:
+                self._record("employees", line, e)
+                continue
+            for skill in employee.skills:
+                skill.name = self._skill(skill.name)
+            seen.add(employee.id)
+            employees.append(employee)
+        return employees
+
+    def read_tasks(self, stream: BinaryIO, fmt: str = "ndjson") -> List[Task]:
+        """
+        Parse, validate and normalize task rows from a stream.
+
+        Tasks depending on a task that is missing from the upload (and not
+        completed), or was rejected, are rejected too once the whole stream has been read.
+        """
+        tasks: List[Task] = []
+        lines: Dict[str, int] = {}
+        for line, row in self._rows(stream, fmt, "tasks", task_from_csv):
+            try:
+                task = Task.model_validate(row)
+                if task.id in lines:
+                    raise ValueError(f"Duplicate task ID: {task.id}")
+                if task.team_id and task.team_id not in self.team_ids:
+                    raise ValueError(f"Invalid team ID {task.team_id} for task {task.id}")
+                if not task.required_skills:
+                    raise ValueError(f"Task {task.id} has no required skills")
+            except (ValidationError, ValueError) as e:
+                self._record("tasks", line, e)
+                continue
+            for requirement in task.required_skills:
+                requirement.name = self._skill(requirement.name)
+            lines[task.id] = line
+            tasks.append(task)
+        return self._drop_dangling_dependencies(tasks, lines)
+
+    def report(self, tasks: List[Task], employees: List[Employee]) -> IngestReport:
+        return IngestReport(
+            rows_read=self.rows_read,
+            tasks_accepted=len(tasks),
+            employees_accepted=len(employees),
+            errors=self.errors,
+            errors_total=self.errors_total
+        )
+
+    def _rows(self, stream, fmt, source, from_csv) -> Iterator[Tuple[int, dict]]:
+        for line, row in iter_rows(stream, fmt):
+            self.rows_read += 1
+            try:
+                if isinstance(row, UnicodeDecodeError):
+                    raise ValueError(f"Not UTF-8: {row}")
+                if isinstance(row, json.JSONDecodeError):
+                    raise ValueError(f"Malformed JSON: {row}")
+                if isinstance(row, csv.Error):
+                    raise ValueError(f"Malformed CSV: {row}")
+                if isinstance(row, Exception):
+                    raise ValueError(str(row))
+                if not isinstance(row, dict):
+                    raise ValueError("Row must be a JSON object")
+                yield line, from_csv(row) if fmt == "csv" else row
+            except ValueError as e:
+                self._record(source, line, e)
+
+    def _drop_dangling_dependencies(self, tasks: List[Task], lines: Dict[str, int]) -> List[Task]:
+        # Rejecting a task can strand its dependents, so repeat until stable
+        while True:
+            accepted = set(lines) | self.completed_task_ids
+            kept = []
+            for task in tasks:
+                missing = [d for d in task.dependencies if d not in accepted]
+                if missing:
+                    self._record("tasks", lines.pop(task.id), ValueError(
+                        f"Invalid dependency {missing[0]} for task {task.id}"
+                    ))
+                else:
+                    kept.append(task)
+            if len(kept) == len(tasks):
+                return kept
+            tasks = kept
+
+    def _skill(self, name: str) -> str:
+        normalized = self._skill_names.get(name)
+        if normalized is None:
+            normalized = normalize_skill_name(name)
+            normalized = self._skill_names.setdefault(normalized, normalized)
+            self._skill_names[name] = normalized
+        return normalized
+
+    def _record(self, source: str, line: int, error: Exception) -> None:
+        self.errors_total += 1
+        if len(self.errors) >= self.max_errors:
+            return
+        if isinstance(error, ValidationError):
+            message = "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in error.errors()
+            )
+        else:
+            message = str(error)
+        self.errors.append(RowError(source=source, line=line, error=message))
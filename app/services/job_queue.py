@@ -0,0 +1,193 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+from app.core.config import get_settings
+from app.core.logging import log_event
+from app.domain.enums import JobStatus, PlanJobKind
+from app.schemas.plan_jobs import PlanJob
+
+settings = get_settings()
+
+
+@dataclass
+class LeasedJob:
+    """A job a worker holds the lease of."""
+    job_id: str
+    kind: PlanJobKind
+    payload: str  # request JSON
+    attempt: int
+
+
+class PlanJobQueue:
+    """Durable planning job queue in a SQLite file, shared by the API and solver workers on one host.
+
+    API nodes only enqueue jobs and read their results; worker processes
+    lease jobs, solve them and write the results back. A lease is valid for
+    the visibility timeout and is extended by heartbeats while the worker is
+    solving. A job whose lease expired (its worker crashed or hung) becomes
+    visible again and is retried, up to PLAN_QUEUE_MAX_ATTEMPTS leases in
+    total. Every state change is one transaction, so any number of processes
+    can share the file. The file is opened in WAL mode, whose shared-memory
+    index only works between processes of one host: keep it on a local disk,
+    not on a network filesystem.
+    """
+
+    def __init__(self, path: str, visibility_seconds: Optional[float] = None, max_attempts: Optional[int] = None):
+        self.visibility_seconds = visibility_seconds or settings.PLAN_QUEUE_VISIBILITY_SECONDS
+        self.max_attempts = max_attempts or settings.PLAN_QUEUE_MAX_ATTEMPTS
+        self._lock = threading.Lock()
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS plan_jobs ("
+            " job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0, lease_owner TEXT, lease_expires REAL,"
+            " result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS plan_jobs_status ON plan_jobs (status, created_at)")
+
+    def enqueue(self, kind: PlanJobKind, payload: str) -> PlanJob:
+        """Store a new queued job for a validated request JSON."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO plan_jobs (job_id, kind, payload, status, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind.value, payload, JobStatus.QUEUED.value, now, now)
+            )
+        log_event("plan_job_enqueued", {"job_id": job_id, "kind": kind.value})
+        return self.get(job_id)
+
+    def lease(self, worker_id: str) -> Optional[LeasedJob]:
+        """
+        Lease the oldest visible job.
+
+        Visible are queued jobs and running jobs whose lease expired. An
+        expired job that already used all its attempts is failed instead.
+
+        Args:
+            worker_id: Identity of the leasing worker
+
+        Returns:
+            The leased job, or None when no job is visible
+        """
+        now = time.time()
+        with self._lock, self._transaction():
+            self._db.execute(
+                "UPDATE plan_jobs SET status = ?, error = ?, lease_owner = NULL, updated_at = ?"
+                " WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (
+                    JobStatus.FAILED.value, f"Lease expired on all {self.max_attempts} attempts", now,
+                    JobStatus.RUNNING.value, now, self.max_attempts
+                )
+            )
+            row = self._db.execute(
+                "SELECT job_id, kind, payload, attempts FROM plan_jobs"
+                " WHERE status = ? OR (status = ? AND lease_expires < ?)"
+                " ORDER BY created_at LIMIT 1",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value, now)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, kind, payload, attempts = row
+            self._db.execute(
+                "UPDATE plan_jobs SET status = ?, attempts = ?, lease_owner = ?, lease_expires = ?, updated_at = ?"
+                " WHERE job_id = ?",
+                (JobStatus.RUNNING.value, attempts + 1, worker_id, now + self.visibility_seconds, now, job_id)
+            )
+        if attempts:
+            log_event("plan_job_retried", {"job_id": job_id, "attempt": attempts + 1, "worker": worker_id})
+        return LeasedJob(job_id=job_id, kind=PlanJobKind(kind), payload=payload, attempt=attempts + 1)
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend a lease by the visibility timeout; False when the worker no longer holds it."""
+        return self._update_leased(
+            job_id, worker_id,
+            "lease_expires = ?, updated_at = ?", (time.time() + self.visibility_seconds, time.time())
+        )
+
+    def complete(self, job_id: str, worker_id: str, result: str) -> bool:
+        """Store the result JSON of a leased job; False when the lease was lost meanwhile."""
+        return self._update_leased(
+            job_id, worker_id,
+            "status = ?, result = ?, error = NULL, lease_owner = NULL, updated_at = ?",
+            (JobStatus.COMPLETED.value, result, time.time())
+        )
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool) -> bool:
+        """
+        Give up a leased job.
+
+        Args:
+            job_id: The job
+            worker_id: The worker holding the lease
+            error: What went wrong
+            retry: Make the job visible again if it has attempts left;
+                otherwise (e.g. invalid input) fail it for good
+
+        Returns:
+            False when the lease was lost meanwhile
+        """
+        # Read the attempts and write the new status in one transaction, as lease() does
+        with self._lock, self._transaction():
+            row = self._db.execute("SELECT attempts FROM plan_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            status = JobStatus.QUEUED if retry and row and row[0] < self.max_attempts else JobStatus.FAILED
+            return self._update_leased_locked(
+                job_id, worker_id,
+                "status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?",
+                (status.value, error, time.time())
+            )
+
+    def get(self, job_id: str) -> Optional[PlanJob]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT job_id, kind, status, attempts, result, error, created_at, updated_at"
+                " FROM plan_jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, kind, status, attempts, result, error, created_at, updated_at = row
+        return PlanJob(
+            job_id=job_id,
+            kind=kind,
+            status=status,
+            attempts=attempts,
+            result=json.loads(result) if result else None,
+            error=error,
+            created_at=created_at,
+            updated_at=updated_at
+        )
+
+    def _update_leased(self, job_id: str, worker_id: str, assignments: str, values: tuple) -> bool:
+        """Update a job only while it is running under this worker's lease."""
+        with self._lock:
+            return self._update_leased_locked(job_id, worker_id, assignments, values)
+
+    def _update_leased_locked(self, job_id: str, worker_id: str, assignments: str, values: tuple) -> bool:
+        """_update_leased for callers already holding the lock."""
+        cursor = self._db.execute(
+            f"UPDATE plan_jobs SET {assignments} WHERE job_id = ? AND status = ? AND lease_owner = ?",
+            (*values, job_id, JobStatus.RUNNING.value, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Write transaction taken before reading, so two workers never lease the same job."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+plan_queue = PlanJobQueue(settings.PLAN_QUEUE_PATH) if settings.PLAN_QUEUE_PATH else None
@@ -0,0 +1,326 @@
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+import numpy as np
+from scipy import sparse
+from app.core.config import get_settings
+from app.services.planning_data import PlanningData
+
+settings = get_settings()
+
+
+@dataclass
+class LagrangianResult:
+    """Best repaired plan of a decomposition run and its proven bound."""
+    assigned: Optional[np.ndarray]  # boolean employees x tasks, None if no plan met every enforced must-have
+    objective: float  # objective of ``assigned``
+    bound: float  # Lagrangian dual bound: no plan scores higher
+    iterations: int
+    seconds: float
+
+    @property
+    def gap(self) -> float:
+        """Relative distance between the plan and the bound."""
+        return max(self.bound - self.objective, 0.0) / self.bound if self.bound > 1e-9 else 0.0
+
+
+def knapsack(
+    profits: np.ndarray,
+    weights: np.ndarray,
+    capacity: float,
+    limit: int,
+    bins: int
+) -> Tuple[float, np.ndarray]:
+    """
+    Pick at most ``limit`` items of total weight within ``capacity`` maximizing profit.
+
+    Weights are rounded down to ``bins`` steps of the capacity, so the result
+    is a relaxation of the exact problem: its value is never below the exact
+    optimum, which keeps Lagrangian bounds valid. Within a weight step only
+    the ``limit`` most profitable items can be part of an optimum, which
+    bounds the dynamic program to ``limit * (bins + 1)`` items.
+
+    Args:
+        profits: Item profits; only positive ones are considered
+        weights: Item weights
+        capacity: Weight budget
+        limit: Maximum number of items
+        bins: Weight resolution of the dynamic program
+
+    Returns:
+        The optimal value and the indices of the chosen items
+    """
+    items = np.flatnonzero((profits > 1e-12) & (weights <= capacity + 1e-9))
+    if len(items) == 0 or limit <= 0:
+        return 0.0, items[:0]
+    # Fast path: the most profitable items already fit
+    top = items[np.argsort(-profits[items], kind="stable")[:limit]]
+    if weights[top].sum() <= capacity + 1e-9:
+        return float(profits[top].sum()), top
+
+    if capacity > 0:
+        steps = np.minimum((weights[items] * bins / capacity).astype(int), bins)
+    else:
+        steps = np.zeros(len(items), dtype=int)
+    by_step = np.lexsort((-profits[items], steps))
+    rank = np.arange(len(items)) - np.searchsorted(steps[by_step], steps[by_step])
+    keep = by_step[rank < limit]
+    items, steps = items[keep], steps[keep]
+
+    # best[k, b]: best profit of k items with total steps <= b
+    best = np.full((limit + 1, bins + 1), -np.inf)
+    best[0] = 0.0
+    took = np.zeros((len(items), limit + 1, bins + 1), dtype=bool)
+    for n, (item, q) in enumerate(zip(items.tolist(), steps.tolist())):
+        candidate = np.full_like(best, -np.inf)
+        candidate[1:, q:] = best[:-1, :bins + 1 - q] + profits[item]
+        took[n] = candidate > best
+        np.maximum(best, candidate, out=best)
+    k = int(np.argmax(best[:, bins]))
+    value = float(best[k, bins])
+    chosen = []
+    b = bins
+    for n in range(len(items) - 1, -1, -1):
+        if k > 0 and took[n, k, b]:
+            chosen.append(items[n])
+            k -= 1
+            b -= steps[n]
+    return value, np.array(chosen, dtype=int)
+
+
+class LagrangianSolver:
+    """Lagrangian decomposition of the assignment model for very large organisations.
+
+    The per-task coupling constraints (skill coverage, max assignees) and the
+    precedence constraints are moved into the objective with non-negative
+    multipliers. What remains splits into one small knapsack per employee
+    (capacity and parallel-task limit, solved by dynamic programming; members
+    of an employee class share one solve) and a trivial choice of planned
+    tasks. Each relaxed solve gives an upper bound on the optimum; the
+    multipliers follow projected subgradient steps (Polyak step length) to
+    tighten it. Every few iterations the relaxed solution guides a greedy
+    repair that builds a feasible plan, so the best plan comes with a proven
+    gap to the bound.
+    """
+
+    def __init__(self, data: PlanningData, enforced: Set[int], time_limit: Optional[float] = None):
+        self.data = data
+        self.enforced = np.zeros(data.num_tasks, dtype=bool)
+        self.enforced[list(enforced)] = True
+        self.time_limit = time_limit or settings.SOLVER_LAGRANGIAN_TIME_LIMIT
+        self.limit = data.constraints.max_parallel_tasks_per_person
+
+        # Members of a class have identical rows, so the relaxation works on one row per class
+        self.representatives = np.array([members[0] for members in data.employee_classes], dtype=int)
+        self.sizes = np.array([len(members) for members in data.employee_classes])
+        self.class_of = np.empty(data.num_employees, dtype=int)
+        for c, members in enumerate(data.employee_classes):
+            self.class_of[members] = c
+        self.qualified = data.qualified[self.representatives]
+
+        values = data.priorities[None, :] * (data.fit if data.fit is not None else 1.0)
+        self.values = np.where(data.eligible, values, 0.0)
+        self.req_counts = np.diff(data.req_ptr)
+        num_reqs = len(data.req_task)
+        self.req_to_task = sparse.csr_matrix(
+            (np.ones(num_reqs), (np.arange(num_reqs), data.req_task)), shape=(num_reqs, data.num_tasks)
+        )
+        self.prereqs: List[List[int]] = [[] for _ in range(data.num_tasks)]
+        for j, p in zip(data.dep_task.tolist(), data.dep_prereq.tolist()):
+            self.prereqs[j].append(p)
+
+    def solve(self) -> LagrangianResult:
+        data = self.data
+        start = time.perf_counter()
+        coverage = np.zeros(len(data.req_task))  # >= 0, one per skill requirement
+        assignees = np.zeros(data.num_tasks)  # >= 0, one per task
+        precedence = np.zeros(len(data.dep_task))  # >= 0, one per reduced dependency edge
+        best_bound, best_objective, best_plan = np.inf, 0.0, None
+        step_scale, stalled = 2.0, 0
+        iteration = 0
+        while iteration < settings.SOLVER_LAGRANGIAN_MAX_ITERATIONS:
+            iteration += 1
+            bound, x, y = self._relaxed(coverage, assignees, precedence)
+            if bound < best_bound - 1e-9:
+                best_bound, stalled = bound, 0
+            else:
+                stalled += 1
+                if stalled >= settings.SOLVER_LAGRANGIAN_PATIENCE:
+                    step_scale, stalled = step_scale / 2, 0
+
+            if iteration == 1 or iteration % settings.SOLVER_LAGRANGIAN_REPAIR_EVERY == 0:
+                plan = self._repair(x, y)
+                if self._meets_enforced(plan):
+                    objective = data.objective_value(plan)
+                    if best_plan is None or objective > best_objective:
+                        best_objective, best_plan = objective, plan
+
+            gap = (best_bound - best_objective) / best_bound if best_bound > 1e-9 else 0.0
+            if (
+                (best_plan is not None and gap <= settings.SOLVER_LAGRANGIAN_GAP)
+                or step_scale < 1e-4
+                or time.perf_counter() - start > self.time_limit
+            ):
+                break
+
+            # Subgradients of the relaxed constraints, each written as g >= 0
+            covered = self.sizes @ (self.qualified & x[:, data.req_task])
+            g_coverage = covered - y[data.req_task]
+            g_assignees = data.max_assignees * y - self.sizes @ x
+            g_precedence = y[data.dep_prereq].astype(float) - y[data.dep_task]
+            norm = float(g_coverage @ g_coverage + g_assignees @ g_assignees + g_precedence @ g_precedence)
+            if norm == 0:
+                break
+            step = step_scale * max(bound - best_objective, 1e-6) / norm
+            coverage = np.maximum(coverage - step * g_coverage, 0.0)
+            assignees = np.maximum(assignees - step * g_assignees, 0.0)
+            precedence = np.maximum(precedence - step * g_precedence, 0.0)
+
+        if best_plan is None:
+            # Last chance with the final multipliers
+            _, x, y = self._relaxed(coverage, assignees, precedence)
+            plan = self._repair(x, y)
+            if self._meets_enforced(plan):
+                best_objective, best_plan = data.objective_value(plan), plan
+        return LagrangianResult(
+            assigned=best_plan,
+            objective=best_objective,
+            bound=float(best_bound),
+            iterations=iteration,
+            seconds=time.perf_counter() - start
+        )
+
+    def _relaxed(
+        self,
+        coverage: np.ndarray,
+        assignees: np.ndarray,
+        precedence: np.ndarray
+    ) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Solve the Lagrangian relaxation for fixed multipliers.
+
+        Returns:
+            Its value (an upper bound on the optimum), the relaxed assignment
+            matrix per employee class and the relaxed planned-task vector
+        """
+        data = self.data
+        reps = self.representatives
+        # Reduced profit of each pair: value + covered requirements' multipliers - assignee multiplier
+        profits = self.values[reps] - assignees[None, :]
+        if len(data.req_task):
+            profits += (self.req_to_task.T @ (self.qualified * coverage[None, :]).T).T
+        profits = np.where(data.eligible[reps], profits, -np.inf)
+
+        x = np.zeros((len(reps), data.num_tasks), dtype=bool)
+        bound = 0.0
+        for c, i in enumerate(reps.tolist()):
+            value, chosen = knapsack(
+                profits[c], data.estimates, data.capacities[i], self.limit, settings.SOLVER_LAGRANGIAN_DP_BINS
+            )
+            x[c, chosen] = True
+            bound += value * self.sizes[c]
+
+        # Planned-task weights: assignee capacity - required coverage +/- precedence multipliers
+        weights = data.max_assignees * assignees
+        if len(data.req_task):
+            weights -= np.bincount(data.req_task, weights=coverage, minlength=data.num_tasks)
+        if len(data.dep_task):
+            weights += np.bincount(data.dep_prereq, weights=precedence, minlength=data.num_tasks)
+            weights -= np.bincount(data.dep_task, weights=precedence, minlength=data.num_tasks)
+        y = self.enforced | ((weights > 0) & ~data.pruned)
+        bound += float(weights[y].sum())
+        return bound, x, y
+
+    def _repair(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Build a feasible plan guided by a relaxed solution (x per employee class).
+
+        Tasks are placed greedily: enforced must-haves first, then the tasks
+        the relaxation planned, each group by priority, and a task only after
+        its prerequisites. Assignees are chosen to cover the skill
+        requirements, preferring the pairs the relaxation picked and the
+        tightest remaining capacity. Finally planned tasks take further
+        qualified assignees while slots and capacity are left.
+        """
+        data = self.data
+        remaining = data.capacities.copy()
+        slots = np.full(data.num_employees, self.limit)
+        assigned = np.zeros(data.eligible.shape, dtype=bool)
+        planned = np.zeros(data.num_tasks, dtype=bool)
+        # Each assignee uses a parallel-task slot, so order by value, then by smaller estimate
+        pending = np.lexsort((data.estimates, -data.priorities, ~y, ~self.enforced)).tolist()
+        progress = True
+        while pending and progress:
+            progress = False
+            waiting = []
+            for j in pending:
+                if not all(planned[p] for p in self.prereqs[j]):
+                    waiting.append(j)
+                elif self._place(j, x, assigned, remaining, slots):
+                    planned[j] = progress = True
+                # A task that does not fit now never will: capacities only shrink
+            pending = waiting
+
+        # Every further qualified assignee adds value; fill leftover slots and capacity
+        for j in np.flatnonzero(assigned.any(axis=0))[np.argsort(-data.priorities[assigned.any(axis=0)], kind="stable")]:
+            room = data.max_assignees[j] - assigned[:, j].sum()
+            if room <= 0:
+                continue
+            spare = np.flatnonzero(
+                data.eligible[:, j] & ~assigned[:, j] & (remaining >= data.estimates[j] - 1e-9) & (slots > 0)
+            )
+            extra = spare[np.argsort(-self.values[spare, j], kind="stable")[:room]]
+            assigned[extra, j] = True
+            remaining[extra] -= data.estimates[j]
+            slots[extra] -= 1
+        return assigned
+
+    def _place(
+        self,
+        j: int,
+        x: np.ndarray,
+        assigned: np.ndarray,
+        remaining: np.ndarray,
+        slots: np.ndarray
+    ) -> bool:
+        """Assign task j if its requirements can be covered within max_assignees; updates the state."""
+        data = self.data
+        if self.req_counts[j] == 0 or data.pruned[j]:
+            return False
+        estimate = data.estimates[j]
+        candidates = np.flatnonzero(data.eligible[:, j] & (remaining >= estimate - 1e-9) & (slots > 0))
+        if len(candidates) == 0:
+            return False
+        holds = data.qualified[candidates][:, data.req_ptr[j]:data.req_ptr[j + 1]]
+        picked = x[self.class_of[candidates], j]
+        uncovered = np.ones(holds.shape[1], dtype=bool)
+        free = np.ones(len(candidates), dtype=bool)
+        chosen: List[int] = []
+        while uncovered.any():
+            if len(chosen) == data.max_assignees[j]:
+                return False
+            gain = np.where(free, holds[:, uncovered].sum(axis=1), -1)
+            if gain.max() <= 0:
+                return False
+            best = np.flatnonzero(gain == gain.max())
+            k = best[np.lexsort((
+                remaining[candidates[best]],
+                -self.values[candidates[best], j],
+                ~picked[best]
+            ))[0]]
+            chosen.append(k)
+            free[k] = False
+            uncovered &= ~holds[k]
+        # Further assignees the relaxation picked, while the task has room
+        for k in np.flatnonzero(free & picked):
+            if len(chosen) == data.max_assignees[j]:
+                break
+            chosen.append(k)
+        members = candidates[chosen]
+        assigned[members, j] = True
+        remaining[members] -= estimate
+        slots[members] -= 1
+        return True
+
+    def _meets_enforced(self, plan: np.ndarray) -> bool:
+        return bool(plan[:, self.enforced].any(axis=0).all())
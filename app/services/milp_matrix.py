@@ -0,0 +1,169 @@
+from typing import Set
+import numpy as np
+from scipy import sparse
+from app.services.planning_data import PlanningData
+
+
+class MatrixModel:
+    """The assignment MILP in standard form, assembled straight from PlanningData.
+
+    Columns are the x variables of ``data.eligible_pairs()`` in the same order
+    as the PuLP model, followed by one y (task planned) variable per task.
+    The objective is expressed for minimization. On aggregated data the x
+    variables count the class members taking a task.
+    """
+
+    def __init__(self, data: PlanningData, enforced: Set[int], feasibility_only: bool = False):
+        emp, task = np.nonzero(data.eligible)
+        num_pairs = len(emp)
+        num_tasks = data.num_tasks
+        num_employees = data.num_employees
+        self.pair_employee = emp
+        self.pair_task = task
+        self.num_pairs = num_pairs
+        self.num_variables = num_pairs + num_tasks
+
+        # Objective: maximize priority * completion -> minimize the negation
+        self.c = np.zeros(self.num_variables)
+        if not feasibility_only:
+            self.c[:num_pairs] = -data.pair_values()
+
+        pair_id = np.full(data.eligible.shape, -1, dtype=np.int64)
+        pair_id[emp, task] = np.arange(num_pairs)
+        y_col = num_pairs + np.arange(num_tasks)
+
+        blocks, lower, upper = [], [], []
+
+        # Capacity: sum_j est_j * x_ij <= capacity_i
+        blocks.append(sparse.csr_matrix(
+            (data.estimates[task], (emp, np.arange(num_pairs))),
+            shape=(num_employees, self.num_variables)
+        ))
+        lower.append(np.full(num_employees, -np.inf))
+        upper.append(data.capacities)
+
+        # Skill coverage: sum_{qualified i} x_ij - y_j >= 0 for every requirement;
+        # pruned tasks have no x columns, which forces y_j to 0
+        req, holder = np.nonzero((data.qualified & data.eligible[:, data.req_task]).T)
+        num_reqs = len(data.req_task)
+        rows = np.concatenate([req, np.arange(num_reqs)])
+        cols = np.concatenate([pair_id[holder, data.req_task[req]], y_col[data.req_task]])
+        vals = np.concatenate([np.ones(len(req)), -np.ones(num_reqs)])
+        blocks.append(sparse.csr_matrix(
+            (vals, (rows, cols)), shape=(num_reqs, self.num_variables)
+        ))
+        lower.append(np.zeros(num_reqs))
+        upper.append(np.full(num_reqs, np.inf))
+
+        # Max assignees, and only planned tasks get assignees:
+        # sum_i x_ij - max_assignees_j * y_j <= 0
+        rows = np.concatenate([task, np.arange(num_tasks)])
+        cols = np.concatenate([np.arange(num_pairs), y_col])
+        vals = np.concatenate([np.ones(num_pairs), -data.max_assignees.astype(float)])
+        blocks.append(sparse.csr_matrix(
+            (vals, (rows, cols)), shape=(num_tasks, self.num_variables)
+        ))
+        lower.append(np.full(num_tasks, -np.inf))
+        upper.append(np.zeros(num_tasks))
+
+        # Max parallel tasks per person (per class member on aggregated data)
+        blocks.append(sparse.csr_matrix(
+            (np.ones(num_pairs), (emp, np.arange(num_pairs))),
+            shape=(num_employees, self.num_variables)
+        ))
+        lower.append(np.full(num_employees, -np.inf))
+        upper.append(float(data.constraints.max_parallel_tasks_per_person) * data.multiplicity)
+
+        # Precedence on the transitively reduced dependency edges: y_j - y_p <= 0
+        live = ~data.pruned[data.dep_task]
+        dep_task, dep_prereq = data.dep_task[live], data.dep_prereq[live]
+        num_deps = len(dep_task)
+        blocks.append(sparse.csr_matrix(
+            (
+                np.concatenate([np.ones(num_deps), -np.ones(num_deps)]),
+                (np.tile(np.arange(num_deps), 2), np.concatenate([y_col[dep_task], y_col[dep_prereq]]))
+            ),
+            shape=(num_deps, self.num_variables)
+        ))
+        lower.append(np.full(num_deps, -np.inf))
+        upper.append(np.zeros(num_deps))
+
+        # Symmetry breaking: interchangeable employees a, b (in order) carry
+        # non-increasing load, sum_j est_j x_aj - sum_j est_j x_bj >= 0
+        sym = np.array(data.interchangeable_pairs(), dtype=int).reshape(-1, 2)
+        row_as_first = np.full(num_employees, -1)
+        row_as_first[sym[:, 0]] = np.arange(len(sym))
+        row_as_second = np.full(num_employees, -1)
+        row_as_second[sym[:, 1]] = np.arange(len(sym))
+        first = row_as_first[emp] >= 0
+        second = row_as_second[emp] >= 0
+        blocks.append(sparse.csr_matrix(
+            (
+                np.concatenate([data.estimates[task[first]], -data.estimates[task[second]]]),
+                (
+                    np.concatenate([row_as_first[emp[first]], row_as_second[emp[second]]]),
+                    np.concatenate([np.flatnonzero(first), np.flatnonzero(second)])
+                )
+            ),
+            shape=(len(sym), self.num_variables)
+        ))
+        lower.append(np.zeros(len(sym)))
+        upper.append(np.full(len(sym), np.inf))
+
+        self.A = sparse.vstack(blocks, format="csr")
+        self.row_lower = np.concatenate(lower)
+        self.row_upper = np.concatenate(upper)
+
+        # All variables are binary (x counts up to the class size on aggregated
+        # data); must-have tasks are fixed to planned
+        self.var_lower = np.zeros(self.num_variables)
+        self.var_upper = np.ones(self.num_variables)
+        self.var_upper[:num_pairs] = np.minimum(data.multiplicity[emp], data.max_assignees[task])
+        if enforced:
+            self.var_lower[num_pairs + np.fromiter(enforced, dtype=np.int64)] = 1
+        self.integrality = np.ones(self.num_variables, dtype=np.uint8)
+
+    def add_balance_stage(self, data: PlanningData, priority_floor: float) -> None:
+        """Turn the model into the peak-utilization stage of the balance objective.
+
+        Adds a continuous peak variable bounding every employee's utilization,
+        keeps the priority objective as a floor constraint and minimizes the peak.
+        """
+        num_employees = data.num_employees
+        priority = -self.c
+        peak_col = sparse.csr_matrix((self.A.shape[0], 1))
+        self.A = sparse.hstack([self.A, peak_col], format="csr")
+
+        # sum_j est_j / capacity_i * x_ij - peak <= 0
+        emp = self.pair_employee
+        util = sparse.csr_matrix(
+            (
+                np.concatenate([data.estimates[self.pair_task] / data.safe_capacities[emp], -np.ones(num_employees)]),
+                (
+                    np.concatenate([emp, np.arange(num_employees)]),
+                    np.concatenate([np.arange(self.num_pairs), np.full(num_employees, self.num_variables)])
+                )
+            ),
+            shape=(num_employees, self.num_variables + 1)
+        )
+        floor = sparse.csr_matrix(np.append(priority, 0.0)[None, :])
+        self.A = sparse.vstack([self.A, util, floor], format="csr")
+        self.row_lower = np.concatenate([self.row_lower, np.full(num_employees, -np.inf), [priority_floor]])
+        self.row_upper = np.concatenate([self.row_upper, np.zeros(num_employees), [np.inf]])
+
+        self.c = np.zeros(self.num_variables + 1)
+        self.c[-1] = 1.0
+        self.var_lower = np.append(self.var_lower, 0.0)
+        self.var_upper = np.append(self.var_upper, np.inf)
+        self.integrality = np.append(self.integrality, 0).astype(np.uint8)
+        self.num_variables += 1
+
+    @property
+    def num_constraints(self) -> int:
+        return self.A.shape[0]
+
+    def assignment_matrix(self, solution: np.ndarray, shape) -> np.ndarray:
+        """Turn a solution vector into an integer (employees x tasks) matrix of assignee counts."""
+        assigned = np.zeros(shape, dtype=int)
+        assigned[self.pair_employee, self.pair_task] = np.rint(solution[:self.num_pairs]).astype(int)
+        return assigned
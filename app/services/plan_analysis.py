@@ -0,0 +1,129 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.core.config import get_settings
+from app.core.logging import log_error, log_event
+from app.domain.enums import JobStatus
+from app.llm.base import LLMClient
+from app.schemas.plan_analysis import PlanAnalysis
+from app.schemas.planning_output import PlanResponse
+from app.services.estimator import TaskEstimator, model_name
+from app.utils.llm_cache import llm_cache
+
+settings = get_settings()
+
+
+def plan_summary(plan: PlanResponse) -> Dict[str, Any]:
+    """The parts of a plan the analysis prompt needs, in a compact form."""
+    return {
+        "sprint_id": plan.sprint_id,
+        "summary": plan.summary.model_dump(mode="json"),
+        "assignments": {
+            a.task_id: [assignee.employee_id for assignee in a.assignees] for a in plan.assignments
+        },
+        "unassigned": {u.task_id: u.reasons for u in plan.unassigned},
+        "utilization": {u.employee_id: u.utilization_pct for u in plan.utilization},
+        "conflicts": plan.conflicts
+    }
+
+
+class PlanAnalyses:
+    """LLM analyses of finished plans, run after the response was sent.
+
+    Starting an analysis only hashes the plan summary and schedules a task on
+    the current event loop, so planning latency does not change. At most
+    PLAN_ANALYSIS_CONCURRENCY analyses call the LLM at a time. The analysis id
+    is the hash of the plan summary, constraints and model: an identical plan
+    reuses the running or finished analysis, and finished analyses persist in
+    the LLM cache, so they survive restarts when LLM_CACHE_PATH is set.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, concurrency: Optional[int] = None):
+        self.max_entries = max_entries or settings.PLAN_ANALYSIS_MAX_ENTRIES
+        self.concurrency = concurrency or settings.PLAN_ANALYSIS_CONCURRENCY
+        self.client: Optional[LLMClient] = None  # fixed client; by default each analysis uses the configured model
+        self.analyses: "OrderedDict[str, PlanAnalysis]" = OrderedDict()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self, plan: PlanResponse, constraints: Dict[str, Any]) -> str:
+        """
+        Analyze a plan in the background of the current event loop.
+
+        Args:
+            plan: The finished plan
+            constraints: The planning constraints it was made under
+
+        Returns:
+            The analysis id, to be fetched with get or wait
+        """
+        params = {
+            "plan": plan_summary(plan),
+            "constraints": constraints,
+            "provider": settings.MODEL_PROVIDER,
+            "model": model_name(settings.MODEL_PROVIDER)
+        }
+        analysis_id = llm_cache.key_of("analyze_plan", params)
+        known = self.analyses.get(analysis_id)
+        if known is not None and known.status != JobStatus.FAILED:
+            self.analyses.move_to_end(analysis_id)
+            return analysis_id
+
+        cached = llm_cache.get("analyze_plan", params)
+        if cached is not None:
+            self._store(PlanAnalysis(analysis_id=analysis_id, status=JobStatus.COMPLETED, analysis=cached))
+            return analysis_id
+        analysis = PlanAnalysis(analysis_id=analysis_id, status=JobStatus.QUEUED)
+        self._store(analysis)
+        # Resolved together with the id, so the answer is stored under the model that gave it
+        client = self.client or TaskEstimator().llm_client
+        self._running[analysis_id] = asyncio.create_task(self._run(analysis, params, client))
+        return analysis_id
+
+    def get(self, analysis_id: str) -> Optional[PlanAnalysis]:
+        return self.analyses.get(analysis_id)
+
+    async def wait(self, analysis_id: str, timeout: Optional[float] = None) -> Optional[PlanAnalysis]:
+        """The analysis once it finished, or in its current state after the timeout."""
+        running = self._running.get(analysis_id)
+        if running is not None:
+            await asyncio.wait({running}, timeout=timeout)
+        return self.get(analysis_id)
+
+    def _store(self, analysis: PlanAnalysis) -> None:
+        self.analyses[analysis.analysis_id] = analysis
+        self.analyses.move_to_end(analysis.analysis_id)
+        while len(self.analyses) > self.max_entries:
+            oldest = next(iter(self.analyses))
+            if oldest in self._running:
+                break
+            del self.analyses[oldest]
+
+    def _limit(self) -> asyncio.Semaphore:
+        """The concurrency limit of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore, self._loop = asyncio.Semaphore(self.concurrency), loop
+        return self._semaphore
+
+    async def _run(self, analysis: PlanAnalysis, params: Dict[str, Any], client: LLMClient) -> None:
+        try:
+            async with self._limit():
+                analysis.status = JobStatus.RUNNING
+                text = await client.analyze_plan(params["plan"], params["constraints"])
+            llm_cache.set("analyze_plan", params, text)
+            analysis.analysis = text
+            analysis.status = JobStatus.COMPLETED
+            log_event("plan_analysis_completed", {
+                "analysis_id": analysis.analysis_id, "sprint_id": params["plan"]["sprint_id"]
+            })
+        except Exception as e:
+            analysis.status = JobStatus.FAILED
+            analysis.error = str(e)
+            log_error(e, {"analysis_id": analysis.analysis_id})
+        finally:
+            self._running.pop(analysis.analysis_id, None)
+
+
+plan_analyses = PlanAnalyses()
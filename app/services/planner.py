@@ -1,62 +1,140 @@
-from typing import Dict, List, Optional, Tuple
+import asyncio
+import time
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
 import pulp
+from app.domain.enums import Objective
 from app.domain.models import Employee, Task, Sprint
 from app.schemas.planning_input import PlanRequest, Constraints
 from app.schemas.planning_output import (
     PlanResponse, TaskAssignment, EmployeeAssignment,
     UnassignedTask, Utilization, PlanSummary
 )
+from app.core import profiling
 from app.core.logging import log_event, log_error
 from app.services.validator import PlanValidator
 from app.services.estimator import TaskEstimator
+from app.services.planning_data import PlanningData
+from app.services.diagnostics import PlanDiagnostics
+from app.services.capacity_calendar import CapacityCalendar
+from app.services.solvers import SolverBackend, SolveResult, select_backend
+from app.services.milp_matrix import MatrixModel
+from app.utils.plan_cache import plan_objectives
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# A fallback solve gets at least this many seconds, even when the first attempt used up the budget
+MIN_FALLBACK_SECONDS = 0.5
 
 class SprintPlanner:
-    def __init__(self):
+    def __init__(self, solver: Optional[SolverBackend] = None):
         self.validator = PlanValidator()
         self.estimator = TaskEstimator()
+        self.diagnostics = PlanDiagnostics()
+        self.calendar = CapacityCalendar()
+        # None = choose a backend per model from its size and deadline
+        self.solver = solver
 
     async def create_plan(self, request: PlanRequest) -> PlanResponse:
         """Create a sprint plan based on the request."""
         
         # Validate inputs
-        self.validator.validate_request(request)
+        with profiling.phase("validate"):
+            self.validator.validate_request(request)
         
         # Estimate any tasks without estimates
-        tasks = await self._ensure_task_estimates(request.tasks)
-        
-        # Create and solve the optimization problem
-        assignments = self._optimize_assignments(
-            tasks=tasks,
-            employees=request.employees,
+        with profiling.phase("estimate"):
+            tasks = await self._ensure_task_estimates(request.tasks)
+
+        plan = await self.plan_tasks(
             sprint=request.sprint,
-            constraints=request.constraints or Constraints()
-        )
-        
-        # Calculate utilization and unassigned tasks
-        utilization = self._calculate_utilization(
-            assignments=assignments,
             employees=request.employees,
-            sprint=request.sprint
-        )
-        
-        unassigned = self._get_unassigned_tasks(
-            assignments=assignments,
-            tasks=tasks
+            tasks=tasks,
+            constraints=request.constraints or Constraints()
         )
+        # Lets /plan/evaluate report how far an edited plan is from the optimum
+        plan_objectives.put(request, plan.objective)
+        return plan
+
+    async def plan_tasks(
+        self,
+        sprint: Sprint,
+        employees: List[Employee],
+        tasks: List[Task],
+        constraints: Constraints,
+        priorities: Optional[np.ndarray] = None
+    ) -> PlanResponse:
+        """
+        Plan validated, estimated tasks into one sprint.
+
+        Args:
+            sprint: The sprint to plan
+            employees: Employees; missing capacities are derived from the sprint calendar
+            tasks: Tasks, all with estimates
+            constraints: Planning constraints
+            priorities: Objective weight per task, in task order; defaults to the task priorities
+
+        Returns:
+            The sprint plan
+        """
+        # Derive capacities the client left out from the sprint calendar
+        with profiling.phase("capacity_calendar"):
+            employees = self.calendar.fill_capacities(sprint, employees)
         
-        # Create summary
-        summary = self._create_summary(
-            assignments=assignments,
-            unassigned=unassigned,
-            tasks=tasks
+        # Create and solve the optimization problem
+        with profiling.phase("planning_data"):
+            data = PlanningData(tasks, employees, constraints, priorities)
+        profiling.record_stats(
+            employees=data.num_employees,
+            employee_classes=len(data.employee_classes),
+            tasks=data.num_tasks,
+            requirements=len(data.req_task),
+            dependency_edges=data.dependency_edges,
+            reduced_dependency_edges=len(data.dep_task),
+            pruned_tasks=int(data.pruned.sum()),
+            eligible_pairs=int(data.eligible.sum()),
+            must_have=int(data.must_have.sum()),
+            objective=constraints.objective.value,
+            match_policy=constraints.match_policy.value
         )
+        # Solve off the event loop so concurrent requests keep being served
+        with profiling.phase("optimize"):
+            assigned, conflicts, gap = await asyncio.to_thread(
+                profiling.run_in_thread, self._optimize_assignments, data
+            )
+        with profiling.phase("diagnostics"):
+            assignments = self._convert_solution_to_assignments(assigned, data)
+
+            # Calculate utilization and unassigned tasks
+            utilization = self._calculate_utilization(
+                assignments=assignments,
+                employees=employees,
+                sprint=sprint
+            )
+
+            unassigned = self._get_unassigned_tasks(
+                assigned=assigned,
+                data=data,
+                conflicts=conflicts
+            )
+
+            # Create summary
+            summary = self._create_summary(
+                assignments=assignments,
+                unassigned=unassigned,
+                tasks=tasks
+            )
         
         return PlanResponse(
-            sprint_id=request.sprint.id,
+            sprint_id=sprint.id,
             assignments=assignments,
             unassigned=unassigned,
             utilization=utilization,
-            summary=summary
+            summary=summary,
+            conflicts=[f"must_have:{tasks[j].id}" for j in conflicts],
+            objective=data.objective_value(assigned),
+            optimality_gap=gap
         )
 
     async def _ensure_task_estimates(self, tasks: List[Task]) -> List[Task]:
@@ -65,105 +143,375 @@ class SprintPlanner:
 
     def _optimize_assignments(
         self,
-        tasks: List[Task],
-        employees: List[Employee],
-        sprint: Sprint,
-        constraints: Constraints
-    ) -> List[TaskAssignment]:
-        """Optimize task assignments using PuLP. Always report unassigned tasks if infeasible."""
-        # Create the optimization problem
-        prob = pulp.LpProblem("SprintPlanning", pulp.LpMaximize)
-        # Decision variables: x[i,j] = 1 if employee i is assigned to task j
-        x = pulp.LpVariable.dicts(
-            "assign",
-            ((e.id, t.id) for e in employees for t in tasks),
-            cat='Binary'
+        data: PlanningData
+    ) -> Tuple[np.ndarray, List[int], Optional[float]]:
+        """Optimize task assignments with the configured solver backend.
+
+        With Objective.BALANCE_UTILIZATION the priority optimum is found
+        first and then the peak utilization is minimized while keeping the
+        priority within constraints.balance_tolerance of that optimum.
+
+        Must-have tasks are hard constraints. If they cannot all be satisfied,
+        a minimal conflicting subset is located, relaxed and the model solved
+        again so the remaining tasks are still planned.
+
+        Returns:
+            Boolean assignment matrix (employees x tasks), the task indices
+            whose must-have constraint had to be relaxed and the proven
+            optimality gap when a decomposed backend planned it
+        """
+        relaxed: List[int] = []
+        if data.num_tasks == 0:
+            # Nothing to plan, e.g. a horizon sprint whose tasks all wait on dependencies
+            return np.zeros((data.num_employees, 0), dtype=bool), relaxed, None
+        enforced = set(np.flatnonzero(data.must_have).tolist())
+        while True:
+            result, assigned = self._solve_model(data, enforced)
+            if result.status != "Infeasible":
+                break
+            conflict = self.diagnostics.find_minimal_conflict(
+                data, sorted(enforced), self._is_feasible_with(data)
+            )
+            if not conflict:
+                return np.zeros((data.num_employees, data.num_tasks), dtype=bool), relaxed, None
+            log_event("plan_conflict", {
+                "must_have_tasks": [data.tasks[j].id for j in conflict]
+            })
+            relaxed.extend(conflict)
+            enforced -= set(conflict)
+        if assigned is None:
+            assigned = np.zeros((data.num_employees, data.num_tasks), dtype=bool)
+        return assigned, relaxed, result.gap
+
+    def _solve_model(
+        self,
+        data: PlanningData,
+        enforced: Set[int],
+        feasibility_only: bool = False
+    ) -> Tuple[SolveResult, Optional[np.ndarray]]:
+        """Build and solve the model with the configured or auto-selected backend.
+
+        Interchangeable employees (same team, capacity and skills) make the
+        model highly symmetric. They are first solved as one integer variable
+        per employee class and task, and the class counts are packed onto the
+        members. The aggregated model is a relaxation, so a successful packing
+        is optimal; when packing fails, the per-employee model is solved with
+        symmetry-breaking load ordering instead.
+
+        A decomposed backend (Lagrangian) plans the per-employee data
+        directly. If its repair cannot plan every enforced must-have task,
+        the model is solved exactly so conflicts are diagnosed as usual.
+
+        Fallback solves only get the part of the time limit the earlier
+        attempts left, so the request's deadline covers all of them.
+
+        Returns:
+            The solve result and the boolean assignment matrix, or None when
+            no solution was found
+        """
+        balance = (
+            not feasibility_only
+            and data.constraints.objective == Objective.BALANCE_UTILIZATION
         )
-        # Objective: Maximize priority * completion
-        prob += pulp.lpSum(
-            t.priority * x[e.id, t.id]
-            for e in employees
-            for t in tasks
+        time_limit = data.constraints.time_limit_seconds or settings.SOLVER_TIME_LIMIT
+        start = time.perf_counter()
+
+        def remaining() -> Optional[float]:
+            if time_limit is None:
+                return None
+            return max(time_limit - (time.perf_counter() - start), MIN_FALLBACK_SECONDS)
+
+        if not feasibility_only and not balance:
+            backend = self.solver or select_backend(int(data.eligible.sum()), time_limit)
+            if backend.decomposed:
+                result, assigned = backend.solve_data(data, enforced, time_limit)
+                if assigned is not None:
+                    return result, assigned
+                log_event("decomposition_fallback", {
+                    "backend": backend.name,
+                    "enforced_must_have": len(enforced)
+                })
+        # Peak utilization is per employee, so the balance objective cannot be aggregated
+        if settings.SOLVER_AGGREGATE_EMPLOYEES and not balance and data.has_interchangeable_employees:
+            result, counts = self._solve_view(data.aggregated(), enforced, feasibility_only, balance, remaining())
+            if counts is None:
+                return result, None
+            assigned = self._disaggregate(data, counts)
+            if assigned is not None:
+                return result, assigned
+            log_event("aggregation_fallback", {
+                "employees": data.num_employees,
+                "classes": len(data.employee_classes)
+            })
+        result, counts = self._solve_view(data, enforced, feasibility_only, balance, remaining())
+        return result, counts.astype(bool) if counts is not None else None
+
+    def _solve_view(
+        self,
+        data: PlanningData,
+        enforced: Set[int],
+        feasibility_only: bool,
+        balance: bool,
+        time_limit: Optional[float]
+    ) -> Tuple[SolveResult, Optional[np.ndarray]]:
+        """Solve the model of a per-employee or aggregated view within a time limit.
+
+        Returns:
+            The solve result and the matrix of assignee counts per
+            (employee or class, task), or None when no solution was found
+        """
+        backend = self.solver or select_backend(int(data.eligible.sum()), time_limit)
+        if backend.decomposed:
+            # Feasibility checks, balance stages and fallbacks need an exact solver
+            backend = select_backend(int(data.eligible.sum()), time_limit, exact=True)
+        if backend.direct:
+            model = MatrixModel(data, enforced, feasibility_only)
+            result, solution = backend.solve_model(model, time_limit=time_limit)
+            if solution is None:
+                return result, None
+            if balance:
+                # scipy cannot take a starting solution; the stage only gets its own budget
+                model.add_balance_stage(data, self._priority_floor(-model.c @ solution, data))
+                _, balanced = backend.solve_model(
+                    model, time_limit=self._balance_budget(result, time_limit)
+                )
+                if balanced is not None:
+                    solution = balanced
+            return result, model.assignment_matrix(solution, data.eligible.shape)
+
+        prob, x = self._build_problem(data, enforced, feasibility_only)
+        result = backend.solve(prob, time_limit=time_limit)
+        if result.status in ("Infeasible", "Not Solved"):
+            return result, None
+        assigned = self._solution_matrix(x, data)
+        if balance:
+            self._balance_utilization(prob, x, data, assigned)
+            stage2 = backend.solve(
+                prob, time_limit=self._balance_budget(result, time_limit), warm_start=True
+            )
+            if stage2.status not in ("Infeasible", "Not Solved", "Undefined"):
+                assigned = self._solution_matrix(x, data)
+        return result, assigned
+
+    @staticmethod
+    def _disaggregate(data: PlanningData, counts: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Pack per-class assignee counts onto individual class members.
+
+        Tasks are placed largest first, each on the members with the least
+        remaining capacity that still fits it (best-fit decreasing), and no
+        member takes the same task twice.
+
+        Args:
+            data: The per-employee planning data
+            counts: Assignee counts per (class, task) from the aggregated model
+
+        Returns:
+            Boolean assignment matrix, or None if the counts cannot be packed
+        """
+        assigned = np.zeros((data.num_employees, data.num_tasks), dtype=bool)
+        remaining = data.capacities.copy()
+        slots = np.full(data.num_employees, data.constraints.max_parallel_tasks_per_person)
+        for j in np.argsort(-data.estimates, kind="stable"):
+            for c in np.flatnonzero(counts[:, j]):
+                members = data.employee_classes[c]
+                fitting = members[(remaining[members] >= data.estimates[j] - 1e-9) & (slots[members] > 0)]
+                if len(fitting) < counts[c, j]:
+                    return None
+                chosen = fitting[np.argsort(remaining[fitting], kind="stable")[:counts[c, j]]]
+                assigned[chosen, j] = True
+                remaining[chosen] -= data.estimates[j]
+                slots[chosen] -= 1
+        return assigned
+
+    @staticmethod
+    def _priority_floor(best: float, data: PlanningData) -> float:
+        """Lowest priority value the balancing stage may trade down to."""
+        return best * (1 - data.constraints.balance_tolerance) - 1e-6
+
+    @staticmethod
+    def _balance_budget(stage1: SolveResult, time_limit: Optional[float]) -> float:
+        """Time budget for the balancing stage, relative to the first stage."""
+        budget = max(
+            settings.BALANCE_STAGE_MIN_SECONDS,
+            settings.BALANCE_STAGE_TIME_RATIO * stage1.seconds
         )
+        if time_limit is not None:
+            budget = min(budget, max(time_limit - stage1.seconds, 0.1))
+        return budget
+
+    def _balance_utilization(
+        self,
+        prob: pulp.LpProblem,
+        x: Dict,
+        data: PlanningData,
+        assigned: np.ndarray
+    ) -> None:
+        """Turn a solved priority model into the peak-utilization stage.
+
+        The priority objective becomes a floor constraint and a min-max
+        auxiliary variable bounds every employee's utilization. The stage 1
+        solution stays in the variables so the solver can warm-start from it.
+        """
+        best = pulp.value(prob.objective)
+        prob += (
+            pulp.lpSum(value * var for value, var in zip(data.pair_values(), x.values()))
+            >= self._priority_floor(best, data)
+        ), "priority_floor"
+
+        peak = pulp.LpVariable("peak_utilization", lowBound=0)
+        by_employee: Dict[int, List] = {}
+        capacities = data.safe_capacities
+        for (i, j), var in x.items():
+            by_employee.setdefault(i, []).append(data.estimates[j] / capacities[i] * var)
+        for i, terms in by_employee.items():
+            prob += pulp.lpSum(terms) <= peak
+        peak.setInitialValue(float(
+            ((assigned.astype(float) @ data.estimates) / capacities).max(initial=0.0)
+        ))
+
+        prob.sense = pulp.LpMinimize
+        prob.setObjective(peak)
+
+    def _build_problem(
+        self,
+        data: PlanningData,
+        enforced: Set[int],
+        feasibility_only: bool = False
+    ) -> Tuple[pulp.LpProblem, Dict]:
+        """Build the assignment model for the given set of enforced must-have tasks."""
+        prob = pulp.LpProblem("SprintPlanning", pulp.LpMaximize)
+        pairs = data.eligible_pairs()
+        # Decision variables: x[i,j] = 1 if employee i is assigned to task j;
+        # only skill-eligible pairs (non-zero fit under WEIGHTED) get a variable.
+        # On aggregated data x[i,j] counts the members of class i taking task j
+        if data.multiplicity.max(initial=1) > 1:
+            x = pulp.LpVariable.dicts("assign", pairs, lowBound=0, cat='Integer')
+            for (i, j), var in x.items():
+                var.upBound = int(min(data.multiplicity[i], data.max_assignees[j]))
+        else:
+            x = pulp.LpVariable.dicts("assign", pairs, cat='Binary')
+        # y[j] = 1 if task j is planned
+        y = pulp.LpVariable.dicts("task", range(data.num_tasks), cat='Binary')
+        # Objective: Maximize priority * completion (scaled by skill fit under WEIGHTED)
+        if feasibility_only:
+            prob += pulp.lpSum([])
+        else:
+            prob += pulp.lpSum(
+                value * x[pair] for value, pair in zip(data.pair_values(), pairs)
+            )
         # Constraints
-        self._add_capacity_constraints(prob, x, tasks, employees, sprint)
-        self._add_skill_constraints(prob, x, tasks, employees, constraints)
-        self._add_assignment_constraints(prob, x, tasks, employees, constraints)
-        # Solve
-        prob.solve()
-        # If infeasible, return no assignments (all tasks will be unassigned)
-        if pulp.LpStatus[prob.status] == "Infeasible":
-            return []
-        # Convert solution to assignments
-        return self._convert_solution_to_assignments(x, tasks, employees)
+        self._add_capacity_constraints(prob, x, data)
+        self._add_skill_constraints(prob, x, y, data)
+        self._add_assignment_constraints(prob, x, y, data, enforced)
+        self._add_dependency_constraints(prob, y, data)
+        self._add_symmetry_constraints(prob, x, data)
+        return prob, x
+
+    def _is_feasible_with(self, data: PlanningData):
+        """Feasibility oracle used by the conflict search."""
+        def is_feasible(enforced: Set[int]) -> bool:
+            result, _ = self._solve_model(data, enforced, feasibility_only=True)
+            return result.status != "Infeasible"
+        return is_feasible
 
     def _add_capacity_constraints(
         self,
         prob: pulp.LpProblem,
         x: Dict,
-        tasks: List[Task],
-        employees: List[Employee],
-        sprint: Sprint
+        data: PlanningData
     ) -> None:
         """Add capacity constraints to the optimization problem."""
-        for e in employees:
-            prob += pulp.lpSum(
-                t.estimate.value * x[e.id, t.id]
-                for t in tasks
-                if t.estimate
-            ) <= e.capacity.available
+        by_employee: Dict[int, List] = {}
+        for (i, j), var in x.items():
+            by_employee.setdefault(i, []).append(data.estimates[j] * var)
+        for i, terms in by_employee.items():
+            prob += pulp.lpSum(terms) <= data.capacities[i]
 
     def _add_skill_constraints(
         self,
         prob: pulp.LpProblem,
         x: Dict,
-        tasks: List[Task],
-        employees: List[Employee],
-        constraints: Constraints
+        y: Dict,
+        data: PlanningData
     ) -> None:
-        """Add skill matching constraints."""
-        for t in tasks:
-            for skill_req in t.required_skills:
-                prob += pulp.lpSum(
-                    x[e.id, t.id]
-                    for e in employees
-                    if any(
-                        s.name == skill_req.name and 
-                        s.level >= skill_req.min_level - constraints.min_skill_level_match
-                        for s in e.skills
-                    )
-                ) >= 1
+        """Add skill matching constraints: a planned task covers every required skill."""
+        for r, j in enumerate(data.req_task):
+            # Pruned tasks have no variables, which forces y[j] to 0
+            holders = np.flatnonzero(data.qualified[:, r] & data.eligible[:, j])
+            prob += pulp.lpSum(x[i, j] for i in holders) >= y[j]
 
     def _add_assignment_constraints(
         self,
         prob: pulp.LpProblem,
         x: Dict,
-        tasks: List[Task],
-        employees: List[Employee],
-        constraints: Constraints
+        y: Dict,
+        data: PlanningData,
+        enforced: Set[int]
     ) -> None:
         """Add assignment constraints."""
-        # Max assignees per task
-        for t in tasks:
-            prob += pulp.lpSum(x[e.id, t.id] for e in employees) <= t.max_assignees
-        
-        # Max parallel tasks per person
-        for e in employees:
-            prob += pulp.lpSum(x[e.id, t.id] for t in tasks) <= constraints.max_parallel_tasks_per_person
+        by_task: Dict[int, List] = {}
+        by_employee: Dict[int, List] = {}
+        for (i, j), var in x.items():
+            by_task.setdefault(j, []).append(var)
+            by_employee.setdefault(i, []).append(var)
 
-    def _convert_solution_to_assignments(
+        # Max assignees per task, and only planned tasks get assignees
+        for j in range(data.num_tasks):
+            prob += pulp.lpSum(by_task.get(j, [])) <= int(data.max_assignees[j]) * y[j]
+
+        # Must-have tasks have to be planned
+        for j in enforced:
+            prob += y[j] == 1
+
+        # Max parallel tasks per person (per class member on aggregated data)
+        limit = data.constraints.max_parallel_tasks_per_person
+        for i, terms in by_employee.items():
+            prob += pulp.lpSum(terms) <= limit * int(data.multiplicity[i])
+
+    def _add_dependency_constraints(
+        self,
+        prob: pulp.LpProblem,
+        y: Dict,
+        data: PlanningData
+    ) -> None:
+        """A task is planned only if its prerequisites are (transitively reduced edges)."""
+        for j, p in zip(data.dep_task.tolist(), data.dep_prereq.tolist()):
+            if not data.pruned[j]:
+                prob += y[j] <= y[p]
+
+    def _add_symmetry_constraints(
         self,
+        prob: pulp.LpProblem,
         x: Dict,
-        tasks: List[Task],
-        employees: List[Employee]
+        data: PlanningData
+    ) -> None:
+        """Order interchangeable employees by load so permuted plans are cut off."""
+        loads: Dict[int, List] = {}
+        for (i, j), var in x.items():
+            loads.setdefault(i, []).append(data.estimates[j] * var)
+        for a, b in data.interchangeable_pairs():
+            prob += pulp.lpSum(loads.get(a, [])) >= pulp.lpSum(loads.get(b, []))
+
+    @staticmethod
+    def _solution_matrix(x: Dict, data: PlanningData) -> np.ndarray:
+        """Read the solved variables into a matrix of assignee counts."""
+        assigned = np.zeros((data.num_employees, data.num_tasks), dtype=int)
+        for (i, j), var in x.items():
+            value = var.value()
+            if value is not None:
+                assigned[i, j] = int(round(value))
+        return assigned
+
+    def _convert_solution_to_assignments(
+        self,
+        assigned: np.ndarray,
+        data: PlanningData
     ) -> List[TaskAssignment]:
         """Convert optimization solution to TaskAssignments."""
         assignments = []
-        for t in tasks:
-            assignees = []
-            for e in employees:
-                if pulp.value(x[e.id, t.id]) == 1:
-                    assignees.append(e)
+        for j, t in enumerate(data.tasks):
+            assignees = [data.employees[i] for i in np.flatnonzero(assigned[:, j])]
             num_assignees = len(assignees)
             if num_assignees > 0:
                 split_effort = t.estimate.value / num_assignees if num_assignees else 0.0
@@ -215,24 +563,12 @@ class SprintPlanner:
 
     def _get_unassigned_tasks(
         self,
-        assignments: List[TaskAssignment],
-        tasks: List[Task]
+        assigned: np.ndarray,
+        data: PlanningData,
+        conflicts: List[int]
     ) -> List[UnassignedTask]:
-        """Get list of unassigned tasks with reasons."""
-        assigned_ids = {a.task_id for a in assignments}
-        unassigned = []
-        for t in tasks:
-            if t.id not in assigned_ids:
-                # Simple reasons for now - expand based on constraint analysis
-                reasons = ["Insufficient capacity or skill match"]
-                if t.dependencies:
-                    reasons.append("Has dependencies")
-                unassigned.append(UnassignedTask(
-                    task_id=t.id,
-                    reasons=reasons,
-                    blocking_dependencies=t.dependencies
-                ))
-        return unassigned
+        """Get list of unassigned tasks with classified reasons."""
+        return self.diagnostics.classify_unassigned(data, assigned, conflicts)
 
     def _create_summary(
         self,
@@ -0,0 +1,282 @@
+import copy
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.domain.enums import MatchPolicy
+from app.domain.models import Employee, Task
+from app.schemas.planning_input import Constraints
+from app.services.validator import PlanInputError
+from app.utils.skills import weighted_skill_match
+
+# LEVEL_DIFF_SCORES[d] = weighted match score when the required level exceeds
+# the held level by d (d <= 0 is a full match); levels are 1-5
+LEVEL_DIFF_SCORES = np.array([weighted_skill_match(1 + d, 1, "weighted") for d in range(5)])
+
+
+class PlanningData:
+    """Compact, index-based view of a planning request.
+
+    Employees and tasks are addressed by their position in the input lists so
+    the optimizer, the diagnostics stage and the matrix backends can share the
+    same precomputed arrays instead of rescanning the pydantic models.
+    """
+
+    def __init__(
+        self,
+        tasks: List[Task],
+        employees: List[Employee],
+        constraints: Constraints,
+        priorities: Optional[np.ndarray] = None
+    ):
+        self.tasks = tasks
+        self.employees = employees
+        self.constraints = constraints
+
+        self.task_index: Dict[str, int] = {t.id: j for j, t in enumerate(tasks)}
+        self.employee_index: Dict[str, int] = {e.id: i for i, e in enumerate(employees)}
+
+        self.estimates = np.array(
+            [t.estimate.value if t.estimate else 0.0 for t in tasks], dtype=float
+        )
+        # Objective weight per task; callers may pass adjusted weights (e.g. horizon look-ahead)
+        self.priorities = (
+            np.array([t.priority for t in tasks], dtype=float)
+            if priorities is None else np.asarray(priorities, dtype=float)
+        )
+        self.max_assignees = np.array([t.max_assignees for t in tasks], dtype=int)
+        self.must_have = np.array([t.must_have for t in tasks], dtype=bool)
+        self.capacities = np.array(
+            [e.capacity.available for e in employees], dtype=float
+        )
+
+        self._build_skill_arrays()
+        self._build_dependency_arrays()
+        self._build_employee_classes()
+
+    def _build_skill_arrays(self) -> None:
+        """Intern skill names and precompute the qualification/eligibility masks."""
+        skill_ids: Dict[str, int] = {}
+        for e in self.employees:
+            for s in e.skills:
+                skill_ids.setdefault(s.name, len(skill_ids))
+        for t in self.tasks:
+            for r in t.required_skills:
+                skill_ids.setdefault(r.name, len(skill_ids))
+        self.skill_ids = skill_ids
+
+        # levels[i, s] = level of employee i in skill s (0 = does not have it)
+        self.levels = np.zeros((len(self.employees), len(skill_ids)), dtype=int)
+        for i, e in enumerate(self.employees):
+            for s in e.skills:
+                self.levels[i, skill_ids[s.name]] = max(self.levels[i, skill_ids[s.name]], s.level)
+
+        # One row per (task, skill requirement)
+        req_task, req_skill, req_level = [], [], []
+        for j, t in enumerate(self.tasks):
+            for r in t.required_skills:
+                req_task.append(j)
+                req_skill.append(skill_ids[r.name])
+                req_level.append(r.min_level)
+        self.req_task = np.array(req_task, dtype=int)
+        self.req_skill = np.array(req_skill, dtype=int)
+        self.req_level = np.array(req_level, dtype=int)
+        # Requirement rows are contiguous per task: rows of task j are req_ptr[j]:req_ptr[j + 1]
+        self.req_ptr = np.zeros(len(self.tasks) + 1, dtype=int)
+        np.cumsum(np.bincount(self.req_task, minlength=len(self.tasks)), out=self.req_ptr[1:])
+
+        # qualified[i, r] = employee i satisfies requirement r
+        held = self.levels[:, self.req_skill]
+        threshold = self.req_level - self.constraints.min_skill_level_match
+        # fit[i, j] = mean weighted match of employee i over task j's requirements;
+        # only computed for MatchPolicy.WEIGHTED, threshold mode weighs all pairs 1
+        self.fit: Optional[np.ndarray] = None
+        if self.constraints.match_policy == MatchPolicy.WEIGHTED:
+            gap = np.clip(threshold[None, :] - held, 0, len(LEVEL_DIFF_SCORES) - 1)
+            scores = np.where(held > 0, LEVEL_DIFF_SCORES[gap], 0.0)
+            self.qualified = scores > 0
+        else:
+            self.qualified = (held > 0) & (held >= threshold)
+
+        # eligible[i, j] = employee i satisfies at least one requirement of task j
+        self.eligible = np.zeros((len(self.employees), len(self.tasks)), dtype=bool)
+        counts = np.diff(self.req_ptr)
+        has_reqs = np.flatnonzero(counts > 0)
+        if len(has_reqs):
+            self.eligible[:, has_reqs] = np.logical_or.reduceat(
+                self.qualified, self.req_ptr[has_reqs], axis=1
+            )
+        if self.constraints.match_policy == MatchPolicy.WEIGHTED:
+            self.fit = np.zeros(self.eligible.shape)
+            if len(has_reqs):
+                self.fit[:, has_reqs] = (
+                    np.add.reduceat(scores, self.req_ptr[has_reqs], axis=1) / counts[has_reqs]
+                )
+
+    def _build_dependency_arrays(self) -> None:
+        """Reduce the dependency DAG transitively and prune tasks that can never be planned.
+
+        Only prerequisites that are part of this request become model edges;
+        other dependencies are already done (completed earlier, or planned in
+        an earlier sprint). An edge j -> p is dropped when p is also reachable
+        through another prerequisite of j, since the chain through that
+        prerequisite implies it, so the model gets one precedence constraint
+        per edge of the transitive reduction.
+
+        A task is pruned (its variables are removed) when it or any of its
+        ancestors has a requirement nobody can take on, or when the task plus
+        all its ancestors exceed the team's total hours or parallel slots.
+        """
+        n = len(self.tasks)
+        prereqs = [
+            list(dict.fromkeys(self.task_index[d] for d in t.dependencies if d in self.task_index))
+            for t in self.tasks
+        ]
+        # Kahn's algorithm: prerequisites before dependents
+        pending = np.array([len(p) for p in prereqs])
+        dependents: List[List[int]] = [[] for _ in range(n)]
+        for j, ps in enumerate(prereqs):
+            for p in ps:
+                dependents[p].append(j)
+        order = [j for j in range(n) if pending[j] == 0]
+        for j in order:
+            for d in dependents[j]:
+                pending[d] -= 1
+                if pending[d] == 0:
+                    order.append(d)
+        if len(order) < n:
+            raise PlanInputError("Dependency cycle detected")
+
+        # ancestors[j] = bitset of every task j transitively depends on
+        ancestors = [0] * n
+        dep_task, dep_prereq = [], []
+        for j in order:
+            reach = 0
+            for p in prereqs[j]:
+                reach |= ancestors[p]
+            for p in prereqs[j]:
+                if not (reach >> p) & 1:
+                    dep_task.append(j)
+                    dep_prereq.append(p)
+            for p in prereqs[j]:
+                reach |= 1 << p
+            ancestors[j] = reach
+        self.dependency_edges = sum(len(p) for p in prereqs)
+        self.dep_task = np.array(dep_task, dtype=int)
+        self.dep_prereq = np.array(dep_prereq, dtype=int)
+
+        # Tasks with a requirement no qualified employee has the capacity for
+        req_estimates = self.estimates[self.req_task]
+        req_fits = (self.qualified & (self.capacities[:, None] >= req_estimates[None, :])).any(axis=0)
+        placeable = np.ones(n, dtype=bool)
+        counts = np.diff(self.req_ptr)
+        has_reqs = np.flatnonzero(counts > 0)
+        if len(has_reqs):
+            placeable[has_reqs] = np.logical_and.reduceat(req_fits, self.req_ptr[has_reqs])
+        unplaceable = 0
+        for j in np.flatnonzero(~placeable).tolist():
+            unplaceable |= 1 << j
+
+        total_hours = self.capacities.sum()
+        total_slots = len(self.employees) * self.constraints.max_parallel_tasks_per_person
+        num_bytes = (n + 7) // 8
+        self.pruned = ~placeable
+        for j in range(n):
+            if not ancestors[j] or self.pruned[j]:
+                continue
+            if ancestors[j] & unplaceable:
+                self.pruned[j] = True
+                continue
+            chain = np.unpackbits(
+                np.frombuffer(ancestors[j].to_bytes(num_bytes, "little"), dtype=np.uint8),
+                bitorder="little"
+            )[:n].astype(bool)
+            if (
+                self.estimates[j] + self.estimates[chain].sum() > total_hours
+                or chain.sum() + 1 > total_slots
+            ):
+                self.pruned[j] = True
+        self.eligible[:, self.pruned] = False
+        if self.fit is not None:
+            self.fit[:, self.pruned] = 0.0
+
+    def _build_employee_classes(self) -> None:
+        """Group interchangeable employees: same team, capacity and skill levels."""
+        signatures: Dict[tuple, List[int]] = {}
+        for i, e in enumerate(self.employees):
+            key = (e.team_id, float(self.capacities[i]), self.levels[i].tobytes())
+            signatures.setdefault(key, []).append(i)
+        self.employee_classes = [np.array(members, dtype=int) for members in signatures.values()]
+        # Employees each model employee row stands for; > 1 only in aggregated() data
+        self.multiplicity = np.ones(len(self.employees), dtype=int)
+
+    @property
+    def has_interchangeable_employees(self) -> bool:
+        return len(self.employee_classes) < len(self.employees)
+
+    def interchangeable_pairs(self) -> List[Tuple[int, int]]:
+        """Consecutive (employee, employee) members of every class, for symmetry breaking."""
+        return [
+            (int(a), int(b))
+            for members in self.employee_classes
+            for a, b in zip(members[:-1], members[1:])
+        ]
+
+    def aggregated(self) -> "PlanningData":
+        """
+        View with one row per employee class instead of per employee.
+
+        A class row holds the class's summed capacity and has
+        ``multiplicity`` = class size, so the models give it integer
+        assignment variables (how many members take a task) and scale its
+        parallel-task limit. Task-level arrays are shared with this view.
+        """
+        representatives = np.array([members[0] for members in self.employee_classes], dtype=int)
+        sizes = np.array([len(members) for members in self.employee_classes], dtype=int)
+        view = copy.copy(self)
+        view.employees = [self.employees[i] for i in representatives]
+        view.employee_index = {e.id: k for k, e in enumerate(view.employees)}
+        view.capacities = self.capacities[representatives] * sizes
+        view.levels = self.levels[representatives]
+        view.qualified = self.qualified[representatives]
+        view.eligible = self.eligible[representatives]
+        view.fit = self.fit[representatives] if self.fit is not None else None
+        view.employee_classes = [np.array([k]) for k in range(len(representatives))]
+        view.multiplicity = sizes
+        return view
+
+    @property
+    def safe_capacities(self) -> np.ndarray:
+        """Capacities usable as divisors; zero-capacity employees can take no work anyway."""
+        return np.where(self.capacities > 0, self.capacities, 1.0)
+
+    @property
+    def num_tasks(self) -> int:
+        return len(self.tasks)
+
+    @property
+    def num_employees(self) -> int:
+        return len(self.employees)
+
+    def requirements_of(self, j: int) -> np.ndarray:
+        """Indices of the requirement rows belonging to task j."""
+        return np.arange(self.req_ptr[j], self.req_ptr[j + 1])
+
+    def pair_values(self) -> np.ndarray:
+        """Objective coefficient of every eligible pair, in eligible_pairs() order.
+
+        Priority, scaled by the skill fit under MatchPolicy.WEIGHTED so better
+        matched assignments are preferred.
+        """
+        emp, task = np.nonzero(self.eligible)
+        if self.fit is None:
+            return self.priorities[task]
+        return self.priorities[task] * self.fit[emp, task]
+
+    def objective_value(self, assigned: np.ndarray) -> float:
+        """Objective of a boolean assignment matrix, as the optimizer scores it."""
+        values = self.priorities[None, :] * (self.fit if self.fit is not None else 1.0)
+        return float(np.where(assigned & self.eligible, values, 0.0).sum())
+
+    def eligible_pairs(self) -> List[Tuple[int, int]]:
+        """(employee, task) index pairs that get a decision variable."""
+        rows, cols = np.nonzero(self.eligible)
+        return list(zip(rows.tolist(), cols.tolist()))
@@ -0,0 +1,117 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+from app.core.config import get_settings
+from app.core.logging import log_error, log_event
+from app.domain.enums import JobStatus
+from app.domain.models import Task
+from app.schemas.estimation import PreEstimateJob
+from app.services.estimate_model import estimate_model
+from app.services.estimator import TaskEstimator
+from app.utils.llm_cache import llm_cache
+
+settings = get_settings()
+
+
+class PreEstimator:
+    """Warms the estimate cache behind TaskEstimator for a whole backlog.
+
+    Only tasks without a cached estimate are sent to the LLM. The cache key
+    covers description, skills, provider and model, so a task is re-estimated
+    exactly when one of those changed. Batches run with bounded concurrency
+    and the job's counters are updated as each batch finishes.
+    """
+
+    def __init__(self, estimator: Optional[TaskEstimator] = None, concurrency: Optional[int] = None):
+        self.estimator = estimator or TaskEstimator()
+        self.concurrency = concurrency or settings.PREESTIMATE_CONCURRENCY
+
+    async def run(
+        self,
+        tasks: List[Task],
+        job: PreEstimateJob,
+        on_progress: Optional[Callable[[PreEstimateJob], None]] = None
+    ) -> PreEstimateJob:
+        """
+        Estimate every uncached task of a backlog into the cache.
+
+        Args:
+            tasks: Backlog tasks; tasks that already carry an estimate are skipped
+            job: Progress counters, updated in place
+            on_progress: Called after every finished batch
+
+        Returns:
+            The completed job
+        """
+        job.status = JobStatus.RUNNING
+        pending: Dict[str, List[Task]] = {}
+        local = estimate_model.predict([t for t in tasks if t.estimate is None])
+        for task in tasks:
+            # Planning answers these without the LLM: explicit or confident local estimates
+            if task.estimate is not None or task.id in local:
+                job.skipped += 1
+                continue
+            cache_key_params = self.estimator.cache_key_params(task)
+            if llm_cache.get("estimate_task", cache_key_params):
+                job.cached += 1
+                continue
+            # Tasks with the same description and skills share one estimate
+            pending.setdefault(llm_cache.key_of("estimate_task", cache_key_params), []).append(task)
+
+        todo = list(pending.values())
+        size = settings.LLM_BATCH_MAX_TASKS
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def estimate(groups: List[List[Task]]) -> None:
+            async with semaphore:
+                await self.estimator.estimate_tasks([group[0] for group in groups])
+            for group in groups:
+                if llm_cache.get("estimate_task", self.estimator.cache_key_params(group[0])):
+                    job.estimated += len(group)
+                else:
+                    job.failed += len(group)
+            if on_progress:
+                on_progress(job)
+
+        await asyncio.gather(*(estimate(todo[k:k + size]) for k in range(0, len(todo), size)))
+        job.status = JobStatus.COMPLETED
+        log_event("pre_estimation_completed", job.model_dump())
+        return job
+
+
+class PreEstimationJobs:
+    """Registry of background pre-estimation jobs, keeping the most recent ones."""
+
+    def __init__(self, max_jobs: Optional[int] = None):
+        self.max_jobs = max_jobs or settings.PREESTIMATE_MAX_JOBS
+        self.jobs: "OrderedDict[str, PreEstimateJob]" = OrderedDict()
+        self._running: Dict[str, asyncio.Task] = {}
+
+    def start(self, tasks: List[Task]) -> PreEstimateJob:
+        """Create a job and run it in the background of the current event loop."""
+        job = PreEstimateJob(job_id=uuid.uuid4().hex, status=JobStatus.QUEUED, total=len(tasks))
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > self.max_jobs:
+            oldest = next(iter(self.jobs))
+            if oldest in self._running:
+                break
+            del self.jobs[oldest]
+        self._running[job.job_id] = asyncio.create_task(self._run(job, tasks))
+        return job
+
+    def get(self, job_id: str) -> Optional[PreEstimateJob]:
+        return self.jobs.get(job_id)
+
+    async def _run(self, job: PreEstimateJob, tasks: List[Task]) -> None:
+        try:
+            await PreEstimator().run(tasks, job)
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+            log_error(e, {"job_id": job.job_id, "tasks": job.total})
+        finally:
+            self._running.pop(job.job_id, None)
+
+
+pre_estimation_jobs = PreEstimationJobs()
@@ -0,0 +1,358 @@
+import logging
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple, Type
+import numpy as np
+import pulp
+from app.core import profiling
+from app.core.config import get_settings
+from app.core.logging import log_event
+from app.services.lagrangian import LagrangianSolver
+from app.services.milp_matrix import MatrixModel
+from app.services.planning_data import PlanningData
+
+settings = get_settings()
+solver_logger = logging.getLogger("solver")
+
+# Up to this many binaries the in-process scipy/HiGHS path wins: model
+# building and the CBC subprocess dominate (see docs/solver_benchmarks.md).
+SMALL_MODEL_VARIABLES = 2000
+# Relative optimality gap accepted for large models solved under a deadline
+DEADLINE_GAP_REL = 0.01
+
+
+class SolveResult:
+    """Outcome of one solver run."""
+
+    def __init__(
+        self,
+        backend: str,
+        status: str,
+        seconds: float,
+        log: str = "",
+        gap: Optional[float] = None
+    ):
+        self.backend = backend
+        self.status = status
+        self.seconds = seconds
+        self.log = log
+        # Proven relative optimality gap, reported by backends that bound their plans
+        self.gap = gap
+
+
+class SolverBackend(ABC):
+    """Base class for MILP solver backends used by the planner."""
+
+    name: str = ""
+    # Direct backends solve a MatrixModel instead of a PuLP problem
+    direct: bool = False
+    # Decomposed backends solve PlanningData heuristically with a bound; exact backends remain needed
+    decomposed: bool = False
+
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        options: Optional[List[str]] = None,
+        gap_rel: Optional[float] = None
+    ):
+        self.threads = threads
+        self.options = options or []
+        self.gap_rel = gap_rel
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the backend can run in this environment."""
+        return True
+
+    @property
+    def description(self) -> str:
+        return f"{self.name}(threads={self.threads or 'default'})"
+
+    def _log_run(self, result: "SolveResult", variables: int, constraints: int) -> None:
+        for line in result.log.splitlines():
+            if line.strip():
+                solver_logger.debug(line)
+        profiling.record_solver_run(
+            backend=self.name,
+            description=self.description,
+            status=result.status,
+            seconds=result.seconds,
+            variables=variables,
+            constraints=constraints,
+            log=result.log
+        )
+        log_event("solver_run", {
+            "backend": self.description,
+            "status": result.status,
+            "seconds": round(result.seconds, 4),
+            "variables": variables,
+            "constraints": constraints
+        })
+
+
+class PulpBackend(SolverBackend):
+    """Backend solving a PuLP problem through one of PuLP's solver interfaces."""
+
+    def solve(
+        self,
+        prob: pulp.LpProblem,
+        time_limit: Optional[float] = None,
+        warm_start: bool = False
+    ) -> SolveResult:
+        """
+        Solve a PuLP problem in place, routing the solver log to our logger.
+
+        Args:
+            prob: The problem to solve; variable values are set on success
+            time_limit: Optional wall-clock limit in seconds
+            warm_start: Use the current variable values as a starting solution
+
+        Returns:
+            SolveResult with the PuLP status string and the captured log
+        """
+        fd, log_path = tempfile.mkstemp(prefix="solver_", suffix=".log")
+        os.close(fd)
+        start = time.perf_counter()
+        try:
+            prob.solve(self._make_solver(log_path, time_limit, warm_start))
+            seconds = time.perf_counter() - start
+            with open(log_path, errors="replace") as f:
+                log = f.read()
+        finally:
+            os.remove(log_path)
+
+        result = SolveResult(self.name, pulp.LpStatus[prob.status], seconds, log)
+        self._log_run(result, prob.numVariables(), prob.numConstraints())
+        return result
+
+    @abstractmethod
+    def _make_solver(
+        self,
+        log_path: str,
+        time_limit: Optional[float],
+        warm_start: bool
+    ) -> pulp.LpSolver:
+        """Create the configured PuLP solver command writing its log to log_path."""
+        pass
+
+
+class CbcBackend(PulpBackend):
+    """COIN-OR CBC bundled with PuLP, with configurable threads and options."""
+
+    name = "cbc"
+
+    @classmethod
+    def available(cls) -> bool:
+        return pulp.PULP_CBC_CMD(msg=False).available()
+
+    def _make_solver(self, log_path, time_limit, warm_start):
+        return pulp.PULP_CBC_CMD(
+            msg=False,
+            logPath=log_path,
+            timeLimit=time_limit,
+            threads=self.threads,
+            gapRel=self.gap_rel,
+            options=self.options,
+            warmStart=warm_start
+        )
+
+
+class HighsBackend(PulpBackend):
+    """HiGHS through its Python bindings (highspy), when installed."""
+
+    name = "highs"
+
+    @classmethod
+    def available(cls) -> bool:
+        return pulp.HiGHS().available()
+
+    def _make_solver(self, log_path, time_limit, warm_start):
+        # Options are "key=value" strings, mirroring the CBC option list
+        params = dict(option.split("=", 1) for option in self.options)
+        return pulp.HiGHS(
+            msg=True,
+            timeLimit=time_limit,
+            threads=self.threads,
+            gapRel=self.gap_rel,
+            log_to_console=False,
+            log_file=log_path,
+            **params
+        )
+
+
+class ScipyMilpBackend(SolverBackend):
+    """In-process HiGHS through scipy.optimize.milp on CSR matrices.
+
+    Skips PuLP expression building, temporary model files and the solver
+    subprocess entirely. scipy does not expose the HiGHS log, so only the
+    run summary is logged.
+    """
+
+    name = "scipy"
+    direct = True
+
+    # scipy.optimize.milp status codes -> PuLP status strings
+    STATUS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded", 4: "Undefined"}
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            from scipy.optimize import milp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def solve_model(
+        self,
+        model: MatrixModel,
+        time_limit: Optional[float] = None
+    ) -> Tuple[SolveResult, Optional[np.ndarray]]:
+        """
+        Solve a MatrixModel.
+
+        Args:
+            model: The assembled model
+            time_limit: Optional wall-clock limit in seconds
+
+        Returns:
+            SolveResult and the solution vector, or None if no solution was found
+        """
+        from scipy.optimize import Bounds, LinearConstraint, milp
+
+        options = {"disp": False}
+        if time_limit is not None:
+            options["time_limit"] = time_limit
+        if self.gap_rel is not None:
+            options["mip_rel_gap"] = self.gap_rel
+        start = time.perf_counter()
+        res = milp(
+            c=model.c,
+            constraints=LinearConstraint(model.A, model.row_lower, model.row_upper),
+            integrality=model.integrality,
+            bounds=Bounds(model.var_lower, model.var_upper),
+            options=options
+        )
+        seconds = time.perf_counter() - start
+
+        status = self.STATUS.get(res.status, "Undefined")
+        if res.status == 1 and res.x is not None:
+            # Time limit reached with an incumbent, as PuLP reports it
+            status = "Optimal"
+        result = SolveResult(self.name, status, seconds, res.message)
+        self._log_run(result, model.num_variables, model.num_constraints)
+        return result, res.x
+
+
+class LagrangianBackend(SolverBackend):
+    """Lagrangian decomposition with subgradient multipliers and a repair heuristic.
+
+    Not an exact MILP solver: it returns the best repaired plan found within
+    the time limit together with its proven gap to the dual bound. Meant for
+    organisation-wide models too large to solve exactly. Feasibility checks
+    and balance stages still use an exact backend.
+    """
+
+    name = "lagrangian"
+    decomposed = True
+
+    def solve_data(
+        self,
+        data: PlanningData,
+        enforced: Set[int],
+        time_limit: Optional[float] = None
+    ) -> Tuple[SolveResult, Optional[np.ndarray]]:
+        """
+        Plan the model of a PlanningData.
+
+        Args:
+            data: The per-employee planning data
+            enforced: Must-have task indices that have to be planned
+            time_limit: Optional wall-clock limit in seconds
+
+        Returns:
+            SolveResult with the gap, and the boolean assignment matrix, or
+            None when the repair could not plan every enforced must-have task
+        """
+        outcome = LagrangianSolver(data, enforced, time_limit).solve()
+        status = "Infeasible" if outcome.assigned is None else "Optimal"
+        result = SolveResult(
+            self.name,
+            status,
+            outcome.seconds,
+            f"iterations={outcome.iterations} objective={outcome.objective:g} "
+            f"bound={outcome.bound:g} gap={outcome.gap:.4%}",
+            gap=round(outcome.gap, 6)
+        )
+        num_pairs = int(data.eligible.sum())
+        self._log_run(result, num_pairs + data.num_tasks, len(data.req_task) + data.num_tasks + len(data.dep_task))
+        return result, outcome.assigned
+
+
+BACKENDS: Dict[str, Type[SolverBackend]] = {
+    CbcBackend.name: CbcBackend,
+    HighsBackend.name: HighsBackend,
+    ScipyMilpBackend.name: ScipyMilpBackend,
+    LagrangianBackend.name: LagrangianBackend,
+}
+
+
+def get_backend(
+    name: str,
+    threads: Optional[int] = None,
+    gap_rel: Optional[float] = None
+) -> SolverBackend:
+    """Instantiate a backend by name using the configured options."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported solver backend: {name}")
+    backend_cls = BACKENDS[name]
+    if not backend_cls.available():
+        raise ValueError(f"Solver backend {name} is not installed")
+    options = settings.SOLVER_OPTIONS.split() if settings.SOLVER_OPTIONS else []
+    return backend_cls(
+        threads=threads or settings.SOLVER_THREADS or None,
+        options=options,
+        gap_rel=gap_rel
+    )
+
+
+def select_backend(
+    num_variables: int,
+    time_limit: Optional[float] = None,
+    exact: bool = False
+) -> SolverBackend:
+    """
+    Pick a backend for a model of the given size.
+
+    Small models are solved in-process by scipy. Larger ones go to CBC on
+    every core (or SOLVER_THREADS when set) and, when the request has a deadline, accept a small
+    optimality gap so CBC can stop at a near-optimal incumbent. HiGHS is
+    used when CBC is unavailable. Models of at least
+    SOLVER_LAGRANGIAN_MIN_VARIABLES go to the Lagrangian decomposition.
+
+    Args:
+        num_variables: Number of decision variables in the model
+        time_limit: Request deadline in seconds, if any
+        exact: Only consider MILP backends, e.g. for feasibility checks
+
+    Returns:
+        A configured SolverBackend
+    """
+    configured = BACKENDS.get(settings.SOLVER_BACKEND)
+    if settings.SOLVER_BACKEND != "auto" and not (exact and configured is not None and configured.decomposed):
+        return get_backend(settings.SOLVER_BACKEND)
+    if (
+        not exact
+        and settings.SOLVER_LAGRANGIAN_MIN_VARIABLES
+        and num_variables >= settings.SOLVER_LAGRANGIAN_MIN_VARIABLES
+    ):
+        return get_backend(LagrangianBackend.name)
+
+    if num_variables <= SMALL_MODEL_VARIABLES and ScipyMilpBackend.available():
+        return get_backend(ScipyMilpBackend.name, threads=1)
+    name = CbcBackend.name if CbcBackend.available() else HighsBackend.name
+    if num_variables <= SMALL_MODEL_VARIABLES:
+        return get_backend(name, threads=1)
+    gap_rel = DEADLINE_GAP_REL if time_limit is not None else None
+    return get_backend(name, threads=settings.SOLVER_THREADS or os.cpu_count() or 1, gap_rel=gap_rel)
@@ -1,36 +1,62 @@
-from typing import List
-from app.domain.models import Task, Employee, Team
-from app.schemas.planning_input import PlanRequest
+from typing import Dict, List
+from app.domain.enums import Unit
+from app.domain.models import Task, Employee, Team, Sprint
+from app.schemas.planning_input import PlanRequest, HorizonPlanRequest
 from app.core.logging import log_error
 
+
+class PlanInputError(ValueError):
+    """The planning input itself is invalid; planning it again cannot succeed."""
+
+
 class PlanValidator:
     def validate_request(self, request: PlanRequest) -> None:
         """Validate the planning request."""
-        self._validate_dates(request)
+        self._validate_dates(request.sprint)
+        self._validate_teams(request.teams)
+        self._validate_employees(request.employees, request.teams)
+        self._validate_tasks(request.tasks, request.teams)
+        self._validate_dependencies(request.tasks, request.completed_task_ids)
+
+    def validate_horizon(self, request: HorizonPlanRequest) -> None:
+        """Validate a multi-sprint planning request."""
+        employee_ids = {e.id for e in request.employees}
+        previous = None
+        for horizon_sprint in request.sprints:
+            sprint = horizon_sprint.sprint
+            self._validate_dates(sprint)
+            if previous is not None and sprint.start_date <= previous.end_date:
+                raise PlanInputError(f"Sprint {sprint.id} must start after sprint {previous.id} ends")
+            for emp_id, available in horizon_sprint.capacities.items():
+                if emp_id not in employee_ids:
+                    raise PlanInputError(f"Unknown employee {emp_id} in capacities of sprint {sprint.id}")
+                if available < 0:
+                    raise PlanInputError(f"Invalid capacity for employee {emp_id} in sprint {sprint.id}")
+            previous = sprint
         self._validate_teams(request.teams)
         self._validate_employees(request.employees, request.teams)
         self._validate_tasks(request.tasks, request.teams)
-        self._validate_dependencies(request.tasks)
+        self._validate_dependencies(request.tasks, request.completed_task_ids)
 
-    def _validate_dates(self, request: PlanRequest) -> None:
+    def _validate_dates(self, sprint: Sprint) -> None:
         """Validate sprint dates."""
-        if request.sprint.end_date <= request.sprint.start_date:
-            raise ValueError("Sprint end date must be after start date")
+        if sprint.end_date <= sprint.start_date:
+            raise PlanInputError("Sprint end date must be after start date")
         
-        if any(h < request.sprint.start_date or h > request.sprint.end_date 
-               for h in request.sprint.holidays):
-            raise ValueError("Holidays must be within sprint dates")
+        if any(h < sprint.start_date or h > sprint.end_date 
+               for h in sprint.holidays):
+            raise PlanInputError("Holidays must be within sprint dates")
 
     def _validate_teams(self, teams: List[Team]) -> None:
         """Validate team data."""
         team_ids = set()
         for team in teams:
             if team.id in team_ids:
-                raise ValueError(f"Duplicate team ID: {team.id}")
+                raise PlanInputError(f"Duplicate team ID: {team.id}")
             team_ids.add(team.id)
             
             if team.wip_limit is not None and team.wip_limit < 1:
-                raise ValueError(f"Invalid WIP limit for team {team.id}")
+                raise PlanInputError(f"Invalid WIP limit for team {team.id}")
 
     def _validate_employees(self, employees: List[Employee], teams: List[Team]) -> None:
         """Validate employee data."""
@@ -39,17 +65,23 @@ class PlanValidator:
         
         for emp in employees:
             if emp.id in employee_ids:
-                raise ValueError(f"Duplicate employee ID: {emp.id}")
+                raise PlanInputError(f"Duplicate employee ID: {emp.id}")
             employee_ids.add(emp.id)
             
             if emp.team_id not in team_ids:
-                raise ValueError(f"Invalid team ID {emp.team_id} for employee {emp.id}")
+                raise PlanInputError(f"Invalid team ID {emp.team_id} for employee {emp.id}")
             
             if not emp.skills:
-                raise ValueError(f"Employee {emp.id} has no skills")
+                raise PlanInputError(f"Employee {emp.id} has no skills")
             
-            if emp.capacity.available <= 0:
-                raise ValueError(f"Invalid capacity for employee {emp.id}")
+            if emp.capacity.available is None:
+                if emp.capacity.unit != Unit.HOURS:
+                    raise PlanInputError(f"Capacity in {emp.capacity.unit.value} must be provided for employee {emp.id}")
+            elif emp.capacity.available <= 0:
+                raise PlanInputError(f"Invalid capacity for employee {emp.id}")
+
+            if any(r.end < r.start for r in emp.pto):
+                raise PlanInputError(f"Invalid PTO range for employee {emp.id}")
 
     def _validate_tasks(self, tasks: List[Task], teams: List[Team]) -> None:
         """Validate task data."""
@@ -58,48 +90,54 @@ class PlanValidator:
         
         for task in tasks:
             if task.id in task_ids:
-                raise ValueError(f"Duplicate task ID: {task.id}")
+                raise PlanInputError(f"Duplicate task ID: {task.id}")
             task_ids.add(task.id)
             
             if task.team_id and task.team_id not in team_ids:
-                raise ValueError(f"Invalid team ID {task.team_id} for task {task.id}")
+                raise PlanInputError(f"Invalid team ID {task.team_id} for task {task.id}")
             
             if not task.required_skills:
-                raise ValueError(f"Task {task.id} has no required skills")
+                raise PlanInputError(f"Task {task.id} has no required skills")
             
             if task.estimate and task.estimate.value <= 0:
-                raise ValueError(f"Invalid estimate for task {task.id}")
+                raise PlanInputError(f"Invalid estimate for task {task.id}")
             
             if task.max_assignees < 1:
-                raise ValueError(f"Invalid max_assignees for task {task.id}")
+                raise PlanInputError(f"Invalid max_assignees for task {task.id}")
 
-    def _validate_dependencies(self, tasks: List[Task]) -> None:
-        """Validate task dependencies."""
+    def _validate_dependencies(self, tasks: List[Task], completed_task_ids: List[str]) -> None:
+        """Validate task dependencies; completed tasks satisfy dependencies without being planned."""
         task_ids = {t.id for t in tasks}
+        completed = set(completed_task_ids)
+        reopened = task_ids & completed
+        if reopened:
+            raise PlanInputError(f"Task {sorted(reopened)[0]} is both planned and completed")
         
         for task in tasks:
             for dep_id in task.dependencies:
-                if dep_id not in task_ids:
-                    raise ValueError(f"Invalid dependency {dep_id} for task {task.id}")
-            
-            # Check for cycles
-            visited = set()
-            self._check_dependency_cycle(task.id, task.dependencies, tasks, visited)
+                if dep_id not in task_ids and dep_id not in completed:
+                    raise PlanInputError(f"Invalid dependency {dep_id} for task {task.id}")
 
-    def _check_dependency_cycle(
-        self,
-        task_id: str,
-        dependencies: List[str],
-        tasks: List[Task],
-        visited: set
-    ) -> None:
-        """Check for dependency cycles using DFS."""
-        if task_id in visited:
-            raise ValueError(f"Dependency cycle detected involving task {task_id}")
-        
-        visited.add(task_id)
-        
-        for dep_id in dependencies:
-            dep_task = next((t for t in tasks if t.id == dep_id), None)
-            if dep_task:
-                self._check_dependency_cycle(dep_task.id, dep_task.dependencies, tasks, visited.copy())
+        self._check_dependency_cycles(tasks)
+
+    def _check_dependency_cycles(self, tasks: List[Task]) -> None:
+        """Check for dependency cycles with an iterative DFS, visiting every task once."""
+        dependencies = {t.id: t.dependencies for t in tasks}
+        state: Dict[str, int] = {}  # 1 = on the current path, 2 = finished
+        for root in dependencies:
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(dependencies[root]))]
+            while stack:
+                task_id, pending = stack[-1]
+                dep_id = next(pending, None)
+                if dep_id is None:
+                    state[task_id] = 2
+                    stack.pop()
+                elif dep_id in dependencies:
+                    if state.get(dep_id) == 1:
+                        raise PlanInputError(f"Dependency cycle detected involving task {dep_id}")
+                    if dep_id not in state:
+                        state[dep_id] = 1
+                        stack.append((dep_id, iter(dependencies[dep_id])))
@@ -1,22 +1,55 @@
 import hashlib
 import json
-from typing import Dict, Any
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+from app.core.config import get_settings
 
 class LLMCache:
-    """Simple in-memory cache for LLM estimation results."""
-    def __init__(self):
+    """In-memory cache for LLM estimation results, optionally backed by SQLite.
+
+    With a path, entries survive restarts and are shared between processes,
+    so a cache warmed by the pre-estimation CLI serves the API.
+    """
+    def __init__(self, path: Optional[str] = None):
         self._cache = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        if path:
+            # Several processes may share the file (API, CLIs); wait for their write locks
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._db.commit()
 
     def _make_key(self, prompt: str, params: Dict[str, Any]) -> str:
         key_data = json.dumps({"prompt": prompt, "params": params}, sort_keys=True)
         return hashlib.sha256(key_data.encode()).hexdigest()
 
+    def key_of(self, prompt: str, params: Dict[str, Any]) -> str:
+        """Cache key of a prompt and its parameters."""
+        return self._make_key(prompt, params)
+
     def get(self, prompt: str, params: Dict[str, Any]) -> Any:
         key = self._make_key(prompt, params)
-        return self._cache.get(key)
+        if key in self._cache or self._db is None:
+            return self._cache.get(key)
+        with self._lock:
+            row = self._db.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._cache[key] = json.loads(row[0])
+        return self._cache[key]
 
     def set(self, prompt: str, params: Dict[str, Any], result: Any) -> None:
         key = self._make_key(prompt, params)
         self._cache[key] = result
+        if self._db is not None:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value) VALUES (?, ?)",
+                    (key, json.dumps(result))
+                )
+                self._db.commit()
 
-llm_cache = LLMCache()
+llm_cache = LLMCache(get_settings().LLM_CACHE_PATH)
@@ -0,0 +1,44 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+from app.core.config import get_settings
+from app.schemas.planning_input import PlanRequest
+
+
+class ObjectiveCache:
+    """Bounded LRU of optimizer objective values, keyed by the planning input.
+
+    Lets a hand-edited plan be compared with the optimum of the same input
+    without solving again.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_of(request: PlanRequest) -> str:
+        """Hash of the planning input fields of a request (subclass extras are ignored)."""
+        payload = request.model_dump_json(include=set(PlanRequest.model_fields))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, request: PlanRequest) -> Optional[float]:
+        key = self.key_of(request)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, request: PlanRequest, objective: float) -> None:
+        key = self.key_of(request)
+        with self._lock:
+            self._entries[key] = objective
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+plan_objectives = ObjectiveCache(get_settings().PLAN_OBJECTIVE_CACHE_SIZE)
@@ -1,3 +1,6 @@
+from typing import Dict
+from app.utils.time_utils import normalize_skill_name
+
 def weighted_skill_match(
     required_level: int,
     actual_level: int,
@@ -77,3 +80,27 @@ def calculate_team_coverage(
         "fully_covered": all(s["covered"] for s in coverage.values()),
         "coverage_ratio": sum(1 for s in coverage.values() if s["covered"]) / len(coverage)
     }
+
+
+class SkillIndex:
+    """Interns normalized skill names to dense integer ids.
+
+    Each raw spelling is normalized once; later lookups are a dict hit, so
+    "JS", "js" and "javascript" all map to the same column of a skill matrix.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self._raw: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def id(self, name: str) -> int:
+        """Return the id of a skill name, assigning a new one if unseen."""
+        skill_id = self._raw.get(name)
+        if skill_id is None:
+            normalized = normalize_skill_name(name)
+            skill_id = self.ids.setdefault(normalized, len(self.ids))
+            self._raw[name] = skill_id
+        return skill_id
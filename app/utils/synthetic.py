@@ -0,0 +1,76 @@
+import random
+from datetime import date
+from app.domain.models import Capacity, Employee, Estimate, Skill, SkillRequirement, Sprint, Task, Team
+from app.schemas.planning_input import Constraints, PlanRequest
+
+SKILLS = [
+    "python", "aws", "sql", "react", "typescript", "spark",
+    "kubernetes", "java", "go", "terraform", "nodejs", "postgresql"
+]
+
+
+def make_synthetic_request(
+    num_employees: int,
+    num_tasks: int,
+    num_teams: int = 4,
+    seed: int = 0
+) -> PlanRequest:
+    """
+    Build a reproducible random planning request for benchmarks and tests.
+
+    Args:
+        num_employees: Number of employees
+        num_tasks: Number of tasks, all with estimates
+        num_teams: Number of teams employees and tasks are spread over
+        seed: Random seed
+
+    Returns:
+        A PlanRequest with roughly 1.5x more work than capacity
+    """
+    rng = random.Random(seed)
+    teams = [Team(id=f"TEAM-{k}", name=f"Team {k}") for k in range(num_teams)]
+    employees = [
+        Employee(
+            id=f"E{i}",
+            name=f"Employee {i}",
+            role="Engineer",
+            team_id=teams[i % num_teams].id,
+            skills=[
+                Skill(name=name, level=rng.randint(2, 5))
+                for name in rng.sample(SKILLS, rng.randint(2, 4))
+            ],
+            capacity=Capacity(unit="hours", available=rng.choice([40, 56, 64, 72, 80]))
+        )
+        for i in range(num_employees)
+    ]
+    tasks = [
+        Task(
+            id=f"T{j}",
+            title=f"Task {j}",
+            description=f"Synthetic task {j}",
+            required_skills=[
+                SkillRequirement(name=name, min_level=rng.randint(1, 4))
+                for name in rng.sample(SKILLS, rng.randint(1, 2))
+            ],
+            team_id=teams[j % num_teams].id,
+            priority=rng.randint(1, 5),
+            estimate=Estimate(unit="hours", value=rng.choice([4, 8, 12, 16, 24, 40])),
+            max_assignees=rng.choice([1, 1, 1, 2])
+        )
+        for j in range(num_tasks)
+    ]
+    return PlanRequest(
+        sprint=Sprint(
+            id="SPR-SYNTH",
+            name="Synthetic sprint",
+            start_date=date(2025, 9, 15),
+            end_date=date(2025, 9, 26),
+            timezone="UTC",
+            work_days=10,
+            work_hours_per_day=8
+        ),
+        teams=teams,
+        employees=employees,
+        tasks=tasks,
+        constraints=Constraints()
+    )
@@ -1,6 +1,8 @@
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
 from zoneinfo import ZoneInfo
+import numpy as np
 
 def calculate_work_hours(
     start_date: datetime,
@@ -12,22 +14,46 @@ def calculate_work_hours(
     """Calculate total work hours between dates, excluding weekends and holidays."""
     
     tz = ZoneInfo(timezone)
-    start = start_date.replace(tzinfo=tz)
-    end = end_date.replace(tzinfo=tz)
-    holidays = holidays or []
-    
-    total_hours = 0
-    current = start
-    
-    while current <= end:
-        # Skip weekends (5 = Saturday, 6 = Sunday)
-        if current.weekday() < 5:
-            # Skip holidays
-            if current.date() not in [h.date() for h in holidays]:
-                total_hours += work_hours_per_day
-        current += timedelta(days=1)
-    
-    return total_hours
+    start = start_date.replace(tzinfo=tz).date()
+    end = end_date.replace(tzinfo=tz).date()
+    calendar, _ = business_calendar(start, end, timezone, tuple(sorted({h.date() for h in holidays or []})))
+    return float(count_business_days(start, end, calendar) * work_hours_per_day)
+
+@lru_cache(maxsize=256)
+def business_calendar(
+    start_date: date,
+    end_date: date,
+    timezone: str,
+    holidays: Tuple[date, ...]
+) -> Tuple[np.busdaycalendar, int]:
+    """
+    Build (and cache) the business-day calendar of a date range.
+
+    Args:
+        start_date: First day (inclusive), local to the timezone
+        end_date: Last day (inclusive), local to the timezone
+        timezone: IANA timezone name the dates are expressed in
+        holidays: Sorted tuple of holiday dates
+
+    Returns:
+        The Mon-Fri calendar without holidays, and its business-day count
+    """
+    ZoneInfo(timezone)  # reject unknown timezones early
+    calendar = np.busdaycalendar(
+        weekmask="1111100",
+        holidays=np.array(holidays, dtype="datetime64[D]")
+    )
+    return calendar, int(count_business_days(start_date, end_date, calendar))
+
+def count_business_days(
+    start: Sequence[date],
+    end: Sequence[date],
+    calendar: np.busdaycalendar
+):
+    """Vectorized count of business days between inclusive start and end dates."""
+    start = np.asarray(start, dtype="datetime64[D]")
+    end = np.asarray(end, dtype="datetime64[D]") + np.timedelta64(1, "D")
+    return np.busday_count(start, np.maximum(start, end), busdaycal=calendar)
 
 def normalize_skill_name(skill: str) -> str:
     """Normalize skill names for consistent matching."""
@@ -0,0 +1,54 @@
+"""Benchmark the solver backends on synthetic planning instances.
+
+Usage:
+    python -m scripts.benchmark_solvers [--time-limit SECONDS]
+
+"solve s" is the time reported by the backend, "total s" includes building
+the model (PuLP expressions or CSR matrices).
+
+Prints a markdown table (see docs/solver_benchmarks.md).
+"""
+import argparse
+import os
+import time
+from typing import Optional
+from app.schemas.planning_input import Constraints
+from app.services.planner import SprintPlanner
+from app.services.planning_data import PlanningData
+from app.services.solvers import BACKENDS, get_backend
+from app.utils.synthetic import make_synthetic_request
+
+INSTANCES = [(10, 30), (30, 100), (100, 400), (300, 1000)]
+
+
+def benchmark(time_limit: Optional[float]) -> None:
+    threads = os.cpu_count() or 1
+    configs = [("cbc", 1)]
+    if threads > 1:
+        configs.append(("cbc", threads))
+    for name in BACKENDS:
+        if name != "cbc" and BACKENDS[name].available():
+            configs.append((name, 1 if BACKENDS[name].direct else threads))
+
+    print("| employees x tasks | pairs | backend | threads | status | objective | solve s | total s |")
+    print("|---|---|---|---|---|---|---|---|")
+    for num_employees, num_tasks in INSTANCES:
+        request = make_synthetic_request(num_employees, num_tasks)
+        constraints = Constraints(time_limit_seconds=time_limit)
+        data = PlanningData(request.tasks, request.employees, constraints)
+        for name, n_threads in configs:
+            planner = SprintPlanner(solver=get_backend(name, threads=n_threads))
+            start = time.perf_counter()
+            result, assigned = planner._solve_model(data, enforced=set())
+            seconds = time.perf_counter() - start
+            objective = (assigned * data.priorities[None, :]).sum()
+            print(
+                f"| {num_employees} x {num_tasks} | {int(data.eligible.sum())} | {name} | {n_threads} "
+                f"| {result.status} | {objective:.0f} | {result.seconds:.2f} | {seconds:.2f} |"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--time-limit", type=float, default=None)
+    benchmark(parser.parse_args().time_limit)
@@ -0,0 +1,163 @@
+"""Plan many stored plan requests offline, in parallel worker processes.
+
+Usage:
+    LLM_CACHE_PATH=estimates.db python -m scripts.plan_batch INPUT --output results.ndjson [--workers N]
+
+INPUT is a directory of plan request JSON files (like data/samples/), an
+NDJSON file with one plan request per line, or "-" for NDJSON on stdin.
+Requests are planned with SprintPlanner directly, without the API. Every
+result is appended to the output as one JSON line:
+
+    {"id": ..., "status": "ok" | "error", "seconds": ..., "plan": {...} | "error": "..."}
+
+Rerunning with the same output skips the ids already in it, so an
+interrupted run resumes where it stopped (--retry-errors plans failed ones
+again). Workers share the estimate cache through LLM_CACHE_PATH.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+# Event loop of a worker process, kept across requests so the shared LLM
+# provider's HTTP connections stay usable and are reused
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def iter_requests(source: str) -> Iterator[Tuple[str, str]]:
+    """Yield (item id, raw request JSON) pairs from a directory, NDJSON file or stdin."""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith(".json"):
+                with open(os.path.join(source, name)) as f:
+                    yield name, f.read()
+        return
+    stream = sys.stdin if source == "-" else open(source)
+    name = "stdin" if source == "-" else os.path.basename(source)
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield f"{name}:{line_number}", line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def completed_ids(output: str, retry_errors: bool) -> Set[str]:
+    """
+    Ids already recorded in an output file.
+
+    A trailing partial line left by an interrupted run is cut off so new
+    results start on a clean line.
+    """
+    if not os.path.exists(output):
+        return set()
+    with open(output, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    done = set()
+    for line in data[:end].splitlines():
+        record = json.loads(line)
+        if record["status"] == "ok" or not retry_errors:
+            done.add(record["id"])
+    return done
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def plan_one(item_id: str, raw: str) -> Dict:
+    """Plan one request in a worker process; never raises."""
+    from app.schemas.planning_input import PlanRequest
+    from app.services.planner import SprintPlanner
+
+    start = time.perf_counter()
+    try:
+        request = PlanRequest.model_validate_json(raw)
+        plan = _event_loop().run_until_complete(SprintPlanner().create_plan(request))
+        record = {"plan": plan.model_dump(mode="json"), "status": "ok"}
+    except Exception as e:
+        record = {"error": f"{type(e).__name__}: {e}", "status": "error"}
+    return {
+        "id": item_id,
+        "seconds": round(time.perf_counter() - start, 4),
+        "worker": os.getpid(),
+        **record
+    }
+
+
+def run(source: str, output: str, workers: int, retry_errors: bool) -> Tuple[int, int]:
+    """
+    Plan every request of the source not yet in the output.
+
+    At most two requests per worker are in flight, so inputs of any size are
+    streamed. Results are appended and flushed one line at a time.
+
+    Returns:
+        Numbers of planned and failed requests in this run
+    """
+    done = completed_ids(output, retry_errors)
+    planned = failed = 0
+    # spawn: workers must not inherit the parent's SQLite connection or event loop
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool, open(output, "a") as out:
+        in_flight: Set[Future] = set()
+
+        def drain(block_until: int) -> None:
+            nonlocal planned, failed, in_flight
+            while len(in_flight) > block_until:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record = future.result()
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    if record["status"] == "ok":
+                        planned += 1
+                    else:
+                        failed += 1
+                        print(f"{record['id']}: {record['error']}", file=sys.stderr)
+
+        for item_id, raw in iter_requests(source):
+            if item_id in done:
+                continue
+            in_flight.add(pool.submit(plan_one, item_id, raw))
+            drain(block_until=2 * workers - 1)
+        drain(block_until=0)
+    return planned, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--retry-errors", action="store_true")
+    args = parser.parse_args()
+
+    if not os.environ.get("LLM_CACHE_PATH"):
+        print("LLM_CACHE_PATH is not set: workers will not share estimates", file=sys.stderr)
+    # Split the cores between the workers instead of every solve using all of them
+    os.environ.setdefault("SOLVER_THREADS", str(max(1, (os.cpu_count() or 1) // args.workers)))
+    start = time.perf_counter()
+    planned, failed = run(args.input, args.output, args.workers, args.retry_errors)
+    print(
+        f"{planned} planned, {failed} failed in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Solver worker: plan jobs from the durable job queue, separately from the API.
+
+Usage:
+    PLAN_QUEUE_PATH=/var/lib/sprint/jobs.db python -m scripts.plan_worker [--max-jobs N] [--exit-when-idle]
+
+API nodes enqueue jobs (POST /plan/jobs) into the SQLite file at
+PLAN_QUEUE_PATH; any number of these workers on the same host lease them,
+run SprintPlanner or HorizonPlanner and write the results back. The queue
+runs SQLite in WAL mode, which needs shared memory: API and workers must
+share a local disk, not a network filesystem. While solving, a worker renews its lease every third of
+PLAN_QUEUE_VISIBILITY_SECONDS; if it dies, the lease expires and another
+worker retries the job. SIGTERM lets the current job finish before exiting.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Optional
+from pydantic import ValidationError
+from app.core.config import get_settings
+from app.core.logging import log_error, log_event
+from app.domain.enums import PlanJobKind
+from app.schemas.planning_input import HorizonPlanRequest, PlanRequest
+from app.services.horizon import HorizonPlanner
+from app.services.job_queue import LeasedJob, PlanJobQueue
+from app.services.planner import SprintPlanner
+from app.services.validator import PlanInputError
+
+# Event loop of this worker, kept across jobs so the shared LLM provider's
+# HTTP connections stay usable and are reused
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+class _Heartbeat(threading.Thread):
+    """Renews a job's lease until stopped."""
+
+    def __init__(self, queue: PlanJobQueue, job_id: str, worker_id: str):
+        super().__init__(daemon=True)
+        self.queue, self.job_id, self.worker_id = queue, job_id, worker_id
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.queue.visibility_seconds / 3):
+            if not self.queue.heartbeat(self.job_id, self.worker_id):
+                log_event("plan_job_lease_lost", {"job_id": self.job_id, "worker": self.worker_id})
+                return
+
+
+def process(queue: PlanJobQueue, job: LeasedJob, worker_id: str) -> bool:
+    """
+    Solve one leased job and record its result.
+
+    Invalid input (a malformed request or one the validator rejects) fails
+    the job for good; any other error, including other ValueErrors such as a
+    missing solver backend, makes it visible for a retry.
+
+    Returns:
+        True when the job completed
+    """
+    heartbeat = _Heartbeat(queue, job.job_id, worker_id)
+    heartbeat.start()
+    start = time.perf_counter()
+    try:
+        if job.kind == PlanJobKind.HORIZON:
+            planning = HorizonPlanner().create_plan(HorizonPlanRequest.model_validate_json(job.payload))
+        else:
+            planning = SprintPlanner().create_plan(PlanRequest.model_validate_json(job.payload))
+        plan = _event_loop().run_until_complete(planning)
+    except (ValidationError, PlanInputError) as ve:
+        queue.fail(job.job_id, worker_id, str(ve), retry=False)
+        log_error(ve, {"job_id": job.job_id, "attempt": job.attempt})
+        return False
+    except Exception as e:
+        queue.fail(job.job_id, worker_id, f"{type(e).__name__}: {e}", retry=True)
+        log_error(e, {"job_id": job.job_id, "attempt": job.attempt})
+        return False
+    finally:
+        heartbeat.stopped.set()
+    completed = queue.complete(job.job_id, worker_id, plan.model_dump_json())
+    log_event("plan_job_completed" if completed else "plan_job_result_discarded", {
+        "job_id": job.job_id,
+        "worker": worker_id,
+        "attempt": job.attempt,
+        "seconds": round(time.perf_counter() - start, 4)
+    })
+    return completed
+
+
+def run(
+    queue: PlanJobQueue,
+    worker_id: str,
+    max_jobs: Optional[int] = None,
+    exit_when_idle: bool = False,
+    stop: Optional[threading.Event] = None
+) -> int:
+    """
+    Lease and process jobs until stopped.
+
+    Args:
+        queue: The job queue
+        worker_id: Identity recorded in leases
+        max_jobs: Exit after this many jobs
+        exit_when_idle: Exit as soon as no job is visible
+        stop: Set to exit after the current job
+
+    Returns:
+        Number of jobs processed
+    """
+    stop = stop or threading.Event()
+    processed = 0
+    while not stop.is_set() and (max_jobs is None or processed < max_jobs):
+        job = queue.lease(worker_id)
+        if job is None:
+            if exit_when_idle:
+                break
+            stop.wait(get_settings().PLAN_QUEUE_POLL_SECONDS)
+            continue
+        process(queue, job, worker_id)
+        processed += 1
+    return processed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-jobs", type=int)
+    parser.add_argument("--exit-when-idle", action="store_true")
+    args = parser.parse_args()
+
+    path = get_settings().PLAN_QUEUE_PATH
+    if not path:
+        print("PLAN_QUEUE_PATH is not set", file=sys.stderr)
+        sys.exit(2)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    processed = run(PlanJobQueue(path), worker_id, args.max_jobs, args.exit_when_idle, stop)
+    print(f"{worker_id}: {processed} job(s) processed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
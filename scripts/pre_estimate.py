@@ -0,0 +1,67 @@
+"""Pre-estimate a backlog into the estimate cache ahead of planning.
+
+Usage:
+    LLM_CACHE_PATH=estimates.db python -m scripts.pre_estimate BACKLOG [--concurrency N]
+
+BACKLOG is a JSON file (a plan request or a list of tasks), or an NDJSON or
+CSV task export in the /plan/sprint/upload format. Point the API at the same
+LLM_CACHE_PATH so plans are estimated from the warmed cache.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import List
+from app.core.config import get_settings
+from app.domain.enums import JobStatus
+from app.domain.models import Task
+from app.schemas.estimation import PreEstimateJob
+from app.services.ingest import iter_rows, task_from_csv
+from app.services.pre_estimation import PreEstimator
+
+
+def load_tasks(path: str) -> List[Task]:
+    if path.endswith(".json"):
+        with open(path) as f:
+            data = json.load(f)
+        rows = data["tasks"] if isinstance(data, dict) else data
+        return [Task.model_validate(row) for row in rows]
+
+    fmt = "csv" if path.endswith(".csv") else "ndjson"
+    tasks = []
+    with open(path, "rb") as f:
+        for line, row in iter_rows(f, fmt):
+            try:
+                if isinstance(row, Exception):
+                    raise ValueError(row)
+                tasks.append(Task.model_validate(task_from_csv(row) if fmt == "csv" else row))
+            except ValueError as e:
+                print(f"line {line}: skipped, {e}", file=sys.stderr)
+    return tasks
+
+
+def print_progress(job: PreEstimateJob) -> None:
+    print(
+        f"{job.done}/{job.total} done: {job.estimated} estimated, {job.cached} cached, "
+        f"{job.skipped} skipped, {job.failed} failed",
+        file=sys.stderr
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("backlog")
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+
+    if not get_settings().LLM_CACHE_PATH:
+        print("LLM_CACHE_PATH is not set: estimates will not outlive this run", file=sys.stderr)
+    tasks = load_tasks(args.backlog)
+    job = PreEstimateJob(job_id="cli", status=JobStatus.QUEUED, total=len(tasks))
+    asyncio.run(PreEstimator(concurrency=args.concurrency).run(tasks, job, on_progress=print_progress))
+    print_progress(job)
+    print(job.model_dump_json())
+
+
+if __name__ == "__main__":
+    main()
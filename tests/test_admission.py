@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from app.services.admission import AdmissionController, AdmissionRejected
+from app.utils.synthetic import make_synthetic_request
+
+SMALL = make_synthetic_request(3, 5)
+LARGE = make_synthetic_request(100, 200)
+
+
+def test_cost_prediction_routes_by_size():
+    controller = AdmissionController()
+    assert controller.lane_for(controller.predict_cost(SMALL)) is controller.cheap
+    assert controller.lane_for(controller.predict_cost(LARGE)) is controller.expensive
+
+def test_expensive_backlog_is_shed_with_retry_after():
+    controller = AdmissionController(expensive_concurrency=1, expensive_max_wait=1.0)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit(LARGE, "client-a"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit(LARGE, "client-b"):
+                pass
+        # Small plans are unaffected by the busy expensive lane
+        async with controller.admit(SMALL, "client-b"):
+            pass
+        release.set()
+        await holder
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert rejected.retry_after >= 2
+
+def test_per_client_limit_and_round_robin():
+    controller = AdmissionController(cheap_concurrency=1, cheap_max_wait=60, max_per_client=3)
+    order = []
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def run(client_id, tag, wait=None):
+            async with controller.admit(SMALL, client_id):
+                order.append(tag)
+                if wait is not None:
+                    await wait.wait()
+
+        tasks = [asyncio.create_task(run("a", "a1", gate))]
+        await asyncio.sleep(0)
+        for client_id, tag in [("a", "a2"), ("a", "a3"), ("b", "b1")]:
+            tasks.append(asyncio.create_task(run(client_id, tag)))
+            await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit(SMALL, "a"):
+                pass
+        gate.set()
+        await asyncio.gather(*tasks)
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    # a's fourth plan is rejected; once a1 finishes, b1 is served before a's third plan (a3)
+    assert order == ["a1", "a2", "b1", "a3"]
+
+
+def test_client_key_ignores_caller_chosen_header(monkeypatch):
+    from starlette.requests import Request
+    from app.api.routes import _client_id
+    from app.core.config import get_settings
+
+    def request(token=None, label=None):
+        headers = [(b"x-client-id", label.encode())] if label else []
+        if token:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        return Request({"type": "http", "headers": headers, "client": ("10.0.0.7", 5000)})
+
+    monkeypatch.setattr(get_settings(), "AUTH_ENABLED", False)
+    assert _client_id(request(label="a")) == _client_id(request(label="b")) == "10.0.0.7"
+
+    monkeypatch.setattr(get_settings(), "AUTH_ENABLED", True)
+    assert _client_id(request("t1", "a")) == _client_id(request("t1", "b"))
+    assert _client_id(request("t1")) != _client_id(request("t2"))
+    assert "t1" not in _client_id(request("t1"))
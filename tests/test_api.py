@@ -1,6 +1,12 @@
+import gzip
+import io
+import json
+import zipfile
+import msgpack
 import pytest
 from fastapi.testclient import TestClient
 from app.api.routes import app
+from app.core.config import get_settings
 
 @pytest.fixture(scope="module")
 def test_client():
@@ -197,3 +203,499 @@ def test_plan_sprint_optional_task(test_client):
     # Optional task should be unassigned if capacity is insufficient
     assert any(t["task_id"] == "T-102" for t in response.json()["unassigned"])
     # End of valid test suite. All code below this line has been removed.
+
+
+def _diagnostics_payload(tasks, capacity=16, max_parallel=2):
+    return {
+        "sprint": {
+            "id": "SPR-2025-09-42",
+            "name": "Sprint 42",
+            "start_date": "2025-09-15",
+            "end_date": "2025-09-29",
+            "timezone": "UTC",
+            "work_days": 10,
+            "work_hours_per_day": 8
+        },
+        "teams": [{"id": "TEAM-PLAT", "name": "Platform", "wip_limit": 10}],
+        "employees": [
+            {
+                "id": "E1",
+                "name": "Ari Cohen",
+                "role": "Backend Engineer",
+                "team_id": "TEAM-PLAT",
+                "skills": [{"name": "python", "level": 4}],
+                "capacity": {"unit": "hours", "available": capacity}
+            }
+        ],
+        "tasks": [
+            {
+                "id": task_id,
+                "title": task_id,
+                "description": "Diagnostics scenario.",
+                "required_skills": [{"name": skill, "min_level": 3}],
+                "team_id": "TEAM-PLAT",
+                "priority": priority,
+                "estimate": {"unit": "hours", "value": hours},
+                "dependencies": deps,
+                "max_assignees": 1,
+                "must_have": must_have
+            }
+            for task_id, skill, priority, hours, deps, must_have in tasks
+        ],
+        "constraints": {"max_parallel_tasks_per_person": max_parallel}
+    }
+
+def test_unassigned_diagnostics_categories(test_client):
+    payload = _diagnostics_payload([
+        ("T-1", "python", 5, 12, [], False),
+        ("T-2", "rust", 4, 4, [], False),
+        ("T-3", "python", 3, 40, [], False),
+        ("T-4", "python", 2, 8, [], False),
+        ("T-5", "python", 1, 2, ["T-3"], False),
+    ], max_parallel=1)
+    response = test_client.post("/plan/sprint", json=payload)
+    assert response.status_code == 200
+    categories = {t["task_id"]: t["category"] for t in response.json()["unassigned"]}
+    assert categories == {
+        "T-2": "no_eligible_skill_holder",
+        "T-3": "too_large_for_eligible_people",
+        "T-4": "eligible_people_saturated",
+        "T-5": "blocked_dependency",
+    }
+
+def test_must_have_conflict_is_reported_and_relaxed(test_client):
+    payload = _diagnostics_payload([
+        ("T-1", "python", 5, 10, [], True),
+        ("T-2", "python", 4, 10, [], True),
+        ("T-3", "python", 1, 4, [], False),
+    ])
+    response = test_client.post("/plan/sprint", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(body["conflicts"]) == ["must_have:T-1", "must_have:T-2"]
+    assert {a["task_id"] for a in body["assignments"]} == {"T-1", "T-3"}
+    assert [t["category"] for t in body["unassigned"]] == ["must_have_conflict"]
+
+def test_capacity_derived_from_sprint_calendar(test_client):
+    payload = _diagnostics_payload([("T-1", "python", 5, 8, [], False)], capacity=None)
+    payload["employees"][0]["pto"] = [{"start": "2025-09-15", "end": "2025-09-16"}]
+    response = test_client.post("/plan/sprint", json=payload)
+    assert response.status_code == 200
+    # 11 business days from Sep 15 to Sep 29, minus 2 days PTO, at 8h
+    assert response.json()["utilization"][0]["capacity"] == 72.0
+
+def test_coverage_analysis(test_client):
+    payload = {
+        "teams": [
+            {"id": "TEAM-PLAT", "name": "Platform"},
+            {"id": "TEAM-WEB", "name": "Web"}
+        ],
+        "employees": [
+            {
+                "id": "E1", "name": "Ari Cohen", "role": "Backend Engineer", "team_id": "TEAM-PLAT",
+                "skills": [{"name": "Python", "level": 4}, {"name": "aws", "level": 3}],
+                "capacity": {"unit": "hours", "available": 64}
+            },
+            {
+                "id": "E2", "name": "Dana Levy", "role": "Frontend Engineer", "team_id": "TEAM-WEB",
+                "skills": [{"name": "js", "level": 4}],
+                "capacity": {"unit": "hours", "available": 64}
+            }
+        ],
+        "tasks": [
+            {
+                "id": "T-101", "title": "API", "description": "Build API.", "priority": 5,
+                "required_skills": [{"name": "python", "min_level": 3}, {"name": "aws", "min_level": 4}]
+            },
+            {
+                "id": "T-102", "title": "UI", "description": "Build UI.", "priority": 3,
+                "required_skills": [{"name": "javascript", "min_level": 3}]
+            }
+        ]
+    }
+    response = test_client.post("/analysis/coverage", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == [["partial", "uncovered"], ["uncovered", "covered"]]
+    assert body["coverage_ratio"][0] == [0.5, 0.0]
+    assert body["uncovered_task_ids"] == ["T-101"]
+
+def test_plan_sprint_upload_reports_row_errors(test_client):
+    payload = _diagnostics_payload([])
+    meta = {k: payload[k] for k in ("sprint", "teams", "constraints")}
+    employees = "\n".join([
+        "id,name,role,team_id,skills,capacity_unit,capacity_available",
+        "E1,Ari Cohen,Backend Engineer,TEAM-PLAT,Py:4;sql:3,hours,40",
+        "E2,Dana Levy,Frontend Engineer,TEAM-NOPE,js:4,hours,40",
+    ])
+    tasks = "\n".join(json.dumps(row) if isinstance(row, dict) else row for row in [
+        {"id": "T-1", "title": "API", "description": "Build API.", "priority": 5,
+         "required_skills": [{"name": "python", "min_level": 3}],
+         "estimate": {"unit": "hours", "value": 8}},
+        {"id": "T-2", "title": "Bad", "description": "Bad priority.", "priority": 9,
+         "required_skills": [{"name": "python", "min_level": 3}]},
+        "{not json",
+        {"id": "T-3", "title": "Follow-up", "description": "Depends on T-2.", "priority": 3,
+         "required_skills": [{"name": "sql", "min_level": 2}], "dependencies": ["T-2"],
+         "estimate": {"unit": "hours", "value": 4}},
+        "",
+        {"id": "T-1", "title": "Dup", "description": "Duplicate.", "priority": 1,
+         "required_skills": [{"name": "python", "min_level": 1}]},
+    ])
+    response = test_client.post(
+        "/plan/sprint/upload",
+        data={"meta": json.dumps(meta)},
+        files={
+            "employees": ("employees.csv", employees, "text/csv"),
+            "tasks": ("tasks.ndjson", tasks, "application/x-ndjson"),
+        }
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [a["task_id"] for a in body["assignments"]] == ["T-1"]
+    ingest = body["ingest"]
+    assert (ingest["tasks_accepted"], ingest["employees_accepted"]) == (1, 1)
+    assert [(e["source"], e["line"]) for e in ingest["errors"]] == [
+        ("employees", 3), ("tasks", 2), ("tasks", 3), ("tasks", 6), ("tasks", 4)
+    ]
+    assert ingest["errors_total"] == 5
+
+def test_plan_sprint_upload_reports_unreadable_rows(test_client):
+    payload = _diagnostics_payload([])
+    meta = {k: payload[k] for k in ("sprint", "teams", "constraints")}
+    employees = b"\n".join([
+        b"id,name,role,team_id,skills,capacity_unit,capacity_available",
+        "E1,Ari Cohen,Backend Engineer,TEAM-PLAT,python:4,hours,40".encode(),
+        "E2,Dana L\u00e9vy,Frontend Engineer,TEAM-PLAT,js:4,hours,40".encode("latin-1"),
+        b"E3,Nul\x00Byte,Engineer,TEAM-PLAT,python:3,hours,40",
+    ])
+    task = {"id": "T-1", "title": "API", "description": "Build API.", "priority": 5,
+            "required_skills": [{"name": "python", "min_level": 3}], "estimate": {"unit": "hours", "value": 8}}
+    tasks = b"\n".join([
+        b'{"id": "T-0", "title": "\xff\xfe"}',
+        json.dumps(task).encode(),
+        b'{"id": "T-2"\x00}',
+    ])
+    response = test_client.post(
+        "/plan/sprint/upload",
+        data={"meta": json.dumps(meta)},
+        files={
+            "employees": ("employees.csv", employees, "text/csv"),
+            "tasks": ("tasks.ndjson", tasks, "application/x-ndjson"),
+        }
+    )
+    assert response.status_code == 200
+    ingest = response.json()["ingest"]
+    assert (ingest["tasks_accepted"], ingest["employees_accepted"]) == (1, 1)
+    assert [(e["source"], e["line"], e["error"].split(":")[0]) for e in ingest["errors"]] == [
+        ("employees", 3, "Not UTF-8"), ("employees", 4, "Line contains a NUL byte"),
+        ("tasks", 1, "Not UTF-8"), ("tasks", 3, "Line contains a NUL byte")
+    ]
+
+def test_profiled_request_stores_downloadable_artifact(test_client, monkeypatch, tmp_path):
+    monkeypatch.setattr(get_settings(), "PROFILE_TOKEN", "s3cret")
+    monkeypatch.setattr(get_settings(), "PROFILE_DIR", str(tmp_path))
+    payload = _diagnostics_payload([("T-1", "python", 5, 8, [], False)])
+
+    assert "X-Profile-Id" not in test_client.post("/plan/sprint", json=payload).headers
+    wrong = test_client.post("/plan/sprint", json=payload, headers={"X-Profile-Token": "guess"})
+    assert "X-Profile-Id" not in wrong.headers
+
+    response = test_client.post("/plan/sprint", json=payload, headers={"X-Profile-Token": "s3cret"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert test_client.get(f"/profiles/{profile_id}").status_code == 404
+
+    download = test_client.get(f"/profiles/{profile_id}", headers={"X-Profile-Token": "s3cret"})
+    assert download.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(download.content)) as archive:
+        assert {"profile.pstats", "profile.txt", "summary.json"} <= set(archive.namelist())
+        summary = json.loads(archive.read("summary.json"))
+    assert summary["model"]["eligible_pairs"] == 1
+    assert [p["phase"] for p in summary["phases"]][-2:] == ["optimize", "diagnostics"]
+    assert summary["solver_runs"][0]["status"] == "Optimal"
+
+def _horizon_payload(lookahead, capacities=None):
+    base = _diagnostics_payload([
+        ("T-1", "python", 1, 8, [], False),
+        ("T-2", "python", 5, 8, ["T-1"], False),
+        ("T-3", "python", 3, 8, [], False),
+        ("T-4", "python", 3, 8, [], False),
+    ])
+    sprints = [
+        {"sprint": {**base["sprint"], "id": sprint_id, "start_date": start, "end_date": end}}
+        for sprint_id, start, end in [
+            ("S-1", "2025-09-15", "2025-09-26"),
+            ("S-2", "2025-09-29", "2025-10-10"),
+        ]
+    ]
+    if capacities:
+        sprints[0]["capacities"] = capacities
+    return {
+        "sprints": sprints,
+        "teams": base["teams"],
+        "employees": base["employees"],
+        "tasks": base["tasks"],
+        "lookahead_sprints": lookahead
+    }
+
+def test_horizon_lookahead_schedules_enablers_early(test_client):
+    response = test_client.post("/plan/horizon", json=_horizon_payload(lookahead=1))
+    assert response.status_code == 200
+    body = response.json()
+    planned = [{a["task_id"] for a in plan["assignments"]} for plan in body["sprints"]]
+    assert "T-1" in planned[0] and "T-2" in planned[1]
+    assert body["summary"]["assigned_tasks"] == 4
+    assert body["unassigned"] == []
+
+    myopic = test_client.post("/plan/horizon", json=_horizon_payload(lookahead=0)).json()
+    assert [u["task_id"] for u in myopic["unassigned"]] == ["T-2"]
+    assert myopic["unassigned"][0]["category"] == "blocked_dependency"
+    assert myopic["sprints"][0]["notes"] == "1 unassigned task(s) carried to the next sprint"
+
+def test_horizon_per_sprint_capacity(test_client):
+    body = test_client.post("/plan/horizon", json=_horizon_payload(lookahead=1, capacities={"E1": 0})).json()
+    assert body["sprints"][0]["assignments"] == []
+    assert body["summary"]["assigned_tasks"] == 2
+    bad = _horizon_payload(lookahead=1, capacities={"E9": 8})
+    assert test_client.post("/plan/horizon", json=bad).status_code == 400
+
+def test_completed_tasks_satisfy_dependencies(test_client):
+    payload = _diagnostics_payload([("T-2", "python", 5, 8, ["T-1"], False)])
+    assert test_client.post("/plan/sprint", json=payload).status_code == 400
+    payload["completed_task_ids"] = ["T-1"]
+    response = test_client.post("/plan/sprint", json=payload)
+    assert response.status_code == 200
+    assert [a["task_id"] for a in response.json()["assignments"]] == ["T-2"]
+
+def test_compressed_msgpack_transport_with_projection(test_client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "TRANSPORT_COMPRESS_MIN_BYTES", 0)
+    payload = _diagnostics_payload([("T-1", "python", 5, 8, [], False)])
+    response = test_client.post(
+        "/plan/sprint?fields=summary,utilization",
+        content=gzip.compress(json.dumps(payload).encode()),
+        headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+            "Accept": "application/msgpack",
+            "Accept-Encoding": "gzip"
+        }
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "application/msgpack"
+    body = msgpack.unpackb(response.content)
+    assert set(body) == {"summary", "utilization"}
+    assert body["summary"]["assigned_tasks"] == 1
+
+    from_msgpack = test_client.post(
+        "/plan/sprint",
+        content=msgpack.packb(payload),
+        headers={"Content-Type": "application/msgpack", "Accept-Encoding": "identity"}
+    )
+    assert from_msgpack.status_code == 200
+    assert "content-encoding" not in from_msgpack.headers
+    assert from_msgpack.json()["summary"]["assigned_tasks"] == 1
+
+    assert test_client.post("/plan/sprint?fields=summary,nope", json=payload).status_code == 400
+    unsupported = test_client.post(
+        "/plan/sprint", content=b"x", headers={"Content-Type": "application/json", "Content-Encoding": "br"}
+    )
+    assert unsupported.status_code == 415
+
+def test_evaluate_plan_reports_violations_and_gap(test_client):
+    payload = _diagnostics_payload([
+        ("T-1", "python", 5, 8, [], False),
+        ("T-2", "python", 3, 6, ["T-1"], False),
+        ("T-3", "rust", 2, 4, [], True),
+    ])
+    plan = test_client.post("/plan/sprint", json=payload).json()
+
+    optimal = {**payload, "assignments": [
+        {"task_id": a["task_id"], "employee_ids": [e["employee_id"] for e in a["assignees"]]}
+        for a in plan["assignments"]
+    ]}
+    evaluation = test_client.post("/plan/evaluate", json=optimal).json()
+    assert evaluation["objective"] == plan["objective"]
+    assert evaluation["objective_gap"] == 0.0
+    assert [v["kind"] for v in evaluation["violations"]] == ["must_have_not_planned"]
+
+    edited = {**payload, "assignments": [
+        {"task_id": "T-2", "employee_ids": ["E1"]},
+        {"task_id": "T-3", "employee_ids": ["E1", "E9"]},
+    ]}
+    evaluation = test_client.post("/plan/evaluate", json=edited).json()
+    kinds = {v["kind"] for v in evaluation["violations"]}
+    assert kinds == {"unknown_employee", "ineligible_assignee", "skill_not_covered", "dependency_not_planned"}
+    assert not evaluation["feasible"]
+    assert evaluation["summary"]["assigned_tasks"] == 2
+    assert evaluation["utilization"][0]["planned"] == 10
+    assert evaluation["objective_gap"] == 0.625
+
+def test_plan_jobs_are_solved_by_worker(test_client, tmp_path, monkeypatch):
+    from app.services.job_queue import PlanJobQueue
+    from scripts import plan_worker
+
+    queue = PlanJobQueue(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr("app.api.routes.plan_queue", queue)
+    payload = _diagnostics_payload([("T-1", "python", 5, 8, [], False)])
+
+    response = test_client.post("/plan/jobs", json=payload)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["status"] == "queued"
+    invalid = {**payload, "sprint": {**payload["sprint"], "end_date": "2025-09-01"}}
+    assert test_client.post("/plan/jobs", json=invalid).status_code == 400
+
+    assert plan_worker.run(queue, "test-worker", exit_when_idle=True) == 1
+    job = test_client.get(f"/plan/jobs/{job_id}").json()
+    assert job["status"] == "completed" and job["attempts"] == 1
+    assert job["result"]["assignments"][0]["task_id"] == "T-1"
+    assert test_client.get("/plan/jobs/unknown").status_code == 404
+
+def test_plan_analysis_runs_after_response(monkeypatch):
+    import asyncio
+    from app.llm.base import LLMClient
+    from app.services.plan_analysis import PlanAnalyses
+
+    class SlowClient(LLMClient):
+        prompts = []
+
+        async def chat(self, messages, json_mode=False, tools=None):
+            return ""
+
+        async def generate(self, request):
+            self.prompts.append(request.prompt)
+            await asyncio.sleep(0.2)
+            return " Balanced load; T-1 is on the critical path.\n"
+
+    analyses = PlanAnalyses()
+    analyses.client = SlowClient()
+    monkeypatch.setattr("app.api.routes.plan_analyses", analyses)
+    monkeypatch.setattr(get_settings(), "PLAN_ANALYSIS_ENABLED", True)
+    payload = _diagnostics_payload([("T-1", "python", 5, 8, [], False), ("T-2", "python", 3, 6, ["T-1"], False)])
+
+    with TestClient(app) as client:
+        plan = client.post("/plan/sprint", json=payload).json()
+        analysis_id = plan["analysis_id"]
+        assert client.get(f"/plan/analysis/{analysis_id}").json()["status"] in ("queued", "running")
+        assert client.post("/plan/sprint", json=payload).json()["analysis_id"] == analysis_id
+
+        stream = client.get(f"/plan/analysis/{analysis_id}/stream")
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        last = stream.text.strip().split("\n\n")[-1]
+        assert last.startswith("event: completed")
+        analysis = client.get(f"/plan/analysis/{analysis_id}").json()
+        assert analysis["analysis"] == "Balanced load; T-1 is on the critical path."
+        assert json.loads(last.split("data: ", 1)[1]) == analysis
+        assert client.get("/plan/analysis/unknown").status_code == 404
+
+    assert len(SlowClient.prompts) == 1
+    assert plan["sprint_id"] in SlowClient.prompts[0] and '"T-2":["E' in SlowClient.prompts[0]
+
+def test_plan_analysis_follows_model_switch(monkeypatch):
+    import asyncio
+    from app.schemas.planning_output import PlanSummary, PlanResponse
+    from app.services import plan_analysis
+
+    class ModelClient:
+        def __init__(self, model):
+            self.model = model
+
+        async def analyze_plan(self, plan_summary, constraints):
+            return f"analysis by {self.model}"
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "MODEL_PROVIDER", "ollama")
+    monkeypatch.setattr(settings, "LLM_FALLBACK_PROVIDER", "")
+    monkeypatch.setattr(
+        plan_analysis, "TaskEstimator", lambda: type("Estimator", (), {"llm_client": ModelClient(settings.OLLAMA_MODEL)})
+    )
+    plan = PlanResponse(
+        sprint_id="SPR-SWITCH", assignments=[], unassigned=[], utilization=[],
+        summary=PlanSummary(total_tasks=0, assigned_tasks=0, unassigned_tasks=0, total_priority_completed=0)
+    )
+    analyses = plan_analysis.PlanAnalyses()
+
+    async def analyze():
+        analysis_id = analyses.start(plan, {})
+        return analysis_id, (await analyses.wait(analysis_id)).analysis
+
+    monkeypatch.setattr(settings, "OLLAMA_MODEL", "model-a")
+    first_id, first = asyncio.run(analyze())
+    monkeypatch.setattr(settings, "OLLAMA_MODEL", "model-b")
+    second_id, second = asyncio.run(analyze())
+    assert first_id != second_id
+    assert (first, second) == ("analysis by model-a", "analysis by model-b")
+
+def test_plan_requests_are_served_while_bedrock_analysis_blocks(monkeypatch):
+    import threading
+    import time
+    from app.llm.bedrock_provider import BedrockProvider
+    from app.services.plan_analysis import PlanAnalyses
+
+    released = threading.Event()
+
+    class Runtime:
+        def invoke_model(self, **kwargs):
+            released.wait(10)
+            return {"body": io.BytesIO(json.dumps({"completion": "Looks balanced."}).encode())}
+
+    provider = BedrockProvider.__new__(BedrockProvider)
+    provider.model, provider.client = "anthropic.claude-v2", Runtime()
+    analyses = PlanAnalyses()
+    analyses.client = provider
+    monkeypatch.setattr("app.api.routes.plan_analyses", analyses)
+    monkeypatch.setattr(get_settings(), "PLAN_ANALYSIS_ENABLED", True)
+
+    with TestClient(app) as client:
+        analysis_id = client.post(
+            "/plan/sprint", json=_diagnostics_payload([("T-1", "python", 5, 8, [], False)])
+        ).json()["analysis_id"]
+        start = time.perf_counter()
+        response = client.post("/plan/sprint", json=_diagnostics_payload([("T-2", "python", 3, 6, [], False)]))
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200
+        assert client.get(f"/plan/analysis/{analysis_id}").json()["status"] == "running"
+        released.set()
+        assert client.get(f"/plan/analysis/{analysis_id}/stream").text.strip().split("\n\n")[-1].startswith("event: completed")
+        assert client.get(f"/plan/analysis/{analysis_id}").json()["analysis"] == "Looks balanced."
+    assert elapsed < 5
+
+def test_evaluate_plan_never_calls_the_llm(test_client, monkeypatch):
+    from app.domain.models import Task
+    from app.services.estimator import TaskEstimator
+    from app.utils.llm_cache import llm_cache
+
+    async def no_llm(*args, **kwargs):
+        raise AssertionError("evaluation must not call the LLM")
+
+    monkeypatch.setattr(TaskEstimator, "estimate_tasks", no_llm)
+    payload = _diagnostics_payload([("T-1", "python", 5, 8, [], False), ("T-2", "python", 3, 6, [], False)])
+    payload["tasks"][1]["estimate"] = None
+    payload["tasks"][1]["description"] = "Evaluation task without an estimate."
+    proposal = {**payload, "assignments": [{"task_id": "T-2", "employee_ids": ["E1"]}]}
+
+    response = test_client.post("/plan/evaluate", json=proposal)
+    assert response.status_code == 400 and "T-2" in response.json()["detail"]
+
+    params = TaskEstimator().cache_key_params(Task.model_validate(payload["tasks"][1]))
+    monkeypatch.setitem(llm_cache._cache, llm_cache.key_of("estimate_task", params), {"unit": "hours", "value": 4})
+    evaluation = test_client.post("/plan/evaluate", json=proposal).json()
+    assert evaluation["utilization"][0]["planned"] == 4
+
+def test_llm_model_switch_reaches_live_app(test_client, monkeypatch):
+    from app.services.estimator import TaskEstimator
+
+    settings = get_settings()
+    for name in ("MODEL_PROVIDER", "OLLAMA_MODEL", "BEDROCK_MODEL"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+    monkeypatch.setattr(settings, "LLM_FALLBACK_PROVIDER", "ollama")
+
+    assert test_client.post("/llm/model", json={"provider": "ollama", "model": "model-a"}).status_code == 200
+    router = TaskEstimator().llm_client
+    assert test_client.post("/llm/model", json={"provider": "ollama", "model": "model-b"}).json()["model"] == "model-b"
+    switched = TaskEstimator().llm_client
+    assert switched is not router and switched.providers[0].client.model == "model-b"
+    assert test_client.post("/llm/model", json={"provider": "gpt", "model": "x"}).status_code == 400
+    assert settings.MODEL_PROVIDER == "ollama"
@@ -0,0 +1,44 @@
+from datetime import date
+from app.domain.models import Capacity, DateRange, Employee, Skill, Sprint
+from app.services.capacity_calendar import CapacityCalendar
+
+SPRINT = Sprint(
+    id="SPR-2025-09-42",
+    name="Sprint 42",
+    start_date=date(2025, 9, 15),
+    end_date=date(2025, 9, 26),
+    timezone="UTC",
+    work_days=10,
+    work_hours_per_day=8,
+    holidays=[date(2025, 9, 22)]
+)
+
+
+def _employee(emp_id, available=None, pto=(), allocation_pct=100.0):
+    return Employee(
+        id=emp_id,
+        name=emp_id,
+        role="Engineer",
+        team_id="TEAM-PLAT",
+        skills=[Skill(name="python", level=4)],
+        capacity=Capacity(unit="hours", available=available),
+        pto=[DateRange(start=s, end=e) for s, e in pto],
+        allocation_pct=allocation_pct
+    )
+
+def test_available_hours_from_calendar():
+    employees = [
+        _employee("E1"),
+        # Overlapping PTO Wed-Fri of week one, counted once
+        _employee("E2", pto=[(date(2025, 9, 17), date(2025, 9, 18)), (date(2025, 9, 18), date(2025, 9, 19))]),
+        _employee("E3", allocation_pct=50),
+        # PTO on the holiday and a weekend costs nothing extra
+        _employee("E4", pto=[(date(2025, 9, 20), date(2025, 9, 22))]),
+    ]
+    hours = CapacityCalendar().available_hours(SPRINT, employees)
+    assert hours.tolist() == [72.0, 48.0, 36.0, 72.0]
+
+def test_fill_keeps_explicit_capacity():
+    employees = [_employee("E1", available=20), _employee("E2")]
+    filled = CapacityCalendar().fill_capacities(SPRINT, employees)
+    assert [e.capacity.available for e in filled] == [20, 72.0]
@@ -0,0 +1,237 @@
+import asyncio
+import json
+import httpx
+import numpy as np
+from app.domain.enums import JobStatus
+from app.domain.models import SkillRequirement, Task
+from app.llm.base import LLMClient
+from app.llm.estimation import chunk_by_budget, estimation_request, parse_batch_estimates, parse_estimate
+from app.llm.ollama_provider import OllamaProvider
+from app.llm.streaming import JsonStreamDetector
+from app.llm.tokens import compact_text, count_tokens
+from app.schemas.estimation import EstimateHistoryItem, PreEstimateJob
+from app.services.estimate_model import EstimateModel
+from app.services.estimator import TaskEstimator
+from app.services.pre_estimation import PreEstimator
+from app.utils.llm_cache import LLMCache, llm_cache
+
+
+class FakeClient(LLMClient):
+    """Answers batches with a canned reply and single prompts with 5 hours."""
+
+    def __init__(self, batch_reply):
+        self.batch_reply = batch_reply
+        self.batches = []
+        self.singles = []
+
+    async def chat(self, messages, json_mode=False, tools=None):
+        return ""
+
+    async def generate(self, request):
+        self.batches.append(request.prompt)
+        return self.batch_reply
+
+    async def estimate_task(self, task_description, required_skills):
+        self.singles.append(task_description)
+        return {"unit": "hours", "value": 5}
+
+    async def analyze_plan(self, plan_summary, constraints):
+        return ""
+
+
+def _task(task_id, description):
+    return Task(
+        id=task_id, title=task_id, description=description, priority=3,
+        required_skills=[SkillRequirement(name="python", min_level=2)]
+    )
+
+
+def test_parse_batch_estimates_tolerates_truncated_output():
+    text = 'Sure!\n```json\n[{"id": "T-1", "unit": "hours", "value": 4}, {"id": "T-2", "value": "lots"}, ' \
+           '{"id": "T-9", "value": 2}, {"id": "T-3", "unit": "hours", "val'
+    assert parse_batch_estimates(text, ["T-1", "T-2", "T-3"]) == {"T-1": {"unit": "hours", "value": 4}}
+    keyed = '{"T-1": {"unit": "points", "value": 3}}'
+    assert parse_batch_estimates(keyed, ["T-1"]) == {"T-1": {"unit": "points", "value": 3}}
+
+
+def test_estimation_request_is_compact_and_capped():
+    description = "Build the export.\n" + "Lots of detail here. " * 500 + "\nAcceptance: CSV downloads."
+    request = estimation_request(description, ["python"])
+    assert count_tokens(request.prompt) < count_tokens(description) // 4
+    assert "Build the export." in request.prompt and "CSV downloads." in request.prompt
+    assert request.stop == ["}"] and request.max_tokens <= 64
+    # The stop sequence swallows the closing brace
+    assert parse_estimate('{"unit": "hours", "value": 6, "confidence": "low"') == \
+        {"unit": "hours", "value": 6, "confidence": "low"}
+
+
+def test_compact_text_keeps_short_text():
+    assert compact_text("  Fix   the\nlogin bug ", 50) == "Fix the login bug"
+    assert count_tokens(compact_text("word " * 1000, 100)) <= 100
+
+
+def test_chunk_by_budget_respects_limits():
+    items = [{"id": f"T-{k}", "description": "x" * 400, "skills": ["python"]} for k in range(10)]
+    batches = chunk_by_budget(items, token_budget=600, max_items=3)
+    assert [item["id"] for batch in batches for item in batch] == [item["id"] for item in items]
+    assert all(1 <= len(batch) <= 3 for batch in batches)
+    assert len(chunk_by_budget(items, token_budget=10, max_items=3)) == len(items)
+
+
+def test_batched_estimation_reasks_only_failures():
+    reply = json.dumps([
+        {"id": "B-1", "unit": "hours", "value": 3, "confidence": "high"},
+        {"id": "B-2", "unit": "hours", "value": -1},
+    ])
+    client = FakeClient(reply)
+    estimator = TaskEstimator()
+    estimator.llm_client = client
+    tasks = [_task("B-1", "Batch one."), _task("B-2", "Batch two."), _task("B-3", "Batch one.")]
+
+    result = asyncio.run(estimator.estimate_tasks(tasks))
+
+    assert len(client.batches) == 1
+    assert client.singles == ["Batch two."]
+    assert [t.estimate.value for t in result] == [3, 5, 3]
+    # Cached per task, so a later single-task lookup hits the cache
+    assert llm_cache.get("estimate_task", estimator.cache_key_params(tasks[0]))["value"] == 3
+    asyncio.run(estimator.estimate_tasks([_task("B-4", "Batch one.")]))
+    assert len(client.batches) == 1 and client.singles == ["Batch two."]
+
+
+def test_pre_estimation_warms_cache_and_skips_unchanged():
+    client = FakeClient("[]")
+    estimator = TaskEstimator()
+    estimator.llm_client = client
+    tasks = [_task("P-1", "Warm one."), _task("P-2", "Warm two."), _task("P-3", "Warm one.")]
+
+    job = PreEstimateJob(job_id="test", status=JobStatus.QUEUED, total=len(tasks))
+    asyncio.run(PreEstimator(estimator).run(tasks, job))
+    assert (job.status, job.estimated, job.cached, job.done) == (JobStatus.COMPLETED, 3, 0, 3)
+    assert sorted(client.singles) == ["Warm one.", "Warm two."]
+
+    changed = tasks[:2] + [_task("P-3", "Warm three.")]
+    job = PreEstimateJob(job_id="again", status=JobStatus.QUEUED, total=len(changed))
+    asyncio.run(PreEstimator(estimator).run(changed, job))
+    assert (job.estimated, job.cached) == (1, 2)
+    assert client.singles[-1] == "Warm three."
+
+    # Planning the same backlog afterwards is all cache hits
+    calls = len(client.singles)
+    asyncio.run(estimator.estimate_tasks(changed))
+    assert len(client.singles) == calls and len(client.batches) == 1
+
+
+def test_llm_cache_persists_to_sqlite(tmp_path):
+    path = str(tmp_path / "estimates.db")
+    LLMCache(path).set("estimate_task", {"description": "x"}, {"unit": "hours", "value": 2})
+    assert LLMCache(path).get("estimate_task", {"description": "x"}) == {"unit": "hours", "value": 2}
+    assert LLMCache(path).get("estimate_task", {"description": "y"}) is None
+
+
+def test_json_stream_detector_ignores_prose_and_strings():
+    detector = JsonStreamDetector("{")
+    chunks = ['Here is "my" estimate: {"unit": "hours", "reasoning": "uses ', '} and \\" inside", ',
+              '"value": 4}', ' Explanation follows...']
+    done = [detector.feed(chunk) for chunk in chunks]
+    assert done == [False, False, True, True]
+    assert detector.answer.endswith('"value": 4}')
+    assert parse_estimate(detector.answer)["value"] == 4
+
+    batch = JsonStreamDetector("[")
+    assert not batch.feed('{"note": 1} [{"id": "T-1", "value": 2}')
+    assert batch.feed(', {"id": "T-2", "value": 3}]')
+
+
+def test_ollama_stream_closes_once_estimate_is_complete():
+    consumed = []
+
+    class Stream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for piece in ['{"unit": "hours", ', '"value": 6}', ' The task is', ' simple because', ' ...']:
+                consumed.append(piece)
+                yield (json.dumps({"response": piece, "done": False}) + "\n").encode()
+
+    provider = OllamaProvider()
+    provider.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, stream=Stream())))
+    estimate = asyncio.run(provider.estimate_task("Small task.", ["python"]))
+    assert estimate == {"unit": "hours", "value": 6}
+    assert len(consumed) == 2
+
+
+def test_cancelled_bedrock_stream_is_closed():
+    import time
+    from app.llm.bedrock_provider import BedrockProvider
+    from app.llm.estimation import GenerationRequest
+
+    consumed, closed = [], []
+
+    class Stream:
+        def __iter__(self):
+            for _ in range(100):
+                time.sleep(0.01)
+                consumed.append(1)
+                yield {"chunk": {"bytes": json.dumps({"completion": " "}).encode()}}
+
+        def close(self):
+            closed.append(len(consumed))
+
+    class Runtime:
+        def invoke_model_with_response_stream(self, **kwargs):
+            return {"body": Stream()}
+
+    provider = BedrockProvider.__new__(BedrockProvider)
+    provider.model, provider.client = "anthropic.claude-v2", Runtime()
+
+    async def hedged_loser():
+        call = asyncio.create_task(provider.generate(GenerationRequest("prompt", 10, expect="{")))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(hedged_loser())
+    assert closed and closed[0] < 50
+
+
+def _history():
+    rng = np.random.default_rng(7)
+    kinds = [
+        ("Fix typo on the {} page", ["html"], 1.0),
+        ("Add REST endpoint to list {} records", ["python"], 6.0),
+        ("Migrate the {} service to the new cluster", ["kubernetes", "python"], 30.0),
+    ]
+    names = ["billing", "invoice", "profile", "search", "admin", "report", "login", "export", "audit", "order"]
+    items = []
+    for template, skills, hours in kinds:
+        for name in names:
+            actual = hours * float(np.exp(rng.normal(0, 0.1)))
+            items.append(EstimateHistoryItem(
+                description=template.format(name), skills=skills, estimate=actual / 2, actual_hours=actual
+            ))
+    return items
+
+
+def test_local_model_answers_routine_tasks_and_calibrates_llm(monkeypatch):
+    model = EstimateModel()
+    stats = model.fit(_history())
+    assert stats.samples == 30 and stats.calibrated
+    assert abs(stats.calibration_slope - 1) < 0.2
+
+    monkeypatch.setattr("app.services.estimator.estimate_model", model)
+    client = FakeClient("[]")
+    estimator = TaskEstimator()
+    estimator.llm_client = client
+    routine = Task(
+        id="L-1", title="L-1", description="Add REST endpoint to list customer records", priority=3,
+        required_skills=[SkillRequirement(name="Python", min_level=2)]
+    )
+    novel = _task("L-2", "Prototype a homomorphic encryption scheme for sensor telemetry.")
+
+    result = asyncio.run(estimator.estimate_tasks([routine, novel]))
+
+    assert result[0].estimate.provider == "local"
+    assert 4 <= result[0].estimate.value <= 9
+    # Only the unfamiliar task reaches the LLM, and its 5 hours are corrected for past underestimation
+    assert client.singles == [novel.description]
+    assert 8 <= result[1].estimate.value <= 12
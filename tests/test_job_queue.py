@@ -0,0 +1,79 @@
+import time
+from app.domain.enums import JobStatus, PlanJobKind
+from app.services.job_queue import PlanJobQueue
+
+
+def test_expired_lease_is_retried_then_failed(tmp_path):
+    queue = PlanJobQueue(str(tmp_path / "jobs.db"), visibility_seconds=0.05, max_attempts=2)
+    job_id = queue.enqueue(PlanJobKind.SPRINT, "{}").job_id
+
+    first = queue.lease("w1")
+    assert first.job_id == job_id and first.attempt == 1
+    assert queue.lease("w2") is None
+    assert queue.heartbeat(job_id, "w1")
+
+    # w1 crashes: once the lease expires another worker gets the job
+    time.sleep(0.1)
+    second = queue.lease("w2")
+    assert second.job_id == job_id and second.attempt == 2
+    # The stale worker can no longer write a result
+    assert not queue.complete(job_id, "w1", "{}")
+    assert not queue.heartbeat(job_id, "w1")
+
+    time.sleep(0.1)
+    assert queue.lease("w3") is None
+    job = queue.get(job_id)
+    assert job.status == JobStatus.FAILED and job.attempts == 2
+    assert "expired" in job.error
+
+
+def test_failures_are_retried_only_when_transient(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = PlanJobQueue(path, max_attempts=2)
+    invalid = queue.enqueue(PlanJobKind.HORIZON, "{}").job_id
+    transient = queue.enqueue(PlanJobKind.SPRINT, "{}").job_id
+
+    leased = queue.lease("w1")
+    assert leased.job_id == invalid and leased.kind == PlanJobKind.HORIZON
+    assert queue.fail(invalid, "w1", "bad input", retry=False)
+    assert queue.get(invalid).status == JobStatus.FAILED
+    assert queue.fail(queue.lease("w1").job_id, "w1", "solver crashed", retry=True)
+    assert queue.get(transient).status == JobStatus.QUEUED
+
+    # A second process sees the same queue
+    other = PlanJobQueue(path, max_attempts=2)
+    assert other.lease("w2").job_id == transient
+    assert other.complete(transient, "w2", '{"ok": true}')
+    job = queue.get(transient)
+    assert (job.status, job.attempts, job.result, job.error) == (JobStatus.COMPLETED, 2, {"ok": True}, None)
+
+
+def test_worker_retries_solver_errors_but_not_invalid_input(tmp_path, monkeypatch):
+    import json
+    from app.core.config import get_settings
+    from scripts import plan_worker
+
+    with open("data/samples/sample_plan_request.json") as f:
+        request = json.load(f)
+    queue = PlanJobQueue(str(tmp_path / "jobs.db"), max_attempts=3)
+    malformed = queue.enqueue(PlanJobKind.SPRINT, "{}").job_id
+    cyclic = dict(request, tasks=[
+        {**request["tasks"][0], "dependencies": [request["tasks"][1]["id"]]},
+        {**request["tasks"][1], "dependencies": [request["tasks"][0]["id"]]}
+    ])
+    rejected = queue.enqueue(PlanJobKind.SPRINT, json.dumps(cyclic)).job_id
+    valid = queue.enqueue(PlanJobKind.SPRINT, json.dumps(request)).job_id
+
+    monkeypatch.setattr(get_settings(), "SOLVER_BACKEND", "no-such-solver")
+    assert plan_worker.run(queue, "w1", max_jobs=3) == 3
+    assert queue.get(malformed).status == JobStatus.FAILED
+    assert queue.get(rejected).status == JobStatus.FAILED
+    job = queue.get(valid)
+    assert job.status == JobStatus.QUEUED and "no-such-solver" in job.error
+
+    # The retry runs on the same event loop as the earlier jobs
+    loop = plan_worker._event_loop()
+    monkeypatch.setattr(get_settings(), "SOLVER_BACKEND", "auto")
+    assert plan_worker.run(queue, "w1", exit_when_idle=True) == 1
+    assert queue.get(valid).status == JobStatus.COMPLETED
+    assert plan_worker._event_loop() is loop and not loop.is_closed()
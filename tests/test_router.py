@@ -0,0 +1,126 @@
+import asyncio
+import time
+import pytest
+from app.llm.base import LLMClient
+from app.llm.router import NoProviderAvailable, ProviderRouter
+
+
+class FakeProvider(LLMClient):
+    """Answers generate() with its name after a delay, or fails."""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def chat(self, messages, json_mode=False, tools=None):
+        return ""
+
+    async def generate(self, request):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return '{"unit": "hours", "value": 3}'
+
+    async def analyze_plan(self, plan_summary, constraints):
+        return ""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_slow_primary_is_hedged_to_secondary():
+    primary, secondary = FakeProvider("primary", delay=1.0), FakeProvider("secondary", delay=0.01)
+    router = ProviderRouter([("primary", primary), ("secondary", secondary)], hedge_default_seconds=0.05)
+
+    start = time.perf_counter()
+    estimate = asyncio.run(router.estimate_task("Task.", ["python"]))
+
+    assert estimate == {"unit": "hours", "value": 3, "provider": "secondary"}
+    assert time.perf_counter() - start < 0.5
+    assert primary.cancelled == 1
+    assert router.stats()["primary"]["state"] == "closed"
+
+
+def test_hedge_delay_follows_primary_p95():
+    primary, secondary = FakeProvider("primary", delay=0.005), FakeProvider("secondary")
+    router = ProviderRouter([("primary", primary), ("secondary", secondary)], hedge_default_seconds=5)
+
+    async def run(n):
+        return [await router.estimate_task("Task.", []) for _ in range(n)]
+
+    assert {a["provider"] for a in asyncio.run(run(20))} == {"primary"}
+    assert router.stats()["primary"]["p95_seconds"] < 0.1
+
+    # The primary slows down: it is hedged after its learned p95, not the 5 s default
+    primary.delay = 5
+    start = time.perf_counter()
+    assert asyncio.run(run(1))[0]["provider"] == "secondary"
+    assert time.perf_counter() - start < 0.5
+
+
+def test_circuit_breaker_opens_and_probes():
+    clock = FakeClock()
+    primary, secondary = FakeProvider("primary", fail=True), FakeProvider("secondary")
+    router = ProviderRouter(
+        [("primary", primary), ("secondary", secondary)],
+        failure_threshold=3, reset_seconds=30, clock=clock
+    )
+
+    async def estimate():
+        return await router.estimate_task("Task.", [])
+
+    for _ in range(5):
+        assert asyncio.run(estimate())["provider"] == "secondary"
+    assert primary.calls == 3
+    assert router.stats()["primary"]["state"] == "open"
+
+    # After the reset time one probe goes to the recovered primary and closes the circuit
+    clock.now = 31
+    primary.fail = False
+    assert asyncio.run(estimate())["provider"] == "primary"
+    assert router.stats()["primary"]["state"] == "closed"
+
+    primary.fail = secondary.fail = True
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            asyncio.run(estimate())
+    with pytest.raises(NoProviderAvailable):
+        asyncio.run(estimate())
+
+
+def test_shared_router_follows_model_and_event_loop(monkeypatch):
+    from app.core.config import get_settings
+    from app.services.estimator import TaskEstimator
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "MODEL_PROVIDER", "ollama")
+    monkeypatch.setattr(settings, "LLM_FALLBACK_PROVIDER", "ollama")
+    monkeypatch.setattr(settings, "OLLAMA_MODEL", "model-a")
+    router = TaskEstimator().llm_client
+    assert TaskEstimator().llm_client is router
+
+    # One client per event loop: asyncio.run closes the loop the previous client belonged to
+    ollama = router.providers[0].client
+
+    async def http_client():
+        return ollama.client
+
+    assert asyncio.run(http_client()) is not asyncio.run(http_client())
+
+    monkeypatch.setattr(settings, "OLLAMA_MODEL", "model-b")
+    switched = TaskEstimator().llm_client
+    assert switched is not router
+    assert [p.client.model for p in switched.providers] == ["model-b", "model-b"]
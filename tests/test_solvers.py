@@ -0,0 +1,225 @@
+import asyncio
+import itertools
+import json
+from pathlib import Path
+import numpy as np
+import pulp
+import pytest
+from app.domain.models import Capacity, Estimate, Skill, SkillRequirement
+from app.schemas.planning_input import Constraints, PlanRequest
+from app.services.planner import SprintPlanner
+from app.services.evaluation import PlanEvaluator
+from app.services.lagrangian import knapsack
+from app.services.planning_data import PlanningData
+from app.services.solvers import CbcBackend, get_backend, select_backend
+from app.utils.synthetic import make_synthetic_request
+
+SAMPLE_REQUEST = Path(__file__).parent.parent / "data" / "samples" / "sample_plan_request.json"
+
+
+def test_cbc_backend_captures_log():
+    prob = pulp.LpProblem("tiny", pulp.LpMaximize)
+    x = pulp.LpVariable("x", cat="Binary")
+    prob += x
+    prob += x <= 1
+    result = CbcBackend(threads=2).solve(prob)
+    assert result.status == "Optimal"
+    assert result.backend == "cbc"
+    assert "Cbc" in result.log
+    assert x.value() == 1
+
+def test_select_backend_by_size():
+    small = select_backend(num_variables=100)
+    assert small.name == "scipy" and small.direct
+    large = select_backend(num_variables=100_000, time_limit=2)
+    assert large.name == "cbc" and large.gap_rel is not None
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError, match="Unsupported solver backend"):
+        get_backend("gurobi")
+
+def _solve_with(backend_name, request):
+    planner = SprintPlanner(solver=get_backend(backend_name))
+    data = PlanningData(request.tasks, request.employees, request.constraints or Constraints())
+    assigned, conflicts, _ = planner._optimize_assignments(data)
+    return data, assigned, conflicts
+
+def test_scipy_backend_matches_pulp_on_sample():
+    payload = json.loads(SAMPLE_REQUEST.read_text())
+    for task in payload["tasks"]:
+        task["estimate"] = task["estimate"] or {"unit": "hours", "value": 16}
+    request = PlanRequest(**payload)
+    _, cbc, cbc_conflicts = _solve_with("cbc", request)
+    _, direct, direct_conflicts = _solve_with("scipy", request)
+    assert (cbc == direct).all()
+    assert cbc_conflicts == direct_conflicts
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_scipy_backend_matches_pulp_objective(seed):
+    request = make_synthetic_request(10, 30, seed=seed)
+    data, cbc, _ = _solve_with("cbc", request)
+    _, direct, _ = _solve_with("scipy", request)
+    objective = lambda assigned: (assigned * data.priorities[None, :]).sum()
+    assert objective(cbc) == objective(direct)
+
+@pytest.mark.parametrize("backend_name", ["cbc", "scipy"])
+def test_balance_utilization_keeps_priority_and_levels_load(backend_name):
+    request = make_synthetic_request(2, 4, num_teams=1)
+    for employee in request.employees:
+        employee.skills = [Skill(name="python", level=4)]
+        employee.capacity = Capacity(unit="hours", available=40)
+    for task in request.tasks:
+        task.required_skills = [SkillRequirement(name="python", min_level=3)]
+        task.estimate = Estimate(unit="hours", value=10)
+        task.max_assignees = 1
+    request.constraints = Constraints(
+        max_parallel_tasks_per_person=4, objective="balance_utilization"
+    )
+    data, balanced, _ = _solve_with(backend_name, request)
+    assert balanced.any(axis=0).all()
+    assert (balanced.sum(axis=1) == 2).all()
+
+@pytest.mark.parametrize("backend_name", ["cbc", "scipy"])
+def test_weighted_policy_prefers_better_fit_and_prunes_zero_scores(backend_name):
+    request = make_synthetic_request(3, 1, num_teams=1)
+    for employee, level in zip(request.employees, [3, 5, 1]):
+        employee.skills = [Skill(name="python", level=level)]
+    request.tasks[0].required_skills = [SkillRequirement(name="python", min_level=4)]
+    request.tasks[0].max_assignees = 1
+    request.constraints = Constraints(match_policy="weighted")
+
+    data, assigned, _ = _solve_with(backend_name, request)
+    assert data.fit[:, 0].tolist() == [0.75, 1.0, 0.0]
+    assert data.eligible[:, 0].tolist() == [True, True, False]
+    assert assigned[:, 0].tolist() == [False, True, False]
+
+def _chain_request(capacity, deps):
+    request = make_synthetic_request(1, len(deps), num_teams=1)
+    request.employees[0].skills = [Skill(name="python", level=4)]
+    request.employees[0].capacity = Capacity(unit="hours", available=capacity)
+    for task, (priority, hours, task_deps) in zip(request.tasks, deps.values()):
+        task.required_skills = [SkillRequirement(name="python", min_level=3)]
+        task.estimate = Estimate(unit="hours", value=hours)
+        task.priority = priority
+        task.dependencies = [request.tasks[k].id for k in task_deps]
+        task.max_assignees = 1
+        task.must_have = False
+    request.constraints = Constraints(max_parallel_tasks_per_person=10)
+    return request
+
+def test_dependency_graph_is_transitively_reduced_and_pruned():
+    request = _chain_request(20, {
+        "a": (1, 5, []),
+        "b": (1, 5, [0]),
+        "c": (1, 5, [0, 1]),  # c -> a is implied by c -> b -> a
+        "d": (1, 8, [2]),  # the chain a, b, c, d needs 23 of 20 hours
+        "e": (1, 30, []),  # too large for anyone
+        "f": (1, 1, [4]),
+    })
+    data = PlanningData(request.tasks, request.employees, request.constraints)
+    assert data.dependency_edges == 5
+    assert sorted(zip(data.dep_task.tolist(), data.dep_prereq.tolist())) == [(1, 0), (2, 1), (3, 2), (5, 4)]
+    assert data.pruned.tolist() == [False, False, False, True, True, True]
+    assert not data.eligible[:, data.pruned].any()
+
+@pytest.mark.parametrize("backend_name", ["cbc", "scipy"])
+def test_dependencies_are_enforced(backend_name):
+    request = _chain_request(10, {
+        "a": (1, 6, []),
+        "b": (5, 6, [0]),  # worth the most, but a + b exceed the capacity
+        "c": (2, 4, []),
+    })
+    _, assigned, _ = _solve_with(backend_name, request)
+    assert assigned.any(axis=0).tolist() == [True, False, True]
+
+def _identical_team_request(num_employees, hours, capacity=10):
+    request = make_synthetic_request(num_employees, len(hours), num_teams=1)
+    for employee in request.employees:
+        employee.skills = [Skill(name="python", level=4)]
+        employee.capacity = Capacity(unit="hours", available=capacity)
+    for task, value in zip(request.tasks, hours):
+        task.required_skills = [SkillRequirement(name="python", min_level=3)]
+        task.estimate = Estimate(unit="hours", value=value)
+        task.dependencies = []
+        task.max_assignees = 1
+        task.must_have = False
+    request.constraints = Constraints(max_parallel_tasks_per_person=3)
+    return request
+
+@pytest.mark.parametrize("backend_name", ["cbc", "scipy"])
+def test_interchangeable_employees_are_aggregated(backend_name, monkeypatch):
+    request = _identical_team_request(4, [6, 5, 4, 4, 3, 3, 3, 2, 2, 1])
+    data, aggregated, _ = _solve_with(backend_name, request)
+    assert len(data.employee_classes) == 1 and data.interchangeable_pairs() == [(0, 1), (1, 2), (2, 3)]
+    assert (aggregated.astype(float) @ data.estimates <= data.capacities).all()
+    assert (aggregated.sum(axis=0) <= 1).all()
+
+    monkeypatch.setattr("app.services.planner.settings.SOLVER_AGGREGATE_EMPLOYEES", False)
+    _, individual, _ = _solve_with(backend_name, request)
+    objective = lambda assigned: (assigned * data.priorities[None, :]).sum()
+    assert objective(aggregated) == objective(individual)
+
+@pytest.mark.parametrize("backend_name", ["cbc", "scipy"])
+def test_aggregation_falls_back_when_counts_do_not_pack(backend_name):
+    # 3 x 6 hours fit the class total of 20 hours, but not two 10-hour people
+    request = _identical_team_request(2, [6, 6, 6])
+    data, assigned, _ = _solve_with(backend_name, request)
+    assert assigned.any(axis=0).sum() == 2
+    loads = assigned.astype(float) @ data.estimates
+    assert (loads <= data.capacities).all() and loads[0] >= loads[1]
+
+def test_aggregation_fallback_gets_only_the_remaining_time(monkeypatch):
+    import time
+    request = _identical_team_request(2, [6, 6, 6])
+    request.constraints.time_limit_seconds = 3.0
+    data = PlanningData(request.tasks, request.employees, request.constraints)
+    planner = SprintPlanner(solver=get_backend("scipy"))
+    limits = []
+    solve_view = planner._solve_view
+
+    def slow_view(view, enforced, feasibility_only, balance, time_limit):
+        limits.append(time_limit)
+        time.sleep(1.0)
+        return solve_view(view, enforced, feasibility_only, balance, time_limit)
+
+    monkeypatch.setattr(planner, "_solve_view", slow_view)
+    monkeypatch.setattr(planner, "_disaggregate", lambda data, counts: None)
+    result, assigned = planner._solve_model(data, enforced=set())
+    assert assigned is not None and len(limits) == 2
+    assert limits[0] == pytest.approx(3.0, abs=0.1) and 1.0 <= 3.0 - limits[1] < 1.5
+
+
+def test_knapsack_matches_brute_force():
+    rng = np.random.default_rng(3)
+    for _ in range(50):
+        profits = rng.normal(2, 2, 9)
+        weights = rng.integers(1, 10, 9).astype(float)
+        capacity, limit = float(rng.integers(5, 20)), int(rng.integers(1, 4))
+        exact = max(
+            profits[list(subset)].sum()
+            for size in range(limit + 1)
+            for subset in itertools.combinations(range(9), size)
+            if weights[list(subset)].sum() <= capacity
+        )
+        value, chosen = knapsack(profits, weights, capacity, limit, bins=int(capacity))
+        # Integer weights on a unit grid: the rounded program is exact
+        assert value == pytest.approx(exact)
+        assert len(chosen) <= limit and weights[chosen].sum() <= capacity
+        assert profits[chosen].sum() == pytest.approx(value)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_lagrangian_plan_is_feasible_with_proven_gap(seed):
+    request = make_synthetic_request(30, 100, seed=seed)
+    data, exact, _ = _solve_with("scipy", request)
+    optimum = data.objective_value(exact.astype(bool))
+
+    planner = SprintPlanner(solver=get_backend("lagrangian"))
+    result, assigned = planner._solve_model(data, enforced=set())
+    objective = data.objective_value(assigned)
+    assert PlanEvaluator().check(data, assigned) == []
+    assert objective <= optimum <= objective / (1 - result.gap) + 1e-6
+    assert result.gap < 0.1
+
+    plan = asyncio.run(planner.create_plan(request))
+    assert plan.optimality_gap == result.gap